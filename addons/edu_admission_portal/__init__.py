@@ -53,6 +53,10 @@ def uninstall_hook(env_or_cr, registry=None):
         # On a reçu (cr, registry)
         cr = env_or_cr
 
+    # Les vues matérialisées dépendent des tables du module
+    cr.execute("DROP MATERIALIZED VIEW IF EXISTS admission_candidate_stat_mv")
+    cr.execute("DROP MATERIALIZED VIEW IF EXISTS admission_stage_funnel")
+
     # Supprime toutes les données des tables personnalisées
     cr.execute("""
         DELETE FROM admission_form_template;
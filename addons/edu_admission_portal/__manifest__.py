@@ -23,7 +23,10 @@
         'views/admission_candidate_views.xml',
         'views/admission_mapping_line_views.xml',
         'views/admission_import_batch_views.xml',
+        'views/admission_webhook_queue_views.xml',
+        'views/limesurvey_sync_run_views.xml',
         'views/dashboard_views.xml',
+        'views/admission_stage_funnel_views.xml',
         'views/attachment_preview_template.xml',
         'views/menus.xml',
         'data/cron.xml',
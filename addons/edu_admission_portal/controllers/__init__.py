@@ -1 +1,2 @@
-from . import webhook_controller 
\ No newline at end of file
+from . import webhook_controller 
+from . import dashboard_controller
@@ -0,0 +1,89 @@
+from odoo import http
+from odoo.http import request
+from odoo.exceptions import AccessError
+from odoo.tools.lru import LRU
+import hashlib
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Séries sérialisées conservées par processus, par base, version et filtres
+SERIES_CACHE_SIZE = 256
+
+_series_cache = LRU(SERIES_CACHE_SIZE)
+
+
+class AdmissionDashboardController(http.Controller):
+
+    def _json_response(self, body, status=200, headers=None):
+        """Construit une réponse JSON à partir d'un corps déjà sérialisé."""
+        return request.make_response(
+            body,
+            headers=[('Content-Type', 'application/json')] + (headers or []),
+            status=status,
+        )
+
+    def _parse_filters(self, year=None, form_id=None, academic_level=None):
+        """
+        Valide les filtres du tableau de bord.
+
+        Ce sont ceux de ``admission.candidate._get_dashboard_domain`` : année
+        de soumission, formulaire et niveau académique.
+
+        Returns:
+            dict: Filtres retenus, sous forme de clés de contexte
+
+        Raises:
+            ValueError: Si un filtre est invalide
+        """
+        filters = {}
+        if year:
+            if not str(year).isdigit() or len(str(year)) != 4:
+                raise ValueError("Année invalide: %s" % year)
+            filters['dashboard_year'] = int(year)
+        if form_id:
+            if not str(form_id).isdigit():
+                raise ValueError("Formulaire invalide: %s" % form_id)
+            filters['form_id'] = int(form_id)
+        if academic_level:
+            levels = dict(request.env['admission.candidate']._fields['academic_level'].selection)
+            if academic_level not in levels:
+                raise ValueError("Niveau académique invalide: %s" % academic_level)
+            filters['academic_level'] = academic_level
+        return filters
+
+    @http.route('/admission/dashboard/data', type='http', auth='user', methods=['GET'])
+    def dashboard_data(self, year=None, form_id=None, academic_level=None, **kwargs):
+        """
+        Séries du tableau de bord des admissions, au format JSON.
+
+        La réponse porte un ETag dérivé de la version des statistiques et des
+        filtres : tant qu'aucune candidature n'a changé, une requête munie de
+        If-None-Match reçoit un 304 sans aucun calcul, et les autres sont
+        servies depuis le cache du processus.
+        """
+        try:
+            request.env['admission.candidate.stat'].check_access_rights('read')
+        except AccessError:
+            return self._json_response(json.dumps({'error': "Accès refusé"}), status=403)
+
+        try:
+            filters = self._parse_filters(year, form_id, academic_level)
+        except ValueError as e:
+            return self._json_response(json.dumps({'error': str(e)}), status=400)
+
+        version = request.env['admission.candidate.stat']._get_stat_version()
+        key = (request.env.cr.dbname, version, request.env.lang, tuple(sorted(filters.items())))
+        etag = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        headers = [('ETag', '"%s"' % etag), ('Cache-Control', 'private, no-cache')]
+
+        if request.httprequest.if_none_match.contains(etag):
+            return request.make_response('', headers=headers, status=304)
+
+        body = _series_cache.get(key)
+        if body is None:
+            series = request.env['admission.candidate'].with_context(**filters)._get_dashboard_series()
+            body = json.dumps(series)
+            _series_cache[key] = body
+        return self._json_response(body, headers=headers)
@@ -4,6 +4,12 @@ from . import admission_form_template
 from . import admission_form_mapping
 from . import admission_mapping_line
 from . import admission_import_batch
+from . import admission_cron_cursor
+from . import admission_webhook_queue
 from . import limesurvey_server_config
+from . import limesurvey_circuit_breaker
+from . import limesurvey_sync_run
 from . import ir_attachment
+from . import admission_candidate_stat
+from . import admission_stage_transition
 from . import admission_dashboard
\ No newline at end of file
@@ -1,13 +1,34 @@
 import logging
 import json
 import re
-from odoo import models, fields, api, _
+import time
+from odoo import models, fields, api, modules, _
 from odoo.exceptions import UserError, ValidationError, AccessError
 from datetime import datetime, timedelta
 import traceback
+from collections import Counter
 
 _logger = logging.getLogger(__name__)
 
+# Agrégats du tableau de bord, dans le cache de la transaction (cr.cache)
+DASHBOARD_CACHE_KEY = 'edu_admission_portal.dashboard_stats'
+
+# Statuts comptés comme « en attente » dans le tableau de bord
+DASHBOARD_PENDING_STATUSES = ('new', 'complete', 'shortlisted', 'invited')
+
+# Champs qui déterminent la ligne de statistiques d'un candidat
+STAT_FIELDS = {'submission_date', 'form_id', 'status', 'academic_level', 'active'}
+
+# Temps maximal consacré par exécution du CRON à vérifier la complétude
+# des dossiers (secondes), en deçà de la limite de temps réel des workers
+COMPLETENESS_TIME_BUDGET = 60
+
+# Nombre de candidats vérifiés puis validés ensemble
+COMPLETENESS_BATCH_SIZE = 500
+
+# Code du point de reprise (admission.cron.cursor) : dernier candidat vérifié
+COMPLETENESS_CURSOR_CODE = 'completeness_check'
+
 class AdmissionCandidate(models.Model):
     _name = 'admission.candidate'
     _description = "Candidat à l'Admission"
@@ -640,7 +661,11 @@ class AdmissionCandidate(models.Model):
 
     def action_move_to_stage(self, stage):
         """
-        Déplace le candidat vers une nouvelle étape en synchronisant le statut.
+        Déplace les candidats vers une nouvelle étape en synchronisant le statut.
+
+        Les candidats sont regroupés par statut résultant : un déplacement de
+        masse se fait en une écriture par statut, et ses changements d'étape
+        sont journalisés en une seule insertion.
         
         Args:
             stage: L'objet admission.candidate.stage cible
@@ -651,35 +676,33 @@ class AdmissionCandidate(models.Model):
         Raises:
             ValidationError: Si le déplacement n'est pas autorisé
         """
-        self.ensure_one()
-        
-        # Vérifie que l'étape appartient au bon formulaire
-        if stage.form_template_id != self.form_id:
-            raise ValidationError(_(
-                "Impossible de déplacer vers une étape d'un autre formulaire."
-            ))
-        
-        # Détermine le nouveau statut selon l'étape
-        new_status = None
         allowed_statuses = self._STAGE_STATUS_MAPPING.get(stage.code, [])
-        
-        # Si le statut actuel est autorisé dans la nouvelle étape, on le garde
-        if self.status in allowed_statuses:
-            new_status = self.status
-        # Sinon on prend le premier statut autorisé
-        elif allowed_statuses:
-            new_status = allowed_statuses[0]
-        else:
+        if not allowed_statuses:
             raise ValidationError(_(
                 "Aucun statut valide trouvé pour l'étape %(stage)s",
                 stage=stage.name
             ))
-            
+
+        by_status = {}
+        for candidate in self:
+            # Vérifie que l'étape appartient au bon formulaire
+            if stage.form_template_id != candidate.form_id:
+                raise ValidationError(_(
+                    "Impossible de déplacer vers une étape d'un autre formulaire."
+                ))
+            # Si le statut actuel est autorisé dans la nouvelle étape, on le garde,
+            # sinon on prend le premier statut autorisé
+            new_status = candidate.status if candidate.status in allowed_statuses else allowed_statuses[0]
+            by_status[new_status] = by_status.get(new_status, self.browse()) | candidate
+
         # Met à jour l'étape et le statut
-        self.write({
-            'stage_id': stage.id,
-            'status': new_status,
-        })
+        previous_stages = {candidate.id: candidate.stage_id.id for candidate in self}
+        for new_status, candidates in by_status.items():
+            candidates.with_context(skip_stage_transition_log=True).write({
+                'stage_id': stage.id,
+                'status': new_status,
+            })
+        self.env['admission.stage.transition']._log_transitions(self, previous_stages)
         
         return True
 
@@ -789,13 +812,10 @@ class AdmissionCandidate(models.Model):
             return
 
         try:
-            # Récupération du mapping
-            mapping = self.env['admission.form.mapping'].search([
-                ('form_template_id', '=', self.form_id.id),
-                ('state', '=', 'validated')
-                ], limit=1)
+            # Récupération du plan de mapping compilé
+            plan = self.env['admission.form.mapping']._get_mapping_plan(self.form_id.id)
                 
-            if not mapping:
+            if not plan:
                 _logger.warning(
                     "Aucun mapping validé trouvé pour le formulaire %s",
                     self.form_id.name
@@ -806,63 +826,21 @@ class AdmissionCandidate(models.Model):
             processed_data = {}
             attachments_data = []
 
-            # Pour chaque ligne de mapping
-            for line in mapping.mapping_line_ids.filtered(lambda l: l.status == 'validated'):
-                try:
-                    # Récupération de la valeur source
-                    value = self.response_data.get(line.question_code)
-                    
-                    if value is None:
-                        continue
-
-                    # Si c'est une pièce jointe
-                    if line.is_attachment and isinstance(value, dict):
-                        attachments_data.append({
-                            'name': value.get('name', 'Sans nom'),
-                            'data': value.get('content'),
-                            'type': value.get('type', 'application/octet-stream'),
-                            'field': line.question_code
-                        })
-                        continue
-
-                    # Transformation de la valeur si nécessaire
-                    if line.mapping_type == 'transform' and line.transform_python:
-                        try:
-                            value = line.transform_value(value)
-                        except Exception as e:
-                            _logger.error(
-                                "Erreur lors de la transformation pour %s: %s",
-                                line.question_code, str(e)
-                            )
-                            continue
-
-                    # Validation de la valeur si nécessaire
-                    if line.validation_python:
-                        try:
-                            if not line.validate_value(value):
-                                _logger.warning(
-                                    "Validation échouée pour %s: %s",
-                                    line.question_code, value
-                                )
-                                continue
-                        except Exception as e:
-                            _logger.error(
-                                "Erreur lors de la validation pour %s: %s",
-                                line.question_code, str(e)
-                            )
-                            continue
-
-                    # Ajout de la valeur aux données traitées
-                    if line.odoo_field:
-                        processed_data[line.odoo_field] = value
-                
-                except Exception as e:
-                    _logger.error(
-                        "Erreur lors du traitement de la ligne %s: %s",
-                        line.question_code, str(e)
-                    )
+            for spec, value in plan.iter_values(self.env, self.response_data):
+                # Si c'est une pièce jointe
+                if spec.is_attachment and isinstance(value, dict):
+                    attachments_data.append({
+                        'name': value.get('name', 'Sans nom'),
+                        'data': value.get('content'),
+                        'type': value.get('type', 'application/octet-stream'),
+                        'field': spec.question_code
+                    })
                     continue
 
+                # Ajout de la valeur aux données traitées
+                if spec.odoo_field:
+                    processed_data[spec.odoo_field] = value
+
             # Mise à jour des champs du candidat
             if processed_data:
                 self.write(processed_data)
@@ -948,35 +926,162 @@ class AdmissionCandidate(models.Model):
 
         _logger.info("%d candidatures incomplètes nettoyées", len(candidates))
 
+    @api.model
+    def _get_completeness_time_budget(self):
+        """Temps consacré par exécution du CRON à vérifier la complétude des dossiers (secondes)."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.completeness_time_budget', COMPLETENESS_TIME_BUDGET
+        ))
+
+    @api.model
+    def _get_completeness_batch_size(self):
+        """Nombre de candidats vérifiés par paquet."""
+        return max(1, int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.completeness_batch_size', COMPLETENESS_BATCH_SIZE
+        )))
+
+    def _commit_progress(self):
+        """Rend durable le travail du paquet courant (sauf pendant les tests)."""
+        if not modules.module.current_test:
+            self.env.cr.commit()
+
     @api.model
     def _auto_check_completeness(self):
         """
         Vérifie automatiquement si les dossiers sont complets.
         Cette méthode est appelée par le CRON.
+
+        Les candidats sont parcourus par ID croissant, en paquets validés un
+        à un. L'ID du dernier candidat traité est conservé : au-delà du
+        budget de temps, la tâche s'interrompt et se relance à partir de ce
+        curseur, et un parcours terminé repart du début. Le curseur est un
+        enregistrement ``admission.cron.cursor`` : l'écrire après chaque
+        paquet ne vide pas les caches du registre.
+
+        Returns:
+            dict: Nombre de candidats vérifiés, complétés et en erreur, et
+                si le parcours est terminé
         """
-        candidates = self.search([
-            ('status', '=', 'new'),
-            ('is_complete', '=', False)
-        ])
-        
-        for candidate in candidates:
+        Cursor = self.env['admission.cron.cursor']
+        cursor = Cursor._get_cursor(COMPLETENESS_CURSOR_CODE)
+        budget = self._get_completeness_time_budget()
+        batch_size = self._get_completeness_batch_size()
+
+        start = time.monotonic()
+        stats = {'checked': 0, 'completed': 0, 'failed': 0, 'finished': False}
+        plans = {}
+        while True:
+            candidates = self.search([
+                ('id', '>', cursor),
+                ('status', '=', 'new'),
+                ('is_complete', '=', False),
+            ], order='id', limit=batch_size)
+            if not candidates:
+                stats['finished'] = True
+                cursor = 0
+                break
+
+            completed, failed = candidates._check_completeness_batch(plans)
+            stats['checked'] += len(candidates)
+            stats['completed'] += len(completed)
+            stats['failed'] += len(failed)
+            cursor = candidates[-1].id
+            if len(candidates) < batch_size:
+                stats['finished'] = True
+                cursor = 0
+            Cursor._set_cursor(COMPLETENESS_CURSOR_CODE, cursor)
+            self._commit_progress()
+
+            if stats['finished'] or time.monotonic() - start >= budget:
+                break
+
+        Cursor._set_cursor(COMPLETENESS_CURSOR_CODE, cursor)
+        _logger.info(
+            "Complétude des dossiers : %d vérifiés, %d complétés, %d en erreur",
+            stats['checked'], stats['completed'], stats['failed'],
+        )
+        if not stats['finished']:
+            _logger.info("Budget de vérification épuisé, reprise après le candidat %s", cursor)
+            cron = self.env.ref(
+                'edu_admission_portal.ir_cron_check_candidate_completeness',
+                raise_if_not_found=False,
+            )
+            if cron:
+                cron.sudo()._trigger()
+        return stats
+
+    def _check_completeness_batch(self, plans=None):
+        """
+        Vérifie la complétude d'un paquet de candidats et passe les dossiers
+        complets au statut « complet ».
+
+        Les questions et documents requis sont déterminés une fois par
+        formulaire. Les dossiers complets d'un formulaire sont mis à jour
+        ensemble : une écriture pour ceux dont l'étape admet le statut
+        « complet », un déplacement vers l'étape « complet » pour les autres.
+
+        Args:
+            plans (dict): Plans de mapping déjà chargés, par ID de formulaire
+
+        Returns:
+            tuple: (candidats complétés, candidats en erreur)
+        """
+        plans = {} if plans is None else plans
+        completed = self.browse()
+        failed = self.browse()
+
+        complete_stages = {
+            stage.form_template_id.id: stage
+            for stage in self.env['admission.candidate.stage'].search([
+                ('form_template_id', 'in', self.form_id.ids),
+                ('code', '=', 'complete'),
+            ])
+        }
+
+        for form, candidates in self.grouped('form_id').items():
+            if not form:
+                continue
+            if form.id not in plans:
+                plans[form.id] = self.env['admission.form.mapping']._get_mapping_plan(form.id)
+            plan = plans[form.id]
+            required_docs = form.get_required_documents()
+
+            ready = candidates.filtered(lambda c: (
+                not (plan and plan.missing_required(c.response_data))
+                and not (required_docs and set(required_docs) - set(c.attachment_ids.mapped('res_model')))
+            ))
+            if not ready:
+                continue
+
+            in_place = ready.filtered(
+                lambda c: 'complete' in self._STAGE_STATUS_MAPPING.get(c.stage_id.code, [])
+            )
+            to_move = ready - in_place
             try:
-                # Vérification de la complétude
-                if candidate._check_required_fields() and candidate._check_required_attachments():
-                    candidate.write({
-                        'status': 'complete',
-                        'is_complete': True
-                    })
-                    candidate.message_post(
-                        body=_("Dossier marqué comme complet automatiquement"),
-                        message_type='notification'
-                    )
+                with self.env.cr.savepoint():
+                    if in_place:
+                        in_place.write({'status': 'complete'})
+                    if to_move:
+                        if form.id not in complete_stages:
+                            raise ValidationError(_(
+                                "Aucune étape « complet » pour le formulaire %(form)s",
+                                form=form.name,
+                            ))
+                        to_move.action_move_to_stage(complete_stages[form.id])
+                    ready.write({'is_complete': True})
             except Exception as e:
                 _logger.error(
-                    "Erreur lors de la vérification de la complétude pour le candidat %s: %s",
-                    candidate.id, str(e)
+                    "Erreur lors de la vérification de la complétude pour le formulaire %s: %s",
+                    form.id, str(e)
                 )
+                failed |= ready
                 continue
+            completed |= ready
+
+        if completed:
+            body = _("Dossier marqué comme complet automatiquement")
+            completed._message_log_batch(bodies={candidate.id: body for candidate in completed})
+        return completed, failed
 
     def _check_required_fields(self):
         """
@@ -987,20 +1092,12 @@ class AdmissionCandidate(models.Model):
         """
         self.ensure_one()
         
-        # Récupération des mappings requis
-        required_mappings = self.env['admission.mapping.line'].sudo().search([
-            ('mapping_id.form_template_id', '=', self.form_id.id),
-            ('status', '=', 'validated'),
-            ('is_required', '=', True)
-        ])
-
-        # Vérification de chaque champ requis
-        for mapping in required_mappings:
-            value = self.response_data.get(mapping.question_code)
-            if value is None or value == '':
-                return False
+        # Les questions requises proviennent du plan de mapping compilé
+        plan = self.env['admission.form.mapping']._get_mapping_plan(self.form_id.id)
+        if not plan:
+            return True
 
-        return True
+        return not plan.missing_required(self.response_data)
 
     def _validate_attachments(self, attachments, form):
         """Valide les pièces jointes avant import."""
@@ -1139,15 +1236,15 @@ class AdmissionCandidate(models.Model):
 
     @api.model
     def _get_dashboard_domain(self):
-        """Retourne le domaine pour les calculs du tableau de bord."""
+        """Retourne le domaine, sur admission.candidate.stat, des calculs du tableau de bord."""
         domain = []
         context = self.env.context
         
         if context.get('dashboard_year'):
             year = context['dashboard_year']
             domain += [
-                ('submission_date', '>=', f'{year}-01-01'),
-                ('submission_date', '<=', f'{year}-12-31'),
+                ('day', '>=', f'{year}-01-01'),
+                ('day', '<=', f'{year}-12-31'),
             ]
         
         if context.get('form_id'):
@@ -1158,6 +1255,65 @@ class AdmissionCandidate(models.Model):
             
         return domain
 
+    @api.model
+    def _get_dashboard_stats(self):
+        """
+        Agrégats du tableau de bord, en une seule requête groupée.
+
+        Les comptes par statut, niveau, formulaire et mois de soumission sont
+        lus dans la table de statistiques (``admission.candidate.stat``), et
+        non dans les candidats ; les indicateurs et toutes les séries des
+        graphiques en sont dérivés. Le résultat est conservé pour la
+        transaction et partagé par les champs calculés ; toute écriture sur
+        les candidats l'invalide.
+
+        Returns:
+            dict: total, et comptes par statut, niveau, nom de formulaire et mois
+        """
+        domain = self._get_dashboard_domain()
+        cache = self.env.cr.cache.setdefault(DASHBOARD_CACHE_KEY, {})
+        key = (self.env.uid, tuple(self.env.companies.ids), repr(domain))
+        if key in cache:
+            return cache[key]
+
+        stats = {'total': 0, 'status': {}, 'academic_level': {}, 'form': {}, 'month': {}}
+        groups = self.env['admission.candidate.stat']._read_group(
+            domain,
+            ['status', 'academic_level', 'form_id', 'day:month'],
+            ['candidate_count:sum'],
+        )
+        for status, level, form, month, count in groups:
+            stats['total'] += count
+            stats['status'][status] = stats['status'].get(status, 0) + count
+            if level:
+                stats['academic_level'][level] = stats['academic_level'].get(level, 0) + count
+            form_name = form.name if form else _('Sans formulaire')
+            stats['form'][form_name] = stats['form'].get(form_name, 0) + count
+            if month:
+                label = month.strftime('%Y-%m')
+                stats['month'][label] = stats['month'].get(label, 0) + count
+        stats['form'] = dict(sorted(stats['form'].items()))
+        cache[key] = stats
+        return stats
+
+    def _invalidate_dashboard_stats(self):
+        """Oublie les agrégats du tableau de bord de la transaction."""
+        self.env.cr.cache.pop(DASHBOARD_CACHE_KEY, None)
+
+    def _get_stat_keys(self):
+        """
+        Compte les candidats actifs par ligne de statistiques.
+
+        Returns:
+            Counter: Nombre de candidats par (jour, formulaire, statut, niveau)
+        """
+        return Counter(
+            (fields.Date.to_date(candidate.submission_date), candidate.form_id.id,
+             candidate.status, candidate.academic_level or None)
+            for candidate in self
+            if candidate.active and candidate.submission_date and candidate.form_id
+        )
+
     @api.model
     def _get_status_color(self, status):
         colors = {
@@ -1351,28 +1507,39 @@ class AdmissionCandidate(models.Model):
             search_domain = []
         return self.env['admission.candidate.stage'].search(search_domain, order=order)
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Surcharge de create pour affecter l'étape par défaut."""
-        record = super().create(vals)
-        
-        # Si pas d'étape définie et qu'on a un formulaire
-        if not record.stage_id and record.form_id:
-            # Recherche de l'étape par défaut
-            default_stage = self.env['admission.candidate.stage'].search([
-                ('form_template_id', '=', record.form_id.id),
+        # Une seule recherche des étapes par défaut pour tous les formulaires concernés
+        form_ids = {
+            vals['form_id'] for vals in vals_list
+            if vals.get('form_id') and not vals.get('stage_id')
+        }
+        default_stages = {}
+        if form_ids:
+            for stage in self.env['admission.candidate.stage'].search([
+                ('form_template_id', 'in', list(form_ids)),
                 ('is_default', '=', True)
-            ], limit=1)
-            
-            if default_stage:
-                record.stage_id = default_stage.id
-            else:
+            ]):
+                default_stages.setdefault(stage.form_template_id.id, stage.id)
+
+            for form_id in form_ids - set(default_stages):
                 _logger.warning(
-                    "Aucune étape par défaut trouvée pour le formulaire %s (ID: %s)",
-                    record.form_id.name, record.form_id.id
+                    "Aucune étape par défaut trouvée pour le formulaire ID: %s",
+                    form_id
                 )
-        
-        return record
+
+        for vals in vals_list:
+            if vals.get('form_id') and not vals.get('stage_id'):
+                stage_id = default_stages.get(vals['form_id'])
+                if stage_id:
+                    vals['stage_id'] = stage_id
+
+        self._invalidate_dashboard_stats()
+        candidates = super().create(vals_list)
+        self.env['admission.candidate.stat']._apply_deltas(candidates._get_stat_keys())
+        self.env['admission.stage.transition']._log_transitions(candidates.filtered('stage_id'))
+        return candidates
 
     @api.onchange('form_id')
     def _onchange_form_id(self):
@@ -1398,7 +1565,34 @@ class AdmissionCandidate(models.Model):
                 )
                 vals['stage_id'] = False
                 
-        return super().write(vals)
+        self._invalidate_dashboard_stats()
+        # Étapes de départ, pour l'historique des changements d'étape
+        previous_stages = None
+        if 'stage_id' in vals and not self.env.context.get('skip_stage_transition_log'):
+            previous_stages = {candidate.id: candidate.stage_id.id for candidate in self}
+
+        if not STAT_FIELDS.intersection(vals):
+            result = super().write(vals)
+        else:
+            # Les statistiques suivent le déplacement des candidats d'une ligne à l'autre
+            deltas = Counter()
+            deltas.subtract(self._get_stat_keys())
+            result = super().write(vals)
+            deltas.update(self._get_stat_keys())
+            self.env['admission.candidate.stat']._apply_deltas(deltas)
+
+        if previous_stages is not None:
+            self.env['admission.stage.transition']._log_transitions(self, previous_stages)
+        return result
+
+    def unlink(self):
+        """Surcharge d'unlink pour mettre à jour les statistiques du tableau de bord."""
+        self._invalidate_dashboard_stats()
+        deltas = Counter()
+        deltas.subtract(self._get_stat_keys())
+        result = super().unlink()
+        self.env['admission.candidate.stat']._apply_deltas(deltas)
+        return result
 
     @api.depends('response_data', 'academic_level', 'experience_years')
     def _compute_scores(self):
@@ -1571,108 +1765,104 @@ class AdmissionCandidate(models.Model):
             }
         }
 
+    @api.model
+    def _get_dashboard_series(self):
+        """
+        Indicateurs et séries Chart.js du tableau de bord.
+
+        Calculés à partir de ``_get_dashboard_stats`` pour les filtres du
+        contexte ; partagés par les champs calculés et par le point d'accès
+        JSON du tableau de bord.
+
+        Returns:
+            dict: Indicateurs (``kpis``) et séries des quatre graphiques
+        """
+        stats = self._get_dashboard_stats()
+        status_labels = dict(self._fields['status'].selection)
+        # Only include non-zero counts, in selection order
+        statuses = [status for status in status_labels if stats['status'].get(status)]
+        level_labels = dict(self._fields['academic_level'].selection)
+        levels = [level for level in level_labels if stats['academic_level'].get(level)]
+        sorted_months = sorted(stats['month'])
+
+        return {
+            'kpis': {
+                'total_candidates': stats['total'],
+                'accepted_candidates': stats['status'].get('accepted', 0),
+                'pending_candidates': sum(
+                    stats['status'].get(status, 0) for status in DASHBOARD_PENDING_STATUSES
+                ),
+                'refused_candidates': stats['status'].get('refused', 0),
+            },
+            'status_distribution': {
+                'labels': [status_labels[status] for status in statuses],
+                'datasets': [{
+                    'data': [stats['status'][status] for status in statuses],
+                    'backgroundColor': [self._get_status_color(status) for status in statuses]
+                }]
+            },
+            'submission_timeline': {
+                'labels': sorted_months,
+                'datasets': [{
+                    'label': 'Candidatures',
+                    'data': [stats['month'][month] for month in sorted_months],
+                    'borderColor': '#2196F3',
+                    'fill': False
+                }]
+            },
+            'form_distribution': {
+                'labels': list(stats['form'].keys()),
+                'datasets': [{
+                    'label': 'Candidatures par Formulaire',
+                    'data': list(stats['form'].values()),
+                    'backgroundColor': '#4CAF50'
+                }]
+            },
+            'academic_level_distribution': {
+                'labels': [level_labels[level] for level in levels],
+                'datasets': [{
+                    'label': 'Distribution par Niveau',
+                    'data': [stats['academic_level'][level] for level in levels],
+                    'backgroundColor': '#FF9800'
+                }]
+            },
+        }
+
     @api.depends('status')
     def _compute_dashboard_data(self):
         """Compute dashboard KPI data"""
-        domain = self._get_dashboard_domain()
-        all_candidates = self.env['admission.candidate'].search(domain)
-        
+        kpis = self._get_dashboard_series()['kpis']
+
         for record in self:
-            record.total_candidates = len(all_candidates)
-            record.accepted_candidates = len(all_candidates.filtered(lambda r: r.status == 'accepted'))
-            record.pending_candidates = len(all_candidates.filtered(lambda r: r.status in ['new', 'complete', 'shortlisted', 'invited']))
-            record.refused_candidates = len(all_candidates.filtered(lambda r: r.status == 'refused'))
+            record.total_candidates = kpis['total_candidates']
+            record.accepted_candidates = kpis['accepted_candidates']
+            record.pending_candidates = kpis['pending_candidates']
+            record.refused_candidates = kpis['refused_candidates']
 
     @api.depends('status')
     def _compute_status_distribution(self):
         """Compute status distribution for pie chart"""
-        domain = self._get_dashboard_domain()
-        candidates = self.env['admission.candidate'].search(domain)
-        
-        status_counts = {}
-        status_labels = dict(self._fields['status'].selection)
-        
-        for status, _ in self._fields['status'].selection:
-            count = len(candidates.filtered(lambda r: r.status == status))
-            if count > 0:  # Only include non-zero counts
-                status_counts[status_labels[status]] = count
-        
+        series = self._get_dashboard_series()['status_distribution']
         for record in self:
-            record.status_distribution = {
-                'labels': list(status_counts.keys()),
-                'datasets': [{
-                    'data': list(status_counts.values()),
-                    'backgroundColor': [self._get_status_color(status) for status in status_counts.keys()]
-                }]
-            }
+            record.status_distribution = series
 
     @api.depends('submission_date')
     def _compute_submission_timeline(self):
         """Compute submission timeline for line chart"""
-        domain = self._get_dashboard_domain()
-        candidates = self.env['admission.candidate'].search(domain)
-        
-        # Group by month
-        timeline_data = {}
-        for candidate in candidates:
-            month = candidate.submission_date.strftime('%Y-%m')
-            timeline_data[month] = timeline_data.get(month, 0) + 1
-        
-        # Sort by month
-        sorted_months = sorted(timeline_data.keys())
-        
+        series = self._get_dashboard_series()['submission_timeline']
         for record in self:
-            record.submission_timeline = {
-                'labels': sorted_months,
-                'datasets': [{
-                    'label': 'Candidatures',
-                    'data': [timeline_data[month] for month in sorted_months],
-                    'borderColor': '#2196F3',
-                    'fill': False
-                }]
-            }
+            record.submission_timeline = series
 
     @api.depends('form_id')
     def _compute_form_distribution(self):
         """Compute form distribution for bar chart"""
-        domain = self._get_dashboard_domain()
-        candidates = self.env['admission.candidate'].search(domain)
-        
-        form_counts = {}
-        for candidate in candidates:
-            form_name = candidate.form_id.name
-            form_counts[form_name] = form_counts.get(form_name, 0) + 1
-        
+        series = self._get_dashboard_series()['form_distribution']
         for record in self:
-            record.form_distribution = {
-                'labels': list(form_counts.keys()),
-                'datasets': [{
-                    'label': 'Candidatures par Formulaire',
-                    'data': list(form_counts.values()),
-                    'backgroundColor': '#4CAF50'
-                }]
-            }
+            record.form_distribution = series
 
     @api.depends('academic_level')
     def _compute_academic_level_distribution(self):
         """Compute academic level distribution for bar chart"""
-        domain = self._get_dashboard_domain()
-        candidates = self.env['admission.candidate'].search(domain)
-        
-        level_counts = {}
-        level_labels = dict(self._fields['academic_level'].selection)
-        
-        for level, _ in self._fields['academic_level'].selection:
-            count = len(candidates.filtered(lambda r: r.academic_level == level))
-            if count > 0:  # Only include non-zero counts
-                level_counts[level_labels[level]] = count
-        
+        series = self._get_dashboard_series()['academic_level_distribution']
         for record in self:
-            record.academic_level_distribution = {
-                'labels': list(level_counts.keys()),
-                'datasets': [{
-                    'label': 'Distribution par Niveau',
-                    'data': list(level_counts.values()),
-                    'backgroundColor': '#FF9800'
-                }]
-            } 
\ No newline at end of file
+            record.academic_level_distribution = series
@@ -0,0 +1,204 @@
+import logging
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Vue matérialisée recalculée depuis les candidats, référence de la réconciliation
+STAT_VIEW = 'admission_candidate_stat_mv'
+
+# Clé d'unicité de la table (cible de ON CONFLICT) : les niveaux vides sont regroupés
+STAT_KEY_COLUMNS = "day, form_id, status, (COALESCE(academic_level, ''))"
+
+# Clé d'unicité de la vue : REFRESH ... CONCURRENTLY n'accepte qu'un index sur
+# des colonnes simples, le niveau normalisé y est donc une colonne
+STAT_VIEW_KEY_COLUMNS = "day, form_id, status, level_key"
+
+# Séquence incrémentée après chaque transaction qui modifie les statistiques
+STAT_VERSION_SEQUENCE = 'admission_candidate_stat_version'
+
+
+class AdmissionCandidateStat(models.Model):
+    _name = 'admission.candidate.stat'
+    _description = 'Statistiques Journalières des Candidatures'
+    _order = 'day desc, form_id, status'
+    _log_access = False
+
+    day = fields.Date(
+        string='Jour de Soumission',
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    form_id = fields.Many2one(
+        'admission.form.template',
+        string="Formulaire d'Admission",
+        required=True,
+        readonly=True,
+        ondelete='cascade',
+        index=True,
+    )
+    status = fields.Selection(
+        selection='_get_status_selection',
+        string='Statut',
+        required=True,
+        readonly=True,
+    )
+    academic_level = fields.Selection(
+        selection='_get_academic_level_selection',
+        string='Niveau Académique',
+        readonly=True,
+    )
+    candidate_count = fields.Integer(
+        string='Candidats',
+        readonly=True,
+        group_operator='sum',
+    )
+
+    @api.model
+    def _get_status_selection(self):
+        return self.env['admission.candidate']._fields['status'].selection
+
+    @api.model
+    def _get_academic_level_selection(self):
+        return self.env['admission.candidate']._fields['academic_level'].selection
+
+    def init(self):
+        """Crée l'index d'unicité, la séquence de version et la vue matérialisée de référence."""
+        cr = self.env.cr
+        cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {STAT_VERSION_SEQUENCE}")
+        cr.execute(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS admission_candidate_stat_key_uniq
+            ON admission_candidate_stat ({STAT_KEY_COLUMNS})
+        """)
+        cr.execute("SELECT 1 FROM pg_matviews WHERE matviewname = %s", [STAT_VIEW])
+        if cr.fetchone():
+            cr.execute(
+                "SELECT 1 FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'level_key'",
+                [STAT_VIEW],
+            )
+            if cr.fetchone():
+                return
+            # Ancienne définition, indexée sur une expression : recréée
+            cr.execute(f"DROP MATERIALIZED VIEW {STAT_VIEW}")
+        cr.execute(f"""
+            CREATE MATERIALIZED VIEW {STAT_VIEW} AS
+            SELECT submission_date::date AS day,
+                   form_id,
+                   status,
+                   COALESCE(academic_level, '') AS level_key,
+                   NULLIF(COALESCE(academic_level, ''), '') AS academic_level,
+                   COUNT(*) AS candidate_count
+              FROM admission_candidate
+             WHERE active AND form_id IS NOT NULL AND submission_date IS NOT NULL
+             GROUP BY 1, 2, 3, 4
+        """)
+        # Index unique requis par REFRESH MATERIALIZED VIEW CONCURRENTLY
+        cr.execute(f"CREATE UNIQUE INDEX {STAT_VIEW}_key_uniq ON {STAT_VIEW} ({STAT_VIEW_KEY_COLUMNS})")
+        self._reconcile_from_view()
+
+    @api.model
+    def _apply_deltas(self, deltas):
+        """
+        Reporte des variations de comptes dans la table de statistiques.
+
+        Les clés sont traitées dans un ordre fixe pour que deux transactions
+        concurrentes verrouillent les mêmes lignes dans le même ordre.
+
+        Args:
+            deltas (Counter): Variation par clé (jour, formulaire, statut, niveau)
+        """
+        keys = sorted(
+            (key for key, delta in deltas.items() if delta),
+            key=lambda key: (key[0], key[1], key[2], key[3] or ''),
+        )
+        if not keys:
+            return
+        for day, form_id, status, level in keys:
+            self.env.cr.execute(f"""
+                INSERT INTO admission_candidate_stat (day, form_id, status, academic_level, candidate_count)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT ({STAT_KEY_COLUMNS})
+                DO UPDATE SET candidate_count = admission_candidate_stat.candidate_count + EXCLUDED.candidate_count
+            """, (day, form_id, status, level or None, deltas[(day, form_id, status, level)]))
+        self.invalidate_model(['candidate_count'])
+        self._signal_stat_change()
+
+    @api.model
+    def _get_stat_version(self):
+        """
+        Version courante des statistiques, commune à tous les processus.
+
+        Elle change après la validation de toute transaction qui a modifié la
+        table : une donnée mise en cache sous une version ne peut donc pas
+        être plus ancienne que cette version.
+        """
+        self.env.cr.execute(f"SELECT last_value FROM {STAT_VERSION_SEQUENCE}")
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _signal_stat_change(self):
+        """Incrémente la version des statistiques après la validation de la transaction."""
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get(STAT_VERSION_SEQUENCE):
+            return
+        postcommit.data[STAT_VERSION_SEQUENCE] = True
+        registry = self.env.registry
+
+        @postcommit.add
+        def bump_version():
+            with registry.cursor() as cr:
+                cr.execute(f"SELECT nextval('{STAT_VERSION_SEQUENCE}')")
+
+    @api.model
+    def _reconcile_from_view(self):
+        """
+        Réaligne la table sur la vue matérialisée.
+
+        Returns:
+            tuple: (lignes corrigées, lignes supprimées)
+        """
+        cr = self.env.cr
+        cr.execute(f"""
+            INSERT INTO admission_candidate_stat (day, form_id, status, academic_level, candidate_count)
+            SELECT day, form_id, status, academic_level, candidate_count FROM {STAT_VIEW}
+            ON CONFLICT ({STAT_KEY_COLUMNS})
+            DO UPDATE SET candidate_count = EXCLUDED.candidate_count
+            WHERE admission_candidate_stat.candidate_count <> EXCLUDED.candidate_count
+        """)
+        corrected = cr.rowcount
+        cr.execute(f"""
+            DELETE FROM admission_candidate_stat stat
+             WHERE NOT EXISTS (
+                SELECT 1 FROM {STAT_VIEW} mv
+                 WHERE mv.day = stat.day
+                   AND mv.form_id = stat.form_id
+                   AND mv.status = stat.status
+                   AND mv.level_key = COALESCE(stat.academic_level, '')
+             )
+        """)
+        deleted = cr.rowcount
+        self.invalidate_model()
+        if corrected or deleted:
+            self._signal_stat_change()
+        return corrected, deleted
+
+    @api.model
+    def _cron_refresh_stats(self):
+        """
+        Recalcule la vue matérialisée et y réaligne la table de statistiques.
+
+        Le travail est fait dans un curseur dédié dont la première instruction
+        verrouille la table : l'instantané de la transaction contient alors
+        toutes les variations validées, et celles des transactions suivantes
+        s'appliquent après la réconciliation. Les lectures ne sont pas bloquées.
+        """
+        with self.env.registry.cursor() as cr:
+            cr.execute("LOCK TABLE admission_candidate_stat IN EXCLUSIVE MODE")
+            cr.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {STAT_VIEW}")
+            corrected, deleted = self.with_env(self.env(cr=cr))._reconcile_from_view()
+        self.invalidate_model()
+        _logger.info(
+            "Statistiques des candidatures réconciliées : %d lignes corrigées, %d supprimées",
+            corrected, deleted,
+        )
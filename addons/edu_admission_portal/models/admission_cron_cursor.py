@@ -0,0 +1,43 @@
+from odoo import models, fields, api
+
+
+class AdmissionCronCursor(models.Model):
+    """
+    Point de reprise d'une tâche planifiée qui parcourt des enregistrements par ID.
+
+    Contrairement à un paramètre système, dont l'écriture vide les caches du
+    registre dans tous les workers, le curseur peut être mis à jour après
+    chaque paquet traité.
+    """
+    _name = 'admission.cron.cursor'
+    _description = 'Point de Reprise de Tâche Planifiée'
+    _rec_name = 'code'
+
+    code = fields.Char(
+        string='Code',
+        required=True,
+        readonly=True,
+    )
+    last_id = fields.Integer(
+        string='Dernier ID traité',
+        default=0,
+    )
+
+    _sql_constraints = [
+        ('code_uniq', 'unique(code)', 'Un seul point de reprise par tâche!'),
+    ]
+
+    @api.model
+    def _get_cursor(self, code):
+        """Dernier ID traité par la tâche, 0 si elle n'a jamais tourné."""
+        return self.sudo().search([('code', '=', code)], limit=1).last_id
+
+    @api.model
+    def _set_cursor(self, code, last_id):
+        """Enregistre le dernier ID traité par la tâche."""
+        cursor = self.sudo().search([('code', '=', code)], limit=1)
+        if cursor:
+            if cursor.last_id != last_id:
+                cursor.last_id = last_id
+        else:
+            self.sudo().create({'code': code, 'last_id': last_id})
@@ -1,5 +1,4 @@
 from odoo import models, fields, api, tools
-from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import json
 
@@ -41,47 +40,36 @@ class AdmissionDashboard(models.Model):
 
     def _compute_status_distribution(self):
         """Calcule la distribution des candidats par statut."""
+        status_labels = dict(self.env['admission.candidate']._fields['status'].selection)
+        data = self.env['admission.candidate.stat']._read_group(
+            [], ['status'], ['candidate_count:sum']
+        )
         for record in self:
-            data = self.env['admission.candidate'].read_group(
-                [('active', '=', True)],
-                ['status'],
-                ['status']
-            )
             record.status_distribution = json.dumps({
-                'labels': [d['status'] for d in data],
+                'labels': [status_labels.get(status, status) for status, _count in data],
                 'datasets': [{
-                    'data': [d['__count'] for d in data],
+                    'data': [count for _status, count in data],
                     'backgroundColor': [
-                        '#28a745',  # Accepté
-                        '#ffc107',  # En attente
-                        '#dc3545',  # Refusé
-                        '#6c757d'   # Autres
+                        self.env['admission.candidate']._get_status_color(status)
+                        for status, _count in data
                     ]
                 }]
             })
 
     def _compute_submission_timeline(self):
         """Calcule l'évolution des candidatures dans le temps."""
+        # 12 derniers mois, en une seule requête groupée par mois
+        first_month = fields.Date.today().replace(day=1) - relativedelta(months=11)
+        data = dict(self.env['admission.candidate.stat']._read_group(
+            [('day', '>=', first_month)], ['day:month'], ['candidate_count:sum']
+        ))
+        months = [first_month + relativedelta(months=i) for i in range(12)]
         for record in self:
-            # Récupère les 12 derniers mois
-            months = []
-            counts = []
-            for i in range(11, -1, -1):
-                start_date = datetime.now() - relativedelta(months=i)
-                end_date = start_date + relativedelta(months=1)
-                count = self.env['admission.candidate'].search_count([
-                    ('submission_date', '>=', start_date),
-                    ('submission_date', '<', end_date),
-                    ('active', '=', True)
-                ])
-                months.append(start_date.strftime('%B %Y'))
-                counts.append(count)
-
             record.submission_timeline = json.dumps({
-                'labels': months,
+                'labels': [month.strftime('%B %Y') for month in months],
                 'datasets': [{
                     'label': 'Candidatures',
-                    'data': counts,
+                    'data': [data.get(month, 0) for month in months],
                     'borderColor': '#007bff',
                     'fill': False
                 }]
@@ -89,51 +77,46 @@ class AdmissionDashboard(models.Model):
 
     def _compute_form_distribution(self):
         """Calcule la distribution des candidats par formulaire."""
+        data = self.env['admission.candidate.stat']._read_group(
+            [], ['form_id'], ['candidate_count:sum']
+        )
         for record in self:
-            data = self.env['admission.candidate'].read_group(
-                [('active', '=', True)],
-                ['form_id'],
-                ['form_id']
-            )
             record.form_distribution = json.dumps({
-                'labels': [d['form_id'][1] if d['form_id'] else 'Sans formulaire' 
-                          for d in data],
+                'labels': [form.name if form else 'Sans formulaire' for form, _count in data],
                 'datasets': [{
-                    'data': [d['__count'] for d in data],
+                    'data': [count for _form, count in data],
                     'backgroundColor': '#17a2b8'
                 }]
             })
 
     def _compute_academic_level_distribution(self):
         """Calcule la distribution des candidats par niveau académique."""
+        data = self.env['admission.candidate.stat']._read_group(
+            [], ['academic_level'], ['candidate_count:sum']
+        )
         for record in self:
-            data = self.env['admission.candidate'].read_group(
-                [('active', '=', True)],
-                ['academic_level'],
-                ['academic_level']
-            )
             record.academic_level_distribution = json.dumps({
-                'labels': [d['academic_level'] if d['academic_level'] else 'Non spécifié'
-                          for d in data],
+                'labels': [level if level else 'Non spécifié' for level, _count in data],
                 'datasets': [{
-                    'data': [d['__count'] for d in data],
+                    'data': [count for _level, count in data],
                     'backgroundColor': '#6f42c1'
                 }]
             })
 
     def init(self):
-        """Initialise la vue SQL du tableau de bord."""
+        """Initialise la vue SQL du tableau de bord, lue dans la table de statistiques."""
         tools.drop_view_if_exists(self.env.cr, self._table)
         self.env.cr.execute("""
             CREATE OR REPLACE VIEW %s AS (
                 SELECT 
                     1 as id,
                     'Dashboard' as name,
-                    COUNT(*) as total_candidates,
-                    COUNT(CASE WHEN status = 'accepted' THEN 1 END) as accepted_candidates,
-                    COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending_candidates,
-                    COUNT(CASE WHEN status = 'refused' THEN 1 END) as refused_candidates
-                FROM admission_candidate
-                WHERE active = true
+                    COALESCE(SUM(candidate_count), 0) as total_candidates,
+                    COALESCE(SUM(candidate_count) FILTER (WHERE status = 'accepted'), 0) as accepted_candidates,
+                    COALESCE(SUM(candidate_count) FILTER (
+                        WHERE status IN ('new', 'complete', 'shortlisted', 'invited')
+                    ), 0) as pending_candidates,
+                    COALESCE(SUM(candidate_count) FILTER (WHERE status = 'refused'), 0) as refused_candidates
+                FROM admission_candidate_stat
             )
-        """ % self._table) 
\ No newline at end of file
+        """ % self._table)
@@ -1,11 +1,21 @@
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import UserError, ValidationError
 import json
 import logging
 import re
 
+from ..tools.mapping_plan import MappingPlan
+
 _logger = logging.getLogger(__name__)
 
+# Champs d'une ligne de mapping issus de LimeSurvey, tenus à jour par la
+# réconciliation ; les autres (champ Odoo, transformations, statut...) sont
+# le travail de l'opérateur et ne sont jamais écrasés.
+RECONCILED_LINE_FIELDS = (
+    'sequence', 'question_qid', 'question_code', 'question_text', 'question_type',
+    'is_required', 'is_attachment', 'group_name', 'attributes',
+)
+
 class AdmissionFormMapping(models.Model):
     _name = 'admission.form.mapping'
     _description = "Mapping Formulaire d'Admission"
@@ -69,6 +79,119 @@ class AdmissionFormMapping(models.Model):
         tracking=True,
     )
 
+    @api.model
+    @tools.ormcache('form_template_id')
+    def _get_mapping_plan(self, form_template_id):
+        """
+        Retourne le plan compilé du mapping validé d'un formulaire.
+
+        Le plan est mis en cache dans le registre, par formulaire, et
+        invalidé à chaque modification d'un mapping ou d'une ligne de
+        mapping. Une clé (ID du mapping, write_date) demanderait de relire
+        le mapping à chaque réponse, et la date d'écriture du mapping ne
+        change pas quand seules ses lignes sont modifiées.
+
+        Args:
+            form_template_id (int): ID du template de formulaire
+
+        Returns:
+            MappingPlan: Le plan compilé, ou None sans mapping validé
+        """
+        mapping = self.sudo().search([
+            ('form_template_id', '=', form_template_id),
+            ('state', '=', 'validated')
+        ], limit=1)
+        if not mapping:
+            return None
+        return MappingPlan.from_mapping(mapping)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalide les plans de mapping compilés."""
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        """Invalide les plans de mapping compilés."""
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        """Invalide les plans de mapping compilés."""
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    def _reconcile_lines(self, lines_vals):
+        """
+        Aligne les lignes du mapping sur les questions du formulaire.
+
+        Les lignes existantes sont rapprochées des questions par qid, puis
+        par code de question. Les différences sont calculées en une passe
+        et appliquées en une création groupée, une écriture par ensemble de
+        valeurs identiques et une suppression. Les lignes validées ne sont
+        jamais modifiées ni supprimées.
+
+        Args:
+            lines_vals (list): Valeurs des lignes attendues, dans l'ordre du
+                formulaire (champs de ``RECONCILED_LINE_FIELDS``)
+
+        Returns:
+            dict: Nombre de lignes créées, mises à jour, supprimées et
+            validées conservées
+        """
+        self.ensure_one()
+        Line = self.env['admission.mapping.line']
+
+        # Index des lignes existantes ; une ligne validée l'emporte sur un doublon
+        by_qid, by_code = {}, {}
+        for line in self.mapping_line_ids.sorted(lambda l: (l.status != 'validated', l.id)):
+            if line.question_qid:
+                by_qid.setdefault(line.question_qid, line)
+            by_code.setdefault(line.question_code, line)
+
+        matched_ids = set()
+        to_create = []
+        to_write = {}
+        kept = 0
+        for vals in lines_vals:
+            line = by_qid.get(vals.get('question_qid')) if vals.get('question_qid') else None
+            if line is None or line.id in matched_ids:
+                line = by_code.get(vals['question_code'])
+            if line is None or line.id in matched_ids:
+                to_create.append(dict(vals, mapping_id=self.id, status='draft'))
+                continue
+
+            matched_ids.add(line.id)
+            if line.status == 'validated':
+                kept += 1
+                continue
+            changes = tuple(
+                (name, vals[name]) for name in RECONCILED_LINE_FIELDS
+                if name in vals and (line[name] or False) != (vals[name] or False)
+            )
+            if changes:
+                to_write.setdefault(changes, []).append(line.id)
+
+        to_delete = self.mapping_line_ids.filtered(
+            lambda l: l.id not in matched_ids and l.status != 'validated'
+        )
+        if to_delete:
+            to_delete.unlink()
+        for changes, line_ids in to_write.items():
+            Line.browse(line_ids).write(dict(changes))
+        if to_create:
+            Line.create(to_create)
+
+        return {
+            'created': len(to_create),
+            'updated': sum(len(line_ids) for line_ids in to_write.values()),
+            'deleted': len(to_delete),
+            'kept': kept,
+        }
+
     @api.depends('form_template_id', 'generated_at')
     def _compute_name(self):
         """Calcule un nom unique pour le mapping."""
@@ -98,6 +221,9 @@ class AdmissionFormMapping(models.Model):
                 "Certains champs requis ne sont pas mappés :\n%s"
             ) % '\n'.join(['- ' + line.question_text for line in unmapped_required]))
 
+        # Les erreurs de syntaxe doivent apparaître maintenant, pas à l'import
+        self.mapping_line_ids.filtered(lambda l: l.status == 'validated')._check_python_syntax()
+
         self.write({'state': 'validated'})
         
         # Activation automatique de la création des candidats
@@ -5,14 +5,30 @@ from odoo.exceptions import UserError, ValidationError
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import logging
+import hashlib
 import json
 import re
 import base64
 import traceback
 from odoo.http import request
 
+from ..tools.rpc_telemetry import payload_summary
+
 _logger = logging.getLogger(__name__)
 
+# Nombre de réponses traitées ensemble par le mapping lors d'un import
+IMPORT_CHUNK_SIZE = 500
+
+# Propriétés variables exclues de l'empreinte de structure
+STRUCTURE_VOLATILE_KEYS = ('response_count', 'incomplete_response_count')
+
+# Champs de list_surveys servant d'indicateur de changement
+SURVEY_INDICATOR_KEYS = ('sid', 'surveyls_title', 'active', 'startdate', 'expires')
+
+# Délai (heures) au-delà duquel la structure d'un sondage actif est revérifiée :
+# les libellés restent modifiables sans changer l'indicateur de list_surveys
+STRUCTURE_CHECK_INTERVAL = 1
+
 class AdmissionFormTemplate(models.Model):
     _name = 'admission.form.template'
     _description = "Template de Formulaire d'Admission"
@@ -71,6 +87,21 @@ class AdmissionFormTemplate(models.Model):
         string='Dernière Synchronisation',
         tracking=True,
     )
+    last_response_id = fields.Integer(
+        string='Dernière Réponse Importée',
+        default=0,
+        copy=False,
+        help="ID LimeSurvey le plus élevé parmi les réponses importées : "
+             "les synchronisations suivantes ne demandent que les réponses plus récentes",
+    )
+    first_incomplete_response_id = fields.Integer(
+        string='Première Réponse Incomplète',
+        default=0,
+        copy=False,
+        help="ID LimeSurvey de la plus ancienne réponse encore incomplète au dernier import : "
+             "les imports suivants reprennent à partir d'elle, pour ne pas manquer une "
+             "réponse terminée après des réponses plus récentes (0 : aucune)",
+    )
     candidate_ids = fields.One2many(
         'admission.candidate',
         'form_id',
@@ -102,6 +133,24 @@ class AdmissionFormTemplate(models.Model):
         string='Nombre de Questions',
         readonly=True,
     )
+    structure_hash = fields.Char(
+        string='Empreinte de Structure',
+        readonly=True,
+        copy=False,
+        help="Empreinte SHA-256 des groupes, questions et propriétés de langue "
+             "lors de la dernière synchronisation ayant modifié le formulaire",
+    )
+    structure_indicator = fields.Char(
+        string='Indicateur de Changement',
+        readonly=True,
+        copy=False,
+        help="Empreinte de la ligne list_surveys du sondage (titre, statut, dates)",
+    )
+    structure_checked_date = fields.Datetime(
+        string='Structure Vérifiée le',
+        readonly=True,
+        copy=False,
+    )
 
     # Champs pour la création automatique
     auto_create_candidates = fields.Boolean(
@@ -133,6 +182,12 @@ class AdmissionFormTemplate(models.Model):
         tracking=True,
     )
     
+    notify_on_submit = fields.Boolean(
+        string='Notifier à la Soumission',
+        default=False,
+        help="Envoie un email de notification à chaque candidature reçue par webhook",
+    )
+
     total_auto_created = fields.Integer(
         string='Total Auto-Créés',
         default=0,
@@ -145,79 +200,169 @@ class AdmissionFormTemplate(models.Model):
          'Un formulaire avec cet ID existe déjà pour ce serveur!')
     ]
 
+    # Champs dont la modification invalide l'index des tokens webhook
+    _WEBHOOK_INDEX_FIELDS = {'sid', 'server_config_id', 'active'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalide l'index des tokens webhook à la création d'un formulaire."""
+        records = super().create(vals_list)
+        self.env['limesurvey.server.config']._invalidate_webhook_token_index()
+        return records
+
+    def write(self, vals):
+        """Invalide l'index des tokens webhook si le rattachement change."""
+        result = super().write(vals)
+        if self._WEBHOOK_INDEX_FIELDS.intersection(vals):
+            self.env['limesurvey.server.config']._invalidate_webhook_token_index()
+        return result
+
+    def unlink(self):
+        """Invalide l'index des tokens webhook à la suppression."""
+        result = super().unlink()
+        self.env['limesurvey.server.config']._invalidate_webhook_token_index()
+        return result
+
+    @api.model
+    def _structure_fingerprint(self, survey_properties):
+        """
+        Calcule l'empreinte de la structure d'un sondage.
+
+        Les groupes, questions, propriétés de base et de langue entrent dans
+        l'empreinte ; les compteurs de réponses en sont exclus.
+
+        Args:
+            survey_properties (dict): Propriétés renvoyées par get_survey_properties
+
+        Returns:
+            str: Empreinte SHA-256 hexadécimale
+        """
+        structure = {
+            key: value for key, value in (survey_properties or {}).items()
+            if key not in STRUCTURE_VOLATILE_KEYS
+        }
+        payload = json.dumps(structure, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @api.model
+    def _survey_change_indicator(self, survey_row):
+        """
+        Indicateur de changement peu coûteux, tiré de la ligne list_surveys.
+
+        Returns:
+            str: Empreinte SHA-1 hexadécimale, ou False si la ligne est absente
+        """
+        if not isinstance(survey_row, dict):
+            return False
+        payload = json.dumps(
+            [str(survey_row.get(key) or '') for key in SURVEY_INDICATOR_KEYS],
+            ensure_ascii=False,
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _get_structure_check_interval(self):
+        """Délai de revérification de la structure des sondages actifs (heures)."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.structure_check_interval', STRUCTURE_CHECK_INTERVAL
+        ))
+
+    def _structure_fetch_needed(self, indicator):
+        """
+        Indique si la structure du sondage doit être retéléchargée.
+
+        Un sondage actif ne peut pas changer de questions dans LimeSurvey,
+        mais ses libellés restent modifiables sans que l'indicateur de
+        ``list_surveys`` ne change. Le téléchargement n'est évité que si
+        l'indicateur est inchangé et que la dernière vérification date de
+        moins de ``edu_admission_portal.structure_check_interval`` heures.
+        """
+        self.ensure_one()
+        if not self.structure_hash or not indicator or indicator != self.structure_indicator:
+            return True
+        if not self.is_active or not self.structure_checked_date:
+            return True
+        age = fields.Datetime.now() - self.structure_checked_date
+        return age > timedelta(hours=self._get_structure_check_interval())
+
+    def _structure_unchanged(self, fingerprint, indicator=None):
+        """
+        Compare une empreinte à celle du formulaire.
+
+        Si rien n'a changé, seule la date de vérification (et l'indicateur,
+        s'il a évolué) est enregistrée : métadonnées et mappings ne sont pas
+        réécrits.
+
+        Returns:
+            bool: True si la structure est identique
+        """
+        self.ensure_one()
+        if not self.structure_hash or fingerprint != self.structure_hash:
+            return False
+        vals = {'structure_checked_date': fields.Datetime.now()}
+        if indicator and indicator != self.structure_indicator:
+            vals['structure_indicator'] = indicator
+        self.with_context(mail_notrack=True).write(vals)
+        return True
+
     def _process_survey_response(self, response_data):
         """Traite les réponses du sondage en utilisant le mapping configuré."""
         _logger.info(f"Traitement des données de réponse: {response_data}")
-        processed = {}
-
-        # Récupération du mapping validé
-        mapping = self.env['admission.form.mapping'].search([
-            ('form_template_id', '=', self.id),
-            ('state', '=', 'validated')
-        ], limit=1)
+        # Récupération du plan de mapping compilé
+        plan = self.env['admission.form.mapping']._get_mapping_plan(self.id)
 
-        if not mapping:
+        if not plan:
             _logger.warning(
                 "Aucun mapping validé trouvé pour le formulaire %s",
                 self.name
             )
             return response_data
 
-        # Pour chaque ligne de mapping
-        for line in mapping.mapping_line_ids.filtered(lambda l: l.status == 'validated'):
-            try:
-                # Récupération de la valeur source
-                value = response_data.get(line.question_code)
-                
-                if value is None:
-                    continue
+        processed = self._build_processed_values(plan.iter_values(self.env, response_data))
 
-                # Si c'est une pièce jointe
-                if line.is_attachment and isinstance(value, dict):
-                    processed[line.question_code] = value
-                    continue
+        _logger.info(f"Données traitées: {processed}")
+        return processed
 
-                # Transformation de la valeur si nécessaire
-                if line.mapping_type == 'transform' and line.transform_python:
-                    try:
-                        value = line.transform_value(value)
-                    except Exception as e:
-                        _logger.error(
-                            "Erreur lors de la transformation pour %s: %s",
-                            line.question_code, str(e)
-                        )
-                        continue
+    def _process_survey_responses(self, responses_data):
+        """
+        Traite un lot de réponses en appliquant le mapping colonne par colonne.
 
-                # Validation de la valeur si nécessaire
-                if line.validation_python:
-                    try:
-                        if not line.validate_value(value):
-                            _logger.warning(
-                                "Validation échouée pour %s: %s",
-                                line.question_code, value
-                            )
-                            continue
-                    except Exception as e:
-                        _logger.error(
-                            "Erreur lors de la validation pour %s: %s",
-                            line.question_code, str(e)
-                        )
-                        continue
+        Chaque ligne de mapping est exécutée une fois pour tout le lot
+        (transformation par lot) ou valeur par valeur pour les extraits
+        classiques.
 
-                # Ajout de la valeur aux données traitées
-                if line.odoo_field:
-                    processed[line.odoo_field] = value
-                else:
-                    processed[line.question_code] = value
-            
-            except Exception as e:
-                _logger.error(
-                    "Erreur lors du traitement de la ligne %s: %s",
-                    line.question_code, str(e)
-                )
-                continue
+        Args:
+            responses_data (list): Réponses brutes indexées par code de question
 
-        _logger.info(f"Données traitées: {processed}")
+        Returns:
+            list: Données traitées, dans l'ordre des réponses
+        """
+        self.ensure_one()
+        plan = self.env['admission.form.mapping']._get_mapping_plan(self.id)
+
+        if not plan:
+            _logger.warning(
+                "Aucun mapping validé trouvé pour le formulaire %s",
+                self.name
+            )
+            return list(responses_data)
+
+        return [
+            self._build_processed_values(pairs)
+            for pairs in plan.iter_batch(self.env, responses_data)
+        ]
+
+    @api.model
+    def _build_processed_values(self, pairs):
+        """Construit les données traitées à partir des couples (ligne, valeur)."""
+        processed = {}
+        for spec, value in pairs:
+            # Les pièces jointes sont conservées telles quelles
+            if spec.is_attachment and isinstance(value, dict):
+                processed[spec.question_code] = value
+            elif spec.odoo_field:
+                processed[spec.odoo_field] = value
+            else:
+                processed[spec.question_code] = value
         return processed
 
     def _process_limesurvey_value(self, value):
@@ -336,9 +481,54 @@ class AdmissionFormTemplate(models.Model):
         
         return clean_text
 
+    @api.model
+    def _prepare_mapping_line_vals(self, question, sequence):
+        """
+        Prépare les valeurs d'une ligne de mapping à partir d'une question.
+
+        Accepte aussi bien le format brut de LimeSurvey (title, question)
+        que celui de ``_get_survey_questions`` (code, text).
+
+        Returns:
+            dict: Valeurs de la ligne, ou None si la question est invalide
+        """
+        if not isinstance(question, dict):
+            _logger.warning("Question ignorée: format invalide - %s", question)
+            return None
+
+        # Récupération des données de la question avec différents noms possibles
+        qid = question.get('qid')
+        code = question.get('title') or question.get('code') or qid or f'Q{sequence}'
+        question_text = question.get('question') or question.get('text', '')
+        question_type = question.get('type', 'T')
+
+        # Déterminer si c'est requis
+        mandatory = question.get('mandatory', False)
+        if isinstance(mandatory, str):
+            is_required = mandatory.upper() == 'Y'
+        else:
+            is_required = bool(mandatory)
+
+        return {
+            'sequence': sequence,
+            'question_qid': str(qid) if qid else False,
+            'question_code': str(code),
+            'question_text': self._clean_html_text(question_text) or str(code),
+            'question_type': self._map_question_type(question_type),
+            'is_required': is_required,
+            'is_attachment': question_type in ['|', '*'],
+            'group_name': question.get('group_name') or False,
+            'attributes': json.dumps(question.get('attributes') or {}, sort_keys=True),
+        }
+
     @api.model
     def _create_default_mappings(self, questions_data):
-        """Crée les mappings par défaut pour les champs du formulaire."""
+        """
+        Crée ou réconcilie le mapping du formulaire avec ses questions.
+
+        Le mapping existant est mis à jour ligne à ligne plutôt que recréé :
+        les lignes validées et le travail de l'opérateur sont conservés.
+        """
         try:
             # Traitement direct des questions si c'est une liste
             if isinstance(questions_data, list):
@@ -363,55 +553,31 @@ class AdmissionFormTemplate(models.Model):
                 _logger.warning("Aucune question à traiter pour le mapping")
                 return None
 
-            # Création du mapping principal
-            mapping = self.env['admission.form.mapping'].create({
-                'form_template_id': self.id,
-                'name': f"Mapping - {self.title or self.sid}",
-                'state': 'draft',
-                'notes': f'Mapping généré automatiquement pour {self.title or self.sid}',
-            })
-
-            # Création des lignes de mapping
+            # Lignes attendues, dans l'ordre du formulaire
+            lines_vals = []
             for idx, question in enumerate(questions, 1):
-                if not isinstance(question, dict):
-                    _logger.warning("Question ignorée: format invalide - %s", question)
-                    continue
-
-                # Récupération des données de la question avec différents noms possibles
-                code = question.get('title') or question.get('code') or question.get('qid', f'Q{idx}')
-                question_text = question.get('question') or question.get('text', '')
-                question_type = question.get('type', 'T')
-                
-                # Déterminer si c'est une pièce jointe
-                is_attachment = question_type in ['|', '*']
-                
-                # Déterminer si c'est requis
-                mandatory = question.get('mandatory', False)
-                if isinstance(mandatory, str):
-                    is_required = mandatory.upper() == 'Y'
-                else:
-                    is_required = bool(mandatory)
-
-                # Préparation des valeurs de la ligne
-                line_vals = {
-                    'mapping_id': mapping.id,
-                    'sequence': idx,
-                    'question_code': code,
-                    'question_text': self._clean_html_text(question_text),
-                    'question_type': self._map_question_type(question_type),
-                    'is_required': is_required,
-                    'is_attachment': is_attachment,
-                    'group_name': question.get('group_name', ''),
-                    'attributes': json.dumps(question.get('attributes', {})),
-                    'status': 'draft',
-                    'odoo_field': '',  # À mapper manuellement par l'utilisateur
-                    'confidence_score': 0,
-                }
+                line_vals = self._prepare_mapping_line_vals(question, idx)
+                if line_vals:
+                    lines_vals.append(line_vals)
 
-                # Création de la ligne
-                self.env['admission.mapping.line'].create(line_vals)
+            # Mapping existant réutilisé (le validé en priorité), sinon création
+            mapping = self.env['admission.form.mapping'].search([
+                ('form_template_id', '=', self.id),
+            ], order='state desc, id desc', limit=1)
+            if not mapping:
+                mapping = self.env['admission.form.mapping'].create({
+                    'form_template_id': self.id,
+                    'name': f"Mapping - {self.title or self.sid}",
+                    'state': 'draft',
+                    'notes': f'Mapping généré automatiquement pour {self.title or self.sid}',
+                })
 
-            _logger.info("Mapping créé avec %d lignes pour le formulaire %s", len(questions), self.sid)
+            stats = mapping._reconcile_lines(lines_vals)
+            _logger.info(
+                "Mapping du formulaire %s réconcilié : %d créées, %d mises à jour, "
+                "%d supprimées, %d validées conservées",
+                self.sid, stats['created'], stats['updated'], stats['deleted'], stats['kept'],
+            )
             return mapping
 
         except Exception as e:
@@ -487,207 +653,228 @@ class AdmissionFormTemplate(models.Model):
                 }
             }
 
-        try:
-            # Récupération des réponses depuis LimeSurvey
-            responses = self.server_config_id.get_survey_responses(self.sid)
-            
-            # Vérification si des réponses ont été trouvées
-            if responses is None:
-                return {
-                    'type': 'ir.actions.client',
-                    'tag': 'display_notification',
-                    'params': {
-                        'title': _('Erreur de Connexion'),
-                        'message': _('Impossible de récupérer les réponses. Vérifiez la connexion au serveur LimeSurvey.'),
-                        'type': 'warning',
-                        'sticky': True,
-                    }
-                }
-            
-            if not responses:
-                return {
-                    'type': 'ir.actions.client',
-                    'tag': 'display_notification',
-                    'params': {
-                        'title': _('Information'),
-                        'message': _('Aucune nouvelle réponse à importer pour ce formulaire.'),
-                        'type': 'info',
-                        'sticky': False,
-                    }
-                }
-
-            # Compteurs pour le rapport
-            stats = {
-                'total': len(responses),
-                'imported': 0,
-                'skipped': 0,
-                'errors': 0,
-                'error_details': []
-            }
-
-            # Création d'un lot d'import pour le suivi
+        # Un seul import actif par formulaire
+        import_batch = self.env['admission.import.batch'].search([
+            ('form_template_id', '=', self.id),
+            ('state', 'in', ('queued', 'running')),
+        ], limit=1)
+        if not import_batch:
             import_batch = self.env['admission.import.batch'].create({
                 'form_template_id': self.id,
                 'start_date': fields.Datetime.now(),
-                'state': 'running'
+                'state': 'queued',
             })
+        import_batch._trigger_import_cron()
 
-            for response in responses:
-                try:
-                    # Vérification si la réponse existe déjà
-                    existing = self.env['admission.candidate'].search([
-                        ('form_id', '=', self.id),
-                        ('response_id', '=', str(response.get('id')))
-                    ], limit=1)
-
-                    if existing:
-                        _logger.info(
-                            "Réponse déjà existante - Form: %s, Response: %s",
-                            self.sid, response.get('id')
-                        )
-                        stats['skipped'] += 1
-                        continue
-
-                    # Traitement des données de la réponse
-                    processed_data = self._process_survey_response(response.get('answers', {}))
-                    if not processed_data:
-                        stats['errors'] += 1
-                        stats['error_details'].append(
-                            f"Réponse {response.get('id')}: Données invalides après traitement"
-                        )
-                        continue
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Import Lancé'),
+                'message': _("L'import des réponses s'exécute en arrière-plan. "
+                             "Suivez sa progression dans le lot d'import."),
+                'type': 'info',
+                'sticky': False,
+                'next': {
+                    'type': 'ir.actions.act_window',
+                    'name': _('Lot d\'import'),
+                    'res_model': 'admission.import.batch',
+                    'res_id': import_batch.id,
+                    'view_mode': 'form',
+                    'target': 'current',
+                }
+            }
+        }
 
-                    # Création du candidat
-                    candidate_vals = {
-                        'form_id': self.id,
-                        'response_id': str(response.get('id')),
-                        'submission_date': response.get('submitdate'),
-                        'import_batch_id': import_batch.id,
-                        'status': 'new'
-                    }
-                    candidate_vals.update(processed_data)
+    @api.model
+    def _get_import_chunk_size(self):
+        """Nombre de réponses créées ensemble lors d'un import."""
+        return max(1, int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.import_chunk_size', IMPORT_CHUNK_SIZE
+        )))
+
+    def _get_imported_response_ids(self):
+        """Retourne l'ensemble des ID de réponses déjà importées pour ce formulaire."""
+        self.ensure_one()
+        candidates = self.env['admission.candidate'].with_context(active_test=False).search_read(
+            [('form_id', '=', self.id)], ['response_id'],
+        )
+        return {candidate['response_id'] for candidate in candidates}
+
+    def _import_response_chunk(self, responses, import_batch, stats):
+        """
+        Crée en une fois les candidats d'un paquet de réponses.
+
+        Le mapping est appliqué au paquet, les candidats sont créés par un
+        seul create() et les pièces jointes par une seule création multiple.
+        En cas d'échec du paquet, les réponses sont reprises une par une
+        pour isoler celles en erreur.
+
+        Args:
+            responses (list): Réponses LimeSurvey à importer
+            import_batch (record): Lot d'import en cours
+            stats (dict): Compteurs du rapport, mis à jour sur place
+
+        Returns:
+            recordset: Les candidats créés
+        """
+        self.ensure_one()
+        Candidate = self.env['admission.candidate'].with_context(
+            mail_create_nolog=True,
+            mail_create_nosubscribe=True,
+            mail_notrack=True,
+        )
 
-                    candidate = self.env['admission.candidate'].create(candidate_vals)
+        # Le mapping est appliqué au paquet, colonne par colonne
+        try:
+            processed_chunk = self._process_survey_responses(
+                [response.get('answers', {}) for response in responses]
+            )
+        except Exception as e:
+            _logger.error(
+                "Erreur lors du traitement par lot des réponses: %s", str(e)
+            )
+            processed_chunk = [
+                self._process_survey_response(response.get('answers', {}))
+                for response in responses
+            ]
+
+        to_create = []
+        for response, processed_data in zip(responses, processed_chunk):
+            if not processed_data:
+                stats['errors'] += 1
+                stats['error_details'].append(
+                    f"Réponse {response.get('id')}: Données invalides après traitement"
+                )
+                continue
 
-                    # Traitement des pièces jointes
-                    attachments = response.get('files', [])
-                    if attachments:
-                        self._process_response_attachments(candidate, attachments)
+            candidate_vals = {
+                'form_id': self.id,
+                'response_id': str(response.get('id')),
+                'submission_date': response.get('submitdate'),
+                'import_batch_id': import_batch.id,
+                'status': 'new'
+            }
+            candidate_vals.update(processed_data)
+            to_create.append((response, candidate_vals))
 
-                    stats['imported'] += 1
-                    _logger.info("Candidat créé avec succès - ID: %s", candidate.id)
+        if not to_create:
+            return Candidate.browse()
 
+        try:
+            with self.env.cr.savepoint():
+                candidates = Candidate.create([vals for _response, vals in to_create])
+            created = list(zip((response for response, _vals in to_create), candidates))
+        except Exception as e:
+            _logger.warning(
+                "Échec de la création groupée (%s), reprise réponse par réponse", str(e)
+            )
+            created = []
+            for response, vals in to_create:
+                try:
+                    with self.env.cr.savepoint():
+                        created.append((response, Candidate.create(vals)))
                 except Exception as e:
                     stats['errors'] += 1
-                    error_msg = f"Réponse {response.get('id')}: {str(e)}"
-                    stats['error_details'].append(error_msg)
+                    stats['error_details'].append(f"Réponse {response.get('id')}: {str(e)}")
                     _logger.error(
                         "Erreur lors du traitement de la réponse %s: %s",
                         response.get('id'), str(e)
                     )
-                    continue
 
-            # Mise à jour du lot d'import
-            import_batch.write({
-                'end_date': fields.Datetime.now(),
-                'state': 'done' if stats['errors'] == 0 else 'partial',
-                'total_count': stats['total'],
-                'imported_count': stats['imported'],
-                'skipped_count': stats['skipped'],
-                'error_count': stats['errors'],
-                'error_details': '\n'.join(stats['error_details'])
-            })
+        self._create_response_attachments(created)
 
-            # Mise à jour du template
-            self.write({
-                'last_sync_date': fields.Datetime.now(),
-                'sync_status': 'synced' if stats['errors'] == 0 else 'error'
-            })
-
-            # Message de succès
-            message_parts = []
-            if stats['imported'] > 0:
-                message_parts.append(_("%d candidat(s) importé(s) avec succès") % stats['imported'])
-            if stats['skipped'] > 0:
-                message_parts.append(_("%d réponse(s) déjà importée(s)") % stats['skipped'])
-            if stats['errors'] > 0:
-                message_parts.append(_("%d erreur(s) lors de l'import") % stats['errors'])
-
-            if not message_parts:
-                message = _("Aucun nouveau candidat importé")
-            else:
-                message = "\n".join(message_parts)
-
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'title': _('Import Terminé'),
-                    'message': message,
-                    'type': 'success' if stats['errors'] == 0 else 'warning',
-                    'sticky': True,
-                    'next': {
-                        'type': 'ir.actions.act_window',
-                        'name': _('Résultats de l\'import'),
-                        'res_model': 'admission.import.batch',
-                        'res_id': import_batch.id,
-                        'view_mode': 'form',
-                        'target': 'new',
-                    }
-                }
-            }
+        stats['imported'] += len(created)
+        _logger.info("%d candidat(s) créé(s) pour le formulaire %s", len(created), self.sid)
+        return Candidate.browse([candidate.id for _response, candidate in created])
 
-        except Exception as e:
-            self.sync_status = 'error'
-            raise UserError(_(
-                "Erreur lors de l'import des réponses.\n\n"
-                "Vérifiez que :\n"
-                "1. Le formulaire est correctement configuré\n"
-                "2. Le serveur LimeSurvey est accessible\n"
-                "3. Les mappings sont correctement définis\n"
-                "4. Vous avez les droits nécessaires\n\n"
-                "Détail de l'erreur : %s"
-            ) % str(e))
+    def _create_response_attachments(self, created):
+        """
+        Crée les pièces jointes d'un paquet de candidats en une seule fois.
 
-    def _process_response_attachments(self, candidate, attachments):
-        """Traite les pièces jointes d'une réponse."""
-        for attachment in attachments:
-            try:
-                # Création de la pièce jointe
-                attachment_vals = {
+        Args:
+            created (list): Couples (réponse LimeSurvey, candidat créé)
+        """
+        vals_list = []
+        owners = []
+        for response, candidate in created:
+            for attachment in response.get('files') or []:
+                vals_list.append({
                     'name': attachment.get('name', 'Sans nom'),
                     'datas': attachment.get('content'),
                     'mimetype': attachment.get('type', 'application/octet-stream'),
                     'res_model': 'admission.candidate',
                     'res_id': candidate.id,
-                }
-
-                attachment_id = self.env['ir.attachment'].create(attachment_vals)
-                candidate.write({
-                    'attachment_ids': [(4, attachment_id.id)]
                 })
+                owners.append(candidate)
 
-            except Exception as e:
-                _logger.error(
-                    "Erreur lors de la création de la pièce jointe %s: %s",
-                    attachment.get('name', 'unknown'), str(e)
-                )
+        if not vals_list:
+            return
+
+        try:
+            with self.env.cr.savepoint():
+                attachments = self.env['ir.attachment'].create(vals_list)
+        except Exception as e:
+            _logger.error("Erreur lors de la création des pièces jointes: %s", str(e))
+            return
+
+        # Rattachement : une écriture par candidat possédant des fichiers
+        attachment_ids_by_candidate = {}
+        for candidate, attachment in zip(owners, attachments):
+            attachment_ids_by_candidate.setdefault(candidate, []).append(attachment.id)
+        for candidate, attachment_ids in attachment_ids_by_candidate.items():
+            candidate.write({
+                'attachment_ids': [(4, attachment_id) for attachment_id in attachment_ids]
+            })
+
+    def _update_response_high_water_mark(self, responses):
+        """
+        Avance le point de reprise des exports à partir de réponses importées.
 
-    def _get_survey_questions(self):
-        """Récupère et traite les questions du formulaire LimeSurvey."""
+        Les réponses doivent former une suite sans trou : aucune réponse
+        d'ID inférieur ne doit être en erreur, sans quoi elle ne serait
+        plus jamais exportée. Les réponses incomplètes peuvent être
+        dépassées : ``first_incomplete_response_id`` les garde à portée.
+
+        Args:
+            responses (list): Réponses LimeSurvey normalisées déjà traitées
+        """
+        self.ensure_one()
+        Batch = self.env['admission.import.batch']
+        last_id = max((Batch._response_key(r) for r in responses), default=0)
+        if last_id > self.last_response_id:
+            self.with_context(mail_notrack=True).write({'last_response_id': last_id})
+
+    def get_required_documents(self):
+        """
+        Retourne les documents obligatoires du formulaire.
+
+        Utilisé par la contrainte des pièces jointes du candidat ; aucun
+        document n'est encore déclaré obligatoire au niveau du formulaire.
+        """
+        return []
+
+    def _get_survey_questions(self, survey_properties=None):
+        """
+        Récupère et traite les questions du formulaire LimeSurvey.
+
+        Args:
+            survey_properties (dict): Propriétés déjà téléchargées, le cas échéant
+        """
         self.ensure_one()
         
         if not self.sid or not self.server_config_id:
             return []
             
         try:
-            # Récupération des questions via l'API
-            server = self.server_config_id._get_rpc_session()
-            if not server:
-                raise ValidationError(_("Impossible de se connecter au serveur LimeSurvey"))
-                
-            # Récupération des propriétés du sondage
-            survey_properties = self.server_config_id.get_survey_properties(self.sid)
+            if survey_properties is None:
+                # Récupération des questions via l'API
+                server = self.server_config_id._get_rpc_session()
+                if not server:
+                    raise ValidationError(_("Impossible de se connecter au serveur LimeSurvey"))
+
+                # Récupération des propriétés du sondage
+                survey_properties = self.server_config_id.get_survey_properties(self.sid)
             if not survey_properties:
                 raise ValidationError(_("Impossible de récupérer les propriétés du formulaire"))
                 
@@ -760,7 +947,7 @@ class AdmissionFormTemplate(models.Model):
                 
                 questions.append(processed_question)
             
-            _logger.info("Questions récupérées avec succès: %s", questions)
+            _logger.debug("Questions récupérées avec succès: %s", payload_summary(questions))
             return questions
             
         except Exception as e:
@@ -772,64 +959,47 @@ class AdmissionFormTemplate(models.Model):
                 "Erreur lors de la récupération des questions du formulaire: %s"
             ) % str(e))
 
+    def _notify_structure_unchanged(self):
+        """Notification renvoyée lorsqu'une synchronisation n'a rien à modifier."""
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Formulaire à jour"),
+                'message': _("La structure du formulaire n'a pas changé depuis la dernière synchronisation."),
+                'sticky': False,
+                'type': 'info',
+            }
+        }
+
     def action_sync_questions(self):
         """Synchronise les questions du formulaire avec LimeSurvey."""
         self.ensure_one()
         
         try:
+            # Structure inchangée depuis la dernière synchronisation : rien à réécrire
+            survey_properties = self.server_config_id.get_survey_properties(self.sid)
+            fingerprint = self._structure_fingerprint(survey_properties)
+            has_mapping = bool(self.env['admission.form.mapping'].search_count([
+                ('form_template_id', '=', self.id),
+            ]))
+            if has_mapping and self._structure_unchanged(fingerprint):
+                return self._notify_structure_unchanged()
+
             # Récupération des questions
-            questions = self._get_survey_questions()
+            questions = self._get_survey_questions(survey_properties)
             if not questions:
                 raise ValidationError(_("Aucune question trouvée dans le formulaire"))
                 
-            # Mise à jour des questions dans le mapping
-            mapping = self.env['admission.form.mapping'].search([
-                ('form_template_id', '=', self.id),
-                ('state', '=', 'draft')
-            ], limit=1)
-            
-            if not mapping:
-                # Création d'un nouveau mapping
-                mapping = self.env['admission.form.mapping'].create({
-                    'form_template_id': self.id,
-                    'name': f"Mapping {self.name}",
-                    'state': 'draft'
-                })
-            
-            # Mise à jour ou création des lignes de mapping
-            existing_lines = {
-                line.question_code: line
-                for line in mapping.mapping_line_ids
-            }
-            
-            for question in questions:
-                line_vals = {
-                    'question_code': question['code'],
-                    'question_text': question['text'],
-                    'question_type': self._map_question_type(question['type']),
-                    'is_required': question['mandatory'],
-                    'group_name': question['group_name'],
-                    'attributes': json.dumps(question['attributes']),
-                    'status': 'draft'
-                }
-                
-                if question['code'] in existing_lines:
-                    # Mise à jour de la ligne existante
-                    line = existing_lines[question['code']]
-                    if line.status != 'validated':
-                        line.write(line_vals)
-                else:
-                    # Création d'une nouvelle ligne
-                    line_vals.update({
-                        'mapping_id': mapping.id,
-                        'sequence': len(existing_lines) + 1
-                    })
-                    self.env['admission.mapping.line'].create(line_vals)
+            # Réconciliation des lignes de mapping avec les questions
+            self._create_default_mappings(questions)
             
             # Mise à jour de la date de synchronisation
             self.write({
                 'last_sync_date': fields.Datetime.now(),
-                'question_count': len(questions)
+                'question_count': len(questions),
+                'structure_hash': fingerprint,
+                'structure_checked_date': fields.Datetime.now(),
             })
             
             return {
@@ -854,12 +1024,27 @@ class AdmissionFormTemplate(models.Model):
                 "Erreur lors de la synchronisation des questions: %s"
             ) % str(e))
 
+    @api.model
+    def sync_all_forms(self):
+        """Synchronise les formulaires de tous les serveurs actifs (tâche planifiée)."""
+        return self.env['limesurvey.server.config']._cron_sync_servers()
+
     def action_sync_form(self):
         """Synchronise le formulaire avec LimeSurvey."""
         self.ensure_one()
         try:
             # Synchronisation avec le serveur LimeSurvey
             sync_data = self.server_config_id.sync_specific_form(self.sid)
+
+            # Structure inchangée et mapping déjà généré : ni réécriture, ni
+            # régénération. Un formulaire créé par la synchronisation du serveur
+            # a une empreinte mais pas encore de mapping.
+            fingerprint = self._structure_fingerprint(sync_data['metadata'])
+            has_mapping = bool(self.field_mapping) and bool(self.env['admission.form.mapping'].search_count([
+                ('form_template_id', '=', self.id),
+            ]))
+            if has_mapping and self._structure_unchanged(fingerprint):
+                return self._notify_structure_unchanged()
             
             # Mise à jour du template avec les données synchronisées
             vals = {
@@ -871,6 +1056,8 @@ class AdmissionFormTemplate(models.Model):
                 'last_sync_date': fields.Datetime.now(),
                 'metadata': sync_data['metadata'],
                 'field_mapping': json.dumps(sync_data['questions']),
+                'structure_hash': fingerprint,
+                'structure_checked_date': fields.Datetime.now(),
             }
             self.write(vals)
             
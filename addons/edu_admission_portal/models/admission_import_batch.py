@@ -1,4 +1,17 @@
-from odoo import models, fields, api, _
+import logging
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api, modules, _
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# Clé de classe pour les verrous consultatifs PostgreSQL (un verrou par lot)
+IMPORT_BATCH_LOCK_CLASS = 31416
+
+# Nombre d'imports en échec d'une même réponse avant son abandon
+IMPORT_MAX_ATTEMPTS = 3
 
 class AdmissionImportBatch(models.Model):
     _name = 'admission.import.batch'
@@ -33,6 +46,7 @@ class AdmissionImportBatch(models.Model):
 
     state = fields.Selection([
         ('draft', 'Brouillon'),
+        ('queued', 'En File'),
         ('running', 'En Cours'),
         ('done', 'Terminé'),
         ('partial', 'Terminé avec Erreurs'),
@@ -83,6 +97,49 @@ class AdmissionImportBatch(models.Model):
         store=True,
     )
 
+    cursor_response_id = fields.Integer(
+        string='Dernière Réponse Traitée',
+        default=0,
+        help="ID LimeSurvey de la dernière réponse traitée : l'import reprend après cette réponse",
+    )
+
+    processed_count = fields.Integer(
+        string='Réponses Traitées',
+        default=0,
+    )
+
+    scanned_response_id = fields.Integer(
+        string='Dernière Réponse Lue',
+        default=0,
+        help="ID LimeSurvey de la dernière réponse lue par ce lot : les réponses "
+             "relues lors d'une reprise ne sont pas comptées une seconde fois",
+    )
+
+    incomplete_response_id = fields.Integer(
+        string='Première Réponse Incomplète',
+        default=0,
+        help="Plus petit ID LimeSurvey parmi les réponses incomplètes lues par ce lot "
+             "(0 : aucune) : il devient le point de départ du prochain import",
+    )
+
+    progress = fields.Float(
+        string='Progression',
+        compute='_compute_progress',
+    )
+
+    rows_per_second = fields.Float(
+        string='Réponses / s',
+        digits=(16, 1),
+    )
+
+    eta_date = fields.Datetime(
+        string='Fin Estimée',
+    )
+
+    last_checkpoint_date = fields.Datetime(
+        string='Dernier Point de Reprise',
+    )
+
     candidate_ids = fields.One2many(
         'admission.candidate',
         'import_batch_id',
@@ -117,6 +174,245 @@ class AdmissionImportBatch(models.Model):
             else:
                 record.success_rate = 0.0
 
+    @api.depends('processed_count', 'total_count')
+    def _compute_progress(self):
+        """Calcule le pourcentage de réponses traitées."""
+        for record in self:
+            if record.total_count > 0:
+                record.progress = min(100.0, record.processed_count / record.total_count * 100)
+            else:
+                record.progress = 0.0
+
+    @api.model
+    def _response_key(self, response):
+        """Retourne l'ID numérique d'une réponse LimeSurvey, utilisé comme curseur."""
+        try:
+            return int(response.get('id'))
+        except (TypeError, ValueError):
+            return 0
+
+    def _commit_progress(self):
+        """Rend durable le travail du paquet courant (sauf pendant les tests)."""
+        if not modules.module.current_test:
+            self.env.cr.commit()
+
+    def _trigger_import_cron(self):
+        """Réveille la tâche planifiée d'import."""
+        cron = self.env.ref(
+            'edu_admission_portal.ir_cron_process_import_batches',
+            raise_if_not_found=False,
+        )
+        if cron:
+            cron.sudo()._trigger()
+
+    @api.model
+    def _cron_process_import_batches(self):
+        """
+        Exécute les lots d'import en file ou interrompus.
+
+        Un lot resté « En Cours » sans worker actif (plantage, redémarrage,
+        délai dépassé) est repris à partir de son curseur. Un verrou
+        consultatif de session empêche deux workers de traiter le même lot.
+        """
+        batches = self.search([('state', 'in', ('queued', 'running'))], order='id')
+        for batch in batches:
+            self.env.cr.execute(
+                "SELECT pg_try_advisory_lock(%s, %s)",
+                (IMPORT_BATCH_LOCK_CLASS, batch.id),
+            )
+            if not self.env.cr.fetchone()[0]:
+                continue
+            try:
+                server = batch.form_template_id.server_config_id
+                with server._rpc_telemetry('import') as telemetry:
+                    batch._run_import()
+                    if batch.state != 'done':
+                        telemetry.outcome = 'partial' if batch.state == 'partial' else 'failed'
+            finally:
+                self.env.cr.execute(
+                    "SELECT pg_advisory_unlock(%s, %s)",
+                    (IMPORT_BATCH_LOCK_CLASS, batch.id),
+                )
+
+    def _run_import(self):
+        """
+        Importe les réponses du lot par paquets, avec reprise sur curseur.
+
+        Chaque paquet est validé par un commit, après mise à jour du curseur
+        et des indicateurs de progression. Le curseur n'avance pas au-delà
+        d'une réponse en erreur : les réponses suivantes déjà importées
+        sont ignorées à la reprise, les réponses en erreur sont réessayées.
+        Une réponse en échec ``import_max_attempts`` fois est abandonnée
+        (voir ``admission.import.failure``) et ne retient plus le curseur.
+
+        Les réponses incomplètes sont exportées mais pas importées : la plus
+        ancienne devient le point de départ du lot suivant, qui l'importera
+        une fois terminée même si des réponses plus récentes l'ont été avant.
+        """
+        self.ensure_one()
+        form = self.form_template_id
+        Batch = self.with_context(mail_notrack=True)
+        batch = Batch.browse(self.id)
+
+        if self.state == 'queued':
+            self.write({'state': 'running'})
+            self._commit_progress()
+
+        try:
+            # Seules les réponses postérieures au curseur et au dernier import sont demandées
+            floor = max(self.cursor_response_id, form.last_response_id)
+            if not self.cursor_response_id and form.first_incomplete_response_id:
+                # Nouveau lot : les réponses incomplètes au dernier import sont relues
+                floor = min(floor, form.first_incomplete_response_id - 1)
+            server = form.server_config_id
+            Failure = self.env['admission.import.failure']
+            # Les réponses abandonnées sont ignorées comme les réponses importées
+            known_response_ids = form._get_imported_response_ids() | Failure._get_dead_response_ids(form)
+
+            # Total estimé d'après les statistiques, corrigé en fin d'import
+            summary = server._get_survey_summary(form.sid)
+            remaining_estimate = max(0, summary.get('completed_responses', 0) - len(known_response_ids))
+            batch.write({'total_count': self.processed_count + remaining_estimate})
+
+            # Les réponses sont lues une à une dans l'export, par ordre croissant d'ID
+            responses = (
+                response
+                for response in server.iter_survey_responses(
+                    form.sid, from_response_id=floor + 1, completion_status='all',
+                )
+                if self._response_key(response) > floor
+            )
+
+            chunk_size = form._get_import_chunk_size()
+            run_start = time.monotonic()
+            run_processed = 0
+            error_details = [self.error_details] if self.error_details else []
+            # Plus petit ID en échec : le curseur ne le dépasse pas, pour
+            # qu'une reprise réessaie la réponse
+            first_failure = None
+            # Les réponses déjà lues par une exécution précédente ne sont pas recomptées
+            scanned = self.scanned_response_id
+            # Plus petite réponse incomplète lue par le lot
+            incomplete = self.incomplete_response_id
+
+            for chunk in split_every(chunk_size, responses, list):
+                # Le curseur est la dernière réponse traitée
+                chunk.sort(key=self._response_key)
+                stats = {
+                    'imported': 0,
+                    'skipped': 0,
+                    'errors': 0,
+                    'error_details': [],
+                }
+
+                new_responses = []
+                first_reads = 0
+                for response in chunk:
+                    response_id = str(response.get('id'))
+                    if not response.get('submitdate'):
+                        # Incomplète : ni importée ni comptée, relue au prochain lot
+                        key = self._response_key(response)
+                        incomplete = min(incomplete, key) if incomplete else key
+                        continue
+                    first_read = self._response_key(response) > scanned
+                    first_reads += first_read
+                    if response_id in known_response_ids:
+                        if first_read:
+                            stats['skipped'] += 1
+                        continue
+                    known_response_ids.add(response_id)
+                    new_responses.append(response)
+
+                if new_responses:
+                    candidates = form._import_response_chunk(new_responses, self, stats)
+                    created_ids = set(candidates.mapped('response_id'))
+                    failed = [r for r in new_responses if str(r.get('id')) not in created_ids]
+                    Failure._clear_failures(form, created_ids)
+                    dead_ids = Failure._record_failures(form, self, failed, stats['error_details'])
+                    retried = [r for r in failed if str(r.get('id')) not in dead_ids]
+                    if retried and first_failure is None:
+                        first_failure = self._response_key(retried[0])
+
+                # Réponses traitées sans interruption depuis le début de l'exécution
+                done = [
+                    response for response in chunk
+                    if first_failure is None or self._response_key(response) < first_failure
+                ]
+                form._update_response_high_water_mark(done)
+                if incomplete and (
+                    not form.first_incomplete_response_id
+                    or incomplete < form.first_incomplete_response_id
+                ):
+                    form.with_context(mail_notrack=True).write({'first_incomplete_response_id': incomplete})
+
+                # Point de reprise et indicateurs de progression
+                run_processed += len(chunk)
+                elapsed = max(time.monotonic() - run_start, 1e-6)
+                rate = run_processed / elapsed
+                processed_count = self.processed_count + first_reads
+                left = max(0, self.total_count - processed_count)
+                error_details.extend(stats['error_details'])
+                batch.write({
+                    'cursor_response_id': max(
+                        self.cursor_response_id,
+                        self._response_key(done[-1]) if done else 0,
+                    ),
+                    'scanned_response_id': max(self.scanned_response_id, self._response_key(chunk[-1])),
+                    'incomplete_response_id': incomplete,
+                    'processed_count': processed_count,
+                    'total_count': max(self.total_count, processed_count),
+                    'imported_count': self.imported_count + stats['imported'],
+                    'skipped_count': self.skipped_count + stats['skipped'],
+                    'error_count': self.error_count + stats['errors'],
+                    'error_details': '\n'.join(error_details),
+                    'rows_per_second': rate,
+                    'eta_date': fields.Datetime.now() + timedelta(seconds=left / rate),
+                    'last_checkpoint_date': fields.Datetime.now(),
+                })
+                self._commit_progress()
+
+            self.write({
+                'end_date': fields.Datetime.now(),
+                'total_count': self.processed_count,
+                'state': 'done' if self.error_count == 0 else 'partial',
+                'eta_date': False,
+            })
+            form.write({
+                'last_sync_date': fields.Datetime.now(),
+                'sync_status': 'synced' if self.error_count == 0 else 'error',
+                # Export lu jusqu'au bout : les réponses terminées depuis ne retiennent plus l'import
+                'first_incomplete_response_id': incomplete,
+            })
+            self._commit_progress()
+
+        except Exception as e:
+            _logger.error("Échec du lot d'import %s: %s", self.display_name, str(e))
+            if not modules.module.current_test:
+                self.env.cr.rollback()
+            self.write({
+                'state': 'failed',
+                'end_date': fields.Datetime.now(),
+                'error_details': '\n'.join(filter(None, [self.error_details, str(e)])),
+            })
+            form.write({'sync_status': 'error'})
+            self._commit_progress()
+
+    def action_resume(self):
+        """
+        Relance un lot interrompu ou échoué à partir de son curseur.
+
+        Les réponses en erreur sont au-delà du curseur et sont donc
+        réessayées, sauf celles déjà abandonnées ; le compteur d'erreurs
+        repart de zéro.
+        """
+        self.filtered(lambda b: b.state in ('failed', 'partial', 'draft')).write({
+            'state': 'queued',
+            'end_date': False,
+            'error_count': 0,
+        })
+        self._trigger_import_cron()
+        return True
+
     def action_view_candidates(self):
         """Ouvre la vue des candidats importés dans ce lot."""
         self.ensure_one()
@@ -128,4 +424,133 @@ class AdmissionImportBatch(models.Model):
             'domain': [('import_batch_id', '=', self.id)],
             'context': {'create': False},
             'target': 'current',
-        } 
\ No newline at end of file
+        } 
+
+class AdmissionImportFailure(models.Model):
+    """
+    Réponse LimeSurvey dont l'import a échoué.
+
+    Tant que le nombre d'essais reste sous ``import_max_attempts``, la
+    réponse retient le curseur des lots d'import et est réessayée à la
+    reprise. Au-delà, elle est abandonnée : le curseur la dépasse et les
+    imports suivants l'ignorent.
+    """
+    _name = 'admission.import.failure'
+    _description = "Réponse en Échec d'Import"
+    _order = 'form_template_id, id'
+    _rec_name = 'response_id'
+
+    form_template_id = fields.Many2one(
+        'admission.form.template',
+        string="Formulaire d'Admission",
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    response_id = fields.Char(
+        string='ID Réponse',
+        required=True,
+    )
+    import_batch_id = fields.Many2one(
+        'admission.import.batch',
+        string="Dernier Lot d'Import",
+        ondelete='set null',
+    )
+    attempt_count = fields.Integer(
+        string='Tentatives',
+        default=0,
+    )
+    state = fields.Selection([
+        ('retry', 'À Réessayer'),
+        ('dead', 'Abandonnée'),
+    ], string='État',
+        default='retry',
+        required=True,
+    )
+    last_error = fields.Text(
+        string='Dernière Erreur',
+    )
+
+    _sql_constraints = [
+        ('response_uniq', 'unique(form_template_id, response_id)',
+         'Cette réponse est déjà enregistrée en échec pour ce formulaire!'),
+    ]
+
+    @api.model
+    def _get_max_attempts(self):
+        """Nombre d'imports en échec avant l'abandon d'une réponse."""
+        return max(1, int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.import_max_attempts', IMPORT_MAX_ATTEMPTS
+        )))
+
+    @api.model
+    def _get_dead_response_ids(self, form):
+        """ID des réponses abandonnées d'un formulaire."""
+        return set(self.search([
+            ('form_template_id', '=', form.id),
+            ('state', '=', 'dead'),
+        ]).mapped('response_id'))
+
+    @api.model
+    def _clear_failures(self, form, response_ids):
+        """Oublie les échecs des réponses finalement importées."""
+        if response_ids:
+            self.search([
+                ('form_template_id', '=', form.id),
+                ('response_id', 'in', list(response_ids)),
+            ]).unlink()
+
+    @api.model
+    def _record_failures(self, form, batch, responses, error_details):
+        """
+        Compte un essai pour chaque réponse en échec.
+
+        Args:
+            form (record): Formulaire importé
+            batch (record): Lot d'import en cours
+            responses (list): Réponses non importées
+            error_details (list): Messages « Réponse <id>: ... » du paquet
+
+        Returns:
+            set: ID des réponses abandonnées par cet essai
+        """
+        if not responses:
+            return set()
+        response_ids = [str(response.get('id')) for response in responses]
+        errors = {}
+        for detail in error_details:
+            for response_id in response_ids:
+                if detail.startswith(f"Réponse {response_id}:"):
+                    errors[response_id] = detail
+        failures = {
+            failure.response_id: failure
+            for failure in self.search([
+                ('form_template_id', '=', form.id),
+                ('response_id', 'in', response_ids),
+            ])
+        }
+        max_attempts = self._get_max_attempts()
+        dead_ids = set()
+        to_create = []
+        for response_id in response_ids:
+            failure = failures.get(response_id)
+            attempts = (failure.attempt_count if failure else 0) + 1
+            vals = {
+                'import_batch_id': batch.id,
+                'attempt_count': attempts,
+                'state': 'dead' if attempts >= max_attempts else 'retry',
+                'last_error': errors.get(response_id),
+            }
+            if vals['state'] == 'dead':
+                dead_ids.add(response_id)
+                _logger.warning(
+                    "Réponse %s du formulaire %s abandonnée après %d essais",
+                    response_id, form.sid, attempts,
+                )
+            if failure:
+                failure.write(vals)
+            else:
+                to_create.append(dict(vals, form_template_id=form.id, response_id=response_id))
+        if to_create:
+            self.create(to_create)
+        return dead_ids
@@ -1,6 +1,11 @@
+import os
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+from ..tools.mapping_plan import snippet_cache
+from ..tools.snippet_sandbox import get_sandbox
+
 class AdmissionMappingLine(models.Model):
     _name = 'admission.mapping.line'
     _description = 'Ligne de Mapping Admission'
@@ -34,6 +39,14 @@ class AdmissionMappingLine(models.Model):
         help="Code Python pour transformer la valeur source avant de l'assigner au champ destination"
     )
 
+    batch_transform = fields.Boolean(
+        string='Transformation par lot',
+        default=False,
+        help="Si coché, le code de transformation reçoit la liste des valeurs d'une colonne "
+             "dans 'values' (tableau NumPy pour les questions numériques si disponible) "
+             "et doit définir 'results', de même longueur",
+    )
+
     validation_python = fields.Text(
         string='Code de validation',
         help="Code Python pour valider la valeur avant l'assignation"
@@ -51,6 +64,11 @@ class AdmissionMappingLine(models.Model):
         help="Code de la question dans LimeSurvey (ex: G01Q01)",
     )
 
+    question_qid = fields.Char(
+        string='ID Question',
+        help="Identifiant (qid) de la question dans LimeSurvey, stable même si le code est renommé",
+    )
+
     question_text = fields.Char(
         string='Question',
         required=True,
@@ -268,6 +286,40 @@ class AdmissionMappingLine(models.Model):
                 record.mapping_quality = 'unmatched'
                 record.justification = 'Aucune correspondance fiable trouvée'
 
+    @api.constrains('transform_python', 'validation_python', 'mapping_type', 'status')
+    def _check_python_code(self):
+        """Vérifie la syntaxe du code des lignes validées."""
+        self.filtered(lambda l: l.status == 'validated')._check_python_syntax()
+
+    def _check_python_syntax(self):
+        """
+        Compile le code de transformation et de validation des lignes.
+
+        Raises:
+            ValidationError: Si un extrait contient une erreur de syntaxe
+        """
+        errors = []
+        for line in self:
+            snippets = []
+            if line.mapping_type == 'transform' and line.transform_python:
+                snippets.append(('transform_python', line.transform_python))
+            if line.validation_python:
+                snippets.append(('validation_python', line.validation_python))
+            for field_name, source in snippets:
+                try:
+                    snippet_cache.get(line.id, field_name, source)
+                except SyntaxError as e:
+                    errors.append(_("- %(question)s (%(field)s, ligne %(lineno)s) : %(msg)s") % {
+                        'question': line.question_code,
+                        'field': line._fields[field_name].string,
+                        'lineno': e.lineno,
+                        'msg': e.msg,
+                    })
+        if errors:
+            raise ValidationError(_(
+                "Erreur de syntaxe dans le code Python du mapping :\n%s"
+            ) % '\n'.join(errors))
+
     def action_validate(self):
         """Valide la ligne de mapping."""
         self.write({'status': 'validated'})
@@ -280,6 +332,135 @@ class AdmissionMappingLine(models.Model):
         """Repasse la ligne en brouillon."""
         self.write({'status': 'draft'})
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalide les plans de mapping compilés."""
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        """Invalide les plans de mapping compilés."""
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        """Invalide les plans de mapping compilés."""
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    @api.model
+    def _get_snippet_sandbox(self):
+        """
+        Retourne le pool d'exécution isolée des extraits, s'il est activé.
+
+        Paramètres système :
+            edu_admission_portal.mapping_sandbox : '1' pour activer
+            edu_admission_portal.mapping_sandbox_processes : nombre de processus
+            edu_admission_portal.mapping_sandbox_call_timeout : délai CPU par valeur (s)
+            edu_admission_portal.mapping_sandbox_batch_timeout : délai CPU par lot (s)
+
+        En isolation, les extraits n'ont accès ni à ``self`` ni à ``env``.
+
+        Returns:
+            SnippetSandbox: Le pool partagé du processus, ou None
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        if ICP.get_param('edu_admission_portal.mapping_sandbox', '0') not in ('1', 'True', 'true'):
+            return None
+        return get_sandbox(
+            int(ICP.get_param(
+                'edu_admission_portal.mapping_sandbox_processes',
+                min(4, os.cpu_count() or 1)
+            )),
+            float(ICP.get_param('edu_admission_portal.mapping_sandbox_call_timeout', 1.0)),
+            float(ICP.get_param('edu_admission_portal.mapping_sandbox_batch_timeout', 30.0)),
+        )
+
+    def _run_transform(self, code, value):
+        """
+        Exécute un code de transformation compilé.
+
+        Args:
+            code: Objet code compilé de transform_python
+            value: La valeur à transformer
+
+        Returns:
+            La valeur transformée
+        """
+        # Variables disponibles dans le code
+        locals_dict = {
+            'value': value,
+            'self': self,
+            'env': self.env,
+        }
+
+        exec(code, globals(), locals_dict)
+
+        if 'result' not in locals_dict:
+            raise ValueError("Le code de transformation doit définir une variable 'result'")
+
+        return locals_dict['result']
+
+    def _run_batch_transform(self, code, values):
+        """
+        Exécute un code de transformation compilé sur une colonne de valeurs.
+
+        Args:
+            code: Objet code compilé de transform_python
+            values: Liste (ou tableau NumPy) des valeurs de la colonne
+
+        Returns:
+            list: Les valeurs transformées, dans le même ordre
+        """
+        locals_dict = {
+            'values': values,
+            'self': self,
+            'env': self.env,
+        }
+
+        exec(code, globals(), locals_dict)
+
+        if 'results' not in locals_dict:
+            raise ValueError("Le code de transformation par lot doit définir une variable 'results'")
+
+        results = locals_dict['results']
+        if hasattr(results, 'tolist'):
+            results = results.tolist()
+        results = list(results)
+        if len(results) != len(values):
+            raise ValueError(
+                "Le code de transformation par lot doit renvoyer autant de résultats que de valeurs "
+                "(%d attendus, %d reçus)" % (len(values), len(results))
+            )
+        return results
+
+    def _run_validation(self, code, value):
+        """
+        Exécute un code de validation compilé.
+
+        Args:
+            code: Objet code compilé de validation_python
+            value: La valeur à valider
+
+        Returns:
+            bool: True si la valeur est valide
+        """
+        locals_dict = {
+            'value': value,
+            'self': self,
+            'env': self.env,
+        }
+
+        exec(code, globals(), locals_dict)
+
+        if 'result' not in locals_dict:
+            raise ValueError("Le code de validation doit définir une variable 'result'")
+
+        return bool(locals_dict['result'])
+
     def transform_value(self, value):
         """
         Transforme la valeur en utilisant le code Python défini.
@@ -297,21 +478,10 @@ class AdmissionMappingLine(models.Model):
             return value
             
         try:
-            # Variables disponibles dans le code
-            locals_dict = {
-                'value': value,
-                'self': self,
-                'env': self.env,
-            }
-            
-            # Exécution du code
-            exec(self.transform_python, globals(), locals_dict)
-            
-            # Récupération de la valeur transformée
-            if 'result' not in locals_dict:
-                raise ValueError("Le code de transformation doit définir une variable 'result'")
-                
-            return locals_dict['result']
+            code = snippet_cache.get(self.id, 'transform_python', self.transform_python)
+            if self.batch_transform:
+                return self._run_batch_transform(code, [value])[0]
+            return self._run_transform(code, value)
             
         except Exception as e:
             raise Exception(f"Erreur lors de la transformation: {str(e)}")
@@ -333,21 +503,8 @@ class AdmissionMappingLine(models.Model):
             return True
             
         try:
-            # Variables disponibles dans le code
-            locals_dict = {
-                'value': value,
-                'self': self,
-                'env': self.env,
-            }
-            
-            # Exécution du code
-            exec(self.validation_python, globals(), locals_dict)
-            
-            # Récupération du résultat
-            if 'result' not in locals_dict:
-                raise ValueError("Le code de validation doit définir une variable 'result'")
-                
-            return bool(locals_dict['result'])
+            code = snippet_cache.get(self.id, 'validation_python', self.validation_python)
+            return self._run_validation(code, value)
             
         except Exception as e:
             raise Exception(f"Erreur lors de la validation: {str(e)}")
@@ -0,0 +1,200 @@
+import logging
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+
+class AdmissionStageTransition(models.Model):
+    _name = 'admission.stage.transition'
+    _description = "Changement d'Étape d'un Candidat"
+    _order = 'date desc, id desc'
+    _log_access = False
+
+    candidate_id = fields.Many2one(
+        'admission.candidate',
+        string='Candidat',
+        required=True,
+        readonly=True,
+        ondelete='cascade',
+    )
+    form_id = fields.Many2one(
+        'admission.form.template',
+        string="Formulaire d'Admission",
+        required=True,
+        readonly=True,
+        ondelete='cascade',
+    )
+    campaign = fields.Integer(
+        string='Campagne',
+        readonly=True,
+        help="Année de soumission de la candidature",
+    )
+    from_stage_id = fields.Many2one(
+        'admission.candidate.stage',
+        string='Étape de départ',
+        readonly=True,
+        ondelete='set null',
+    )
+    to_stage_id = fields.Many2one(
+        'admission.candidate.stage',
+        string="Étape d'arrivée",
+        readonly=True,
+        ondelete='set null',
+    )
+    date = fields.Datetime(
+        string='Date',
+        required=True,
+        readonly=True,
+    )
+    user_id = fields.Many2one(
+        'res.users',
+        string='Utilisateur',
+        readonly=True,
+        ondelete='set null',
+    )
+
+    def init(self):
+        """Index des parcours (par candidat) et des analyses (par formulaire et campagne)."""
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS admission_stage_transition_candidate_date_idx
+            ON admission_stage_transition (candidate_id, date, id)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS admission_stage_transition_form_campaign_idx
+            ON admission_stage_transition (form_id, campaign, to_stage_id)
+        """)
+
+    def write(self, vals):
+        raise UserError(_("L'historique des changements d'étape ne peut pas être modifié."))
+
+    @api.model
+    def _log_transitions(self, candidates, previous_stages=None):
+        """
+        Enregistre en une fois les changements d'étape de plusieurs candidats.
+
+        Args:
+            candidates (recordset): Candidats dans leur nouvelle étape
+            previous_stages (dict): Étape précédente (ID) par ID de candidat ;
+                absent pour une création
+
+        Returns:
+            recordset: Les transitions créées
+        """
+        previous_stages = previous_stages or {}
+        now = fields.Datetime.now()
+        vals_list = [{
+            'candidate_id': candidate.id,
+            'form_id': candidate.form_id.id,
+            'campaign': candidate.submission_date.year if candidate.submission_date else False,
+            'from_stage_id': previous_stages.get(candidate.id) or False,
+            'to_stage_id': candidate.stage_id.id,
+            'date': now,
+            'user_id': self.env.uid,
+        } for candidate in candidates
+            if candidate.form_id and candidate.stage_id.id != previous_stages.get(candidate.id)]
+        # Journal en ajout seul, alimenté quels que soient les droits de l'utilisateur
+        return self.sudo().create(vals_list)
+
+
+class AdmissionStageFunnel(models.Model):
+    _name = 'admission.stage.funnel'
+    _description = "Entonnoir des Étapes d'Admission"
+    _auto = False
+    _order = 'form_id, campaign desc, stage_sequence'
+
+    form_id = fields.Many2one(
+        'admission.form.template',
+        string="Formulaire d'Admission",
+        readonly=True,
+    )
+    campaign = fields.Integer(
+        string='Campagne',
+        readonly=True,
+    )
+    stage_code = fields.Char(
+        string="Code d'Étape",
+        readonly=True,
+    )
+    stage_sequence = fields.Integer(
+        string='Séquence',
+        readonly=True,
+    )
+    entered_count = fields.Integer(
+        string='Candidats entrés',
+        readonly=True,
+        group_operator='sum',
+    )
+    reached_count = fields.Integer(
+        string="Candidats ayant atteint l'étape",
+        readonly=True,
+        group_operator='sum',
+    )
+    conversion_rate = fields.Float(
+        string='Taux de conversion',
+        readonly=True,
+        group_operator='avg',
+        help="Part des candidats entrés dans le pipeline qui ont atteint l'étape",
+    )
+    median_dwell_hours = fields.Float(
+        string='Durée médiane (h)',
+        readonly=True,
+        group_operator='avg',
+        help="Durée médiane passée dans l'étape, sur les séjours terminés",
+    )
+    p90_dwell_hours = fields.Float(
+        string='Durée P90 (h)',
+        readonly=True,
+        group_operator='max',
+    )
+
+    def init(self):
+        """(Re)crée la vue matérialisée de l'entonnoir à partir des transitions."""
+        cr = self.env.cr
+        cr.execute(f"DROP MATERIALIZED VIEW IF EXISTS {self._table}")
+        cr.execute(f"""
+            CREATE MATERIALIZED VIEW {self._table} AS
+            WITH stays AS (
+                SELECT t.candidate_id, t.form_id, t.campaign, t.to_stage_id, t.date,
+                       LEAD(t.date) OVER (PARTITION BY t.candidate_id ORDER BY t.date, t.id) AS left_date
+                  FROM admission_stage_transition t
+            ),
+            entrants AS (
+                SELECT form_id, campaign, COUNT(DISTINCT candidate_id) AS candidate_count
+                  FROM admission_stage_transition
+                 GROUP BY form_id, campaign
+            )
+            SELECT ROW_NUMBER() OVER (ORDER BY s.form_id, s.campaign, COALESCE(stage.code, '')) AS id,
+                   s.form_id,
+                   s.campaign,
+                   COALESCE(s.campaign, 0) AS campaign_key,
+                   COALESCE(stage.code, '') AS stage_code,
+                   MIN(stage.sequence) AS stage_sequence,
+                   e.candidate_count AS entered_count,
+                   COUNT(DISTINCT s.candidate_id) AS reached_count,
+                   COUNT(DISTINCT s.candidate_id)::float / NULLIF(e.candidate_count, 0) AS conversion_rate,
+                   percentile_cont(0.5) WITHIN GROUP (
+                       ORDER BY EXTRACT(EPOCH FROM s.left_date - s.date)
+                   ) / 3600 AS median_dwell_hours,
+                   percentile_cont(0.9) WITHIN GROUP (
+                       ORDER BY EXTRACT(EPOCH FROM s.left_date - s.date)
+                   ) / 3600 AS p90_dwell_hours
+              FROM stays s
+              JOIN admission_candidate_stage stage ON stage.id = s.to_stage_id
+              JOIN entrants e ON e.form_id = s.form_id AND e.campaign IS NOT DISTINCT FROM s.campaign
+             GROUP BY s.form_id, s.campaign, COALESCE(stage.code, ''), e.candidate_count
+        """)
+        # Index unique requis par REFRESH MATERIALIZED VIEW CONCURRENTLY, qui
+        # n'accepte que des colonnes simples
+        cr.execute(f"""
+            CREATE UNIQUE INDEX {self._table}_key_uniq
+            ON {self._table} (form_id, campaign_key, stage_code)
+        """)
+
+    @api.model
+    def _cron_refresh_funnel(self):
+        """Recalcule l'entonnoir sans bloquer sa lecture."""
+        self.env.cr.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self._table}")
+        self.invalidate_model()
+        _logger.info("Entonnoir des étapes d'admission recalculé")
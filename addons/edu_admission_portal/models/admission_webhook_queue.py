@@ -0,0 +1,450 @@
+import base64
+import logging
+import traceback
+from datetime import timedelta
+
+from odoo import models, fields, api, modules, _
+from odoo.exceptions import UserError, ValidationError
+
+_logger = logging.getLogger(__name__)
+
+# Clé de classe pour les verrous consultatifs PostgreSQL (un verrou par formulaire)
+WEBHOOK_QUEUE_LOCK_CLASS = 31415
+
+MAX_ATTACHMENT_SIZE = 10 * 1024 * 1024  # 10 MB
+
+
+class AdmissionWebhookQueue(models.Model):
+    _name = 'admission.webhook.queue'
+    _description = "File d'Attente des Soumissions Webhook"
+    _order = 'id'
+
+    name = fields.Char(
+        string='Nom',
+        compute='_compute_name',
+    )
+    server_config_id = fields.Many2one(
+        'limesurvey.server.config',
+        string='Serveur LimeSurvey',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    form_sid = fields.Char(
+        string='ID LimeSurvey',
+        required=True,
+        index=True,
+        help="Identifiant du formulaire LimeSurvey tel que reçu par le webhook",
+    )
+    form_template_id = fields.Many2one(
+        'admission.form.template',
+        string='Formulaire',
+        ondelete='set null',
+        help="Formulaire résolu lors du traitement de la soumission",
+    )
+    response_id = fields.Char(
+        string='ID Réponse',
+        required=True,
+        index=True,
+    )
+    submit_date = fields.Char(
+        string='Date de Soumission (brute)',
+    )
+    payload = fields.Json(
+        string='Données Brutes',
+        help="Données de réponse nettoyées, telles que reçues par le webhook",
+    )
+    state = fields.Selection([
+        ('pending', 'En Attente'),
+        ('done', 'Traité'),
+        ('error', 'Erreur (nouvel essai prévu)'),
+        ('dead', 'Abandonné'),
+    ], string='État',
+        default='pending',
+        required=True,
+        index=True,
+    )
+    attempt_count = fields.Integer(
+        string='Tentatives',
+        default=0,
+    )
+    next_attempt_date = fields.Datetime(
+        string='Prochaine Tentative',
+        index=True,
+    )
+    last_error = fields.Text(
+        string='Dernière Erreur',
+    )
+    candidate_id = fields.Many2one(
+        'admission.candidate',
+        string='Candidat',
+        ondelete='set null',
+    )
+    processed_date = fields.Datetime(
+        string='Date de Traitement',
+    )
+
+    _sql_constraints = [
+        ('response_uniq', 'unique(server_config_id, form_sid, response_id)',
+         'Cette soumission a déjà été reçue pour ce formulaire!')
+    ]
+
+    @api.depends('form_sid', 'response_id')
+    def _compute_name(self):
+        """Calcule un libellé lisible pour la soumission."""
+        for record in self:
+            record.name = f"[{record.form_sid}] Réponse {record.response_id}"
+
+    @api.model
+    def _get_max_attempts(self):
+        """Nombre maximal de tentatives avant passage en lettre morte."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.webhook_queue_max_attempts', 5
+        ))
+
+    @api.model
+    def _get_batch_size(self):
+        """Nombre maximal de soumissions traitées par exécution du CRON."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.webhook_queue_batch_size', 200
+        ))
+
+    def _commit_progress(self):
+        """Rend durable le travail du formulaire courant (sauf pendant les tests)."""
+        if not modules.module.current_test:
+            self.env.cr.commit()
+
+    @api.model
+    def enqueue_submission(self, server_config_id, data, response_data):
+        """
+        Enregistre une soumission webhook dans la file d'attente.
+
+        L'insertion ignore les doublons (``ON CONFLICT DO NOTHING``) : deux
+        livraisons simultanées de la même réponse ne provoquent pas d'erreur
+        d'unicité. Si l'autre livraison n'est pas encore visible dans
+        l'instantané de la transaction, PostgreSQL lève un échec de
+        sérialisation et Odoo rejoue la requête, qui trouve alors l'entrée.
+
+        Args:
+            server_config_id (int): ID du serveur ayant authentifié la soumission
+            data (dict): Corps de la requête webhook
+            response_data (dict): Données de réponse déjà nettoyées
+
+        Returns:
+            record: L'entrée de file d'attente (existante si doublon)
+        """
+        form_sid = str(data['form_id'])
+        response_id = str(data['response_id'])
+
+        # Les rejeux de LimeSurvey ne créent pas de doublon
+        existing = self._find_submission(server_config_id, form_sid, response_id)
+        if existing:
+            return existing
+
+        self.env.cr.execute("""
+            INSERT INTO admission_webhook_queue
+                   (server_config_id, form_sid, response_id, submit_date, payload,
+                    state, attempt_count, create_uid, create_date, write_uid, write_date)
+            VALUES (%s, %s, %s, %s, %s, 'pending', 0, %s, %s, %s, %s)
+            ON CONFLICT (server_config_id, form_sid, response_id) DO NOTHING
+            RETURNING id
+        """, (
+            server_config_id, form_sid, response_id, data.get('submitdate'),
+            self._fields['payload'].convert_to_column(response_data, self),
+            self.env.uid, self.env.cr.now(), self.env.uid, self.env.cr.now(),
+        ))
+        row = self.env.cr.fetchone()
+        if not row:
+            # Livraison concurrente validée entre la recherche et l'insertion
+            return self._find_submission(server_config_id, form_sid, response_id)
+        item = self.browse(row[0])
+
+        # Réveille le CRON de traitement sans attendre son prochain intervalle
+        cron = self.env.ref(
+            'edu_admission_portal.ir_cron_process_webhook_queue',
+            raise_if_not_found=False,
+        )
+        if cron:
+            cron.sudo()._trigger()
+
+        return item
+
+    @api.model
+    def _find_submission(self, server_config_id, form_sid, response_id):
+        """Entrée de file d'attente déjà enregistrée pour cette réponse."""
+        return self.search([
+            ('server_config_id', '=', server_config_id),
+            ('form_sid', '=', form_sid),
+            ('response_id', '=', response_id),
+        ], limit=1)
+
+    @api.model
+    def _cron_process_queue(self, batch_size=None):
+        """
+        Traite les soumissions en attente par lots.
+
+        Les soumissions d'un même formulaire sont traitées dans leur ordre
+        d'arrivée : un verrou consultatif est pris par formulaire et le
+        traitement d'un formulaire s'arrête à la première soumission en
+        attente d'un nouvel essai.
+        """
+        batch_size = batch_size or self._get_batch_size()
+        now = fields.Datetime.now()
+
+        self.flush_model(['form_sid', 'state', 'next_attempt_date'])
+        self.env.cr.execute("""
+            SELECT form_sid
+              FROM admission_webhook_queue
+             WHERE state IN ('pending', 'error')
+               AND (next_attempt_date IS NULL OR next_attempt_date <= %s)
+          GROUP BY form_sid
+          ORDER BY MIN(id)
+        """, (now,))
+        form_sids = [row[0] for row in self.env.cr.fetchall()]
+
+        processed = 0
+        for form_sid in form_sids:
+            if processed >= batch_size:
+                break
+
+            # Un seul worker par formulaire pour garantir l'ordre
+            self.env.cr.execute(
+                "SELECT pg_try_advisory_xact_lock(%s, %s)",
+                (WEBHOOK_QUEUE_LOCK_CLASS, int(form_sid) if form_sid.isdigit() else 0),
+            )
+            if not self.env.cr.fetchone()[0]:
+                continue
+
+            items = self.search([
+                ('form_sid', '=', form_sid),
+                ('state', 'in', ('pending', 'error')),
+            ], order='id', limit=batch_size - processed)
+
+            for item in items:
+                if item.next_attempt_date and item.next_attempt_date > now:
+                    # Ordre garanti : on n'avance pas au-delà d'un élément à réessayer
+                    break
+                processed += 1
+                if not item._process_item():
+                    break
+
+            # Libère le verrou du formulaire et rend le lot durable
+            self._commit_progress()
+
+        if processed:
+            _logger.info("File webhook : %d soumission(s) traitée(s)", processed)
+        return processed
+
+    def _process_item(self):
+        """
+        Traite une soumission en attente.
+
+        Returns:
+            bool: False si la soumission doit être réessayée plus tard
+        """
+        self.ensure_one()
+        try:
+            with self.env.cr.savepoint():
+                candidate = self._create_candidate()
+            self.write({
+                'state': 'done',
+                'candidate_id': candidate.id,
+                'processed_date': fields.Datetime.now(),
+                'attempt_count': self.attempt_count + 1,
+                'last_error': False,
+            })
+            return True
+
+        except (UserError, ValidationError) as e:
+            # Erreur de données : un nouvel essai ne changera rien
+            _logger.warning(
+                "Soumission %s abandonnée: %s", self.display_name, str(e)
+            )
+            self.write({
+                'state': 'dead',
+                'attempt_count': self.attempt_count + 1,
+                'last_error': str(e),
+                'processed_date': fields.Datetime.now(),
+            })
+            return True
+
+        except Exception as e:
+            attempts = self.attempt_count + 1
+            _logger.error(
+                "Erreur lors du traitement de la soumission %s (tentative %d): %s",
+                self.display_name, attempts, str(e)
+            )
+            if attempts >= self._get_max_attempts():
+                self.write({
+                    'state': 'dead',
+                    'attempt_count': attempts,
+                    'last_error': traceback.format_exc(),
+                    'processed_date': fields.Datetime.now(),
+                })
+                return True
+
+            # Attente exponentielle : 1, 2, 4, 8... minutes
+            self.write({
+                'state': 'error',
+                'attempt_count': attempts,
+                'last_error': traceback.format_exc(),
+                'next_attempt_date': fields.Datetime.now() + timedelta(minutes=2 ** (attempts - 1)),
+            })
+            return False
+
+    def _create_candidate(self):
+        """Crée le candidat et ses pièces jointes à partir de la soumission."""
+        self.ensure_one()
+
+        form_template = self.form_template_id or self.env['admission.form.template'].search([
+            ('sid', '=', self.form_sid),
+            ('server_config_id', '=', self.server_config_id.id),
+        ], limit=1)
+        if not form_template:
+            raise ValidationError(_("Formulaire non trouvé: %s") % self.form_sid)
+        self.form_template_id = form_template
+
+        Candidate = self.env['admission.candidate']
+        existing = Candidate.search([
+            ('form_id', '=', form_template.id),
+            ('response_id', '=', self.response_id),
+        ], limit=1)
+        if existing:
+            return existing
+
+        response_data = self.payload or {}
+        prepared_data = self._prepare_candidate_data(form_template, response_data)
+        if not prepared_data.get('data'):
+            raise ValidationError(_("Aucune donnée valide après traitement"))
+
+        vals = dict(prepared_data['data'])
+        vals.update({
+            'response_id': self.response_id,
+            'response_data': response_data,
+            'form_id': form_template.id,
+        })
+        if self.submit_date:
+            vals['submission_date'] = self.submit_date
+
+        candidate = Candidate.create(vals)
+        self._create_attachments(candidate, prepared_data.get('attachments', []))
+
+        if form_template.notify_on_submit:
+            try:
+                template = self.env.ref(
+                    'edu_admission_portal.email_template_new_submission',
+                    raise_if_not_found=False,
+                )
+                if template:
+                    template.send_mail(candidate.id)
+            except Exception as e:
+                _logger.error(
+                    "Erreur lors de l'envoi de la notification: %s",
+                    str(e)
+                )
+
+        _logger.info(
+            "Candidat créé depuis la file webhook: %s (ID: %s)",
+            candidate.name, candidate.id
+        )
+        return candidate
+
+    @api.model
+    def _prepare_candidate_data(self, form_template, response_data):
+        """Prépare les données du candidat à partir des données du formulaire."""
+        plan = self.env['admission.form.mapping']._get_mapping_plan(form_template.id)
+
+        if not plan:
+            _logger.warning(
+                "Aucun mapping validé trouvé pour le formulaire %s",
+                form_template.name
+            )
+            return {}
+
+        candidate_data = {}
+        attachments = []
+
+        for spec, value in plan.iter_values(self.env, response_data):
+            # Traitement des pièces jointes
+            if spec.is_attachment and isinstance(value, dict):
+                mime_type = value.get('type', '').lower()
+                if not mime_type or mime_type.startswith(('text/html', 'text/javascript')):
+                    _logger.warning(
+                        "Type MIME non autorisé pour la pièce jointe: %s",
+                        mime_type
+                    )
+                    continue
+
+                content = value.get('content', '')
+                if len(content) > MAX_ATTACHMENT_SIZE:
+                    _logger.warning(
+                        "Pièce jointe trop volumineuse: %s",
+                        value.get('name', 'Sans nom')
+                    )
+                    continue
+
+                attachments.append({
+                    'name': value.get('name', 'Sans nom'),
+                    'content': content,
+                    'type': mime_type,
+                    'field': spec.question_code
+                })
+                continue
+
+            if spec.odoo_field:
+                candidate_data[spec.odoo_field] = value
+
+        return {
+            'data': candidate_data,
+            'attachments': attachments
+        }
+
+    @api.model
+    def _create_attachments(self, candidate, attachments):
+        """Crée les pièces jointes d'une soumission en une seule fois."""
+        vals_list = []
+        for attachment in attachments:
+            if not attachment.get('content'):
+                continue
+            try:
+                file_content = base64.b64decode(attachment['content'])
+            except Exception:
+                _logger.warning(
+                    "Contenu de fichier invalide: %s",
+                    attachment.get('name', 'Sans nom')
+                )
+                continue
+
+            if len(file_content) > MAX_ATTACHMENT_SIZE:
+                _logger.warning(
+                    "Fichier trop volumineux: %s",
+                    attachment.get('name', 'Sans nom')
+                )
+                continue
+
+            vals_list.append({
+                'name': attachment.get('name', 'Sans nom'),
+                'datas': attachment['content'],
+                'mimetype': attachment.get('type', 'application/octet-stream'),
+                'res_model': 'admission.candidate',
+                'res_id': candidate.id,
+                'description': f"Champ: {attachment.get('field', 'inconnu')}"
+            })
+
+        if vals_list:
+            self.env['ir.attachment'].create(vals_list)
+
+    def action_retry(self):
+        """Remet les soumissions sélectionnées en file d'attente."""
+        self.filtered(lambda q: q.state in ('error', 'dead')).write({
+            'state': 'pending',
+            'next_attempt_date': False,
+            'attempt_count': 0,
+        })
+        cron = self.env.ref(
+            'edu_admission_portal.ir_cron_process_webhook_queue',
+            raise_if_not_found=False,
+        )
+        if cron:
+            cron._trigger()
+        return True
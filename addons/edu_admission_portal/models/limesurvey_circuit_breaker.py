@@ -0,0 +1,198 @@
+import logging
+import random
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Échecs consécutifs à partir desquels le circuit s'ouvre
+CIRCUIT_FAILURE_THRESHOLD = 3
+
+# Délai avant la première sonde après ouverture, doublé à chaque nouvel échec (secondes)
+CIRCUIT_BASE_DELAY = 60
+
+# Délai maximal entre deux sondes (secondes)
+CIRCUIT_MAX_DELAY = 3600
+
+# Durée pendant laquelle une sonde en cours réserve le serveur (secondes)
+CIRCUIT_PROBE_LEASE = 300
+
+
+class LimeSurveyCircuitBreaker(models.Model):
+    """
+    Disjoncteur d'un serveur LimeSurvey.
+
+    L'état est partagé entre workers et lu ou écrit dans un curseur séparé,
+    validé immédiatement : un échec reste enregistré même si la transaction
+    de l'appelant est annulée, et les autres workers le voient aussitôt.
+
+    - fermé : les appels passent ; les échecs consécutifs sont comptés ;
+    - ouvert : les appels sont refusés sans requête jusqu'à la date de sonde,
+      repoussée de façon exponentielle (avec gigue) à chaque échec ;
+    - semi-ouvert : un seul worker sonde le serveur ; un succès referme le
+      circuit, un échec le rouvre pour un délai plus long.
+    """
+    _name = 'limesurvey.circuit.breaker'
+    _description = 'Disjoncteur de Serveur LimeSurvey'
+    _rec_name = 'server_id'
+
+    server_id = fields.Many2one(
+        'limesurvey.server.config',
+        string='Serveur LimeSurvey',
+        required=True,
+        ondelete='cascade',
+    )
+    state = fields.Selection([
+        ('closed', 'Fermé'),
+        ('open', 'Ouvert'),
+        ('half_open', 'Semi-ouvert (sonde en cours)'),
+    ], string='État',
+        default='closed',
+        required=True,
+    )
+    failure_count = fields.Integer(
+        string='Échecs consécutifs',
+        default=0,
+    )
+    opened_date = fields.Datetime(
+        string="Date d'ouverture",
+    )
+    next_probe_date = fields.Datetime(
+        string='Prochaine sonde',
+    )
+    last_failure_date = fields.Datetime(
+        string='Dernier échec',
+    )
+    last_error = fields.Text(
+        string='Dernière erreur',
+    )
+
+    _sql_constraints = [
+        ('server_uniq', 'unique(server_id)', 'Un seul disjoncteur par serveur LimeSurvey!'),
+    ]
+
+    @api.model
+    def _get_circuit_params(self):
+        """Seuil d'ouverture, délai initial et délai maximal (paramètres système)."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        return (
+            max(1, int(ICP.get_param('edu_admission_portal.circuit_failure_threshold', CIRCUIT_FAILURE_THRESHOLD))),
+            max(1, int(ICP.get_param('edu_admission_portal.circuit_base_delay', CIRCUIT_BASE_DELAY))),
+            max(1, int(ICP.get_param('edu_admission_portal.circuit_max_delay', CIRCUIT_MAX_DELAY))),
+        )
+
+    @api.model
+    def _backoff_delay(self, attempt, base_delay, max_delay):
+        """
+        Délai avant la prochaine sonde, en secondes.
+
+        Le délai double à chaque échec jusqu'au plafond ; il est tiré entre
+        sa moitié et sa valeur pour que les workers ne sondent pas tous en
+        même temps.
+        """
+        delay = min(max_delay, base_delay * 2 ** min(attempt, 32))
+        return random.uniform(delay / 2.0, delay)
+
+    @api.model
+    def _acquire(self, server_id):
+        """
+        Indique si un appel vers le serveur peut être tenté.
+
+        Quand la date de sonde d'un circuit ouvert est passée, un seul worker
+        obtient la sonde : le circuit passe semi-ouvert et la sonde est
+        réservée pour ``CIRCUIT_PROBE_LEASE`` secondes.
+
+        Returns:
+            str: 'closed' (aucun échec), 'degraded' (fermé avec échecs récents),
+            'probe' (sonde accordée), ou False si l'appel doit être évité
+        """
+        now = fields.Datetime.now()
+        try:
+            with self.env.registry.cursor() as cr:
+                cr.execute(
+                    "SELECT state, failure_count FROM limesurvey_circuit_breaker WHERE server_id = %s",
+                    (server_id,),
+                )
+                row = cr.fetchone()
+                if not row or (row[0] == 'closed' and not row[1]):
+                    return 'closed'
+                if row[0] == 'closed':
+                    return 'degraded'
+                cr.execute("""
+                    UPDATE limesurvey_circuit_breaker
+                       SET state = 'half_open', next_probe_date = %s, write_date = %s
+                     WHERE server_id = %s
+                       AND state IN ('open', 'half_open')
+                       AND next_probe_date <= %s
+                 RETURNING id
+                """, (now + timedelta(seconds=CIRCUIT_PROBE_LEASE), now, server_id, now))
+                return 'probe' if cr.fetchone() else False
+        except Exception as e:
+            # Le disjoncteur ne doit jamais empêcher un appel par sa propre faute
+            _logger.warning("Lecture du disjoncteur du serveur %s impossible: %s", server_id, str(e))
+            return 'closed'
+
+    @api.model
+    def _record_failure(self, server_id, error):
+        """
+        Enregistre un échec ; le circuit s'ouvre au seuil d'échecs consécutifs.
+
+        Returns:
+            str: Nouvel état du circuit
+        """
+        threshold, base_delay, max_delay = self._get_circuit_params()
+        now = fields.Datetime.now()
+        try:
+            with self.env.registry.cursor() as cr:
+                cr.execute("""
+                    INSERT INTO limesurvey_circuit_breaker
+                           (server_id, state, failure_count, last_failure_date, last_error,
+                            create_date, write_date)
+                    VALUES (%s, 'closed', 1, %s, %s, %s, %s)
+                    ON CONFLICT (server_id) DO UPDATE
+                       SET failure_count = limesurvey_circuit_breaker.failure_count + 1,
+                           last_failure_date = EXCLUDED.last_failure_date,
+                           last_error = EXCLUDED.last_error,
+                           write_date = EXCLUDED.write_date
+                 RETURNING failure_count
+                """, (server_id, now, str(error), now, now))
+                failures = cr.fetchone()[0]
+                if failures < threshold:
+                    return 'closed'
+
+                delay = self._backoff_delay(failures - threshold, base_delay, max_delay)
+                cr.execute("""
+                    UPDATE limesurvey_circuit_breaker
+                       SET state = 'open',
+                           opened_date = COALESCE(opened_date, %s),
+                           next_probe_date = %s
+                     WHERE server_id = %s
+                """, (now, now + timedelta(seconds=delay), server_id))
+                _logger.warning(
+                    "Circuit ouvert pour le serveur LimeSurvey %s après %d échecs, "
+                    "prochaine sonde dans %d s",
+                    server_id, failures, delay,
+                )
+                return 'open'
+        except Exception as e:
+            _logger.warning("Enregistrement de l'échec du serveur %s impossible: %s", server_id, str(e))
+            return 'closed'
+
+    @api.model
+    def _record_success(self, server_id):
+        """Referme le circuit et remet à zéro le compteur d'échecs."""
+        try:
+            with self.env.registry.cursor() as cr:
+                cr.execute("""
+                    UPDATE limesurvey_circuit_breaker
+                       SET state = 'closed', failure_count = 0, opened_date = NULL,
+                           next_probe_date = NULL, write_date = %s
+                     WHERE server_id = %s
+                       AND (state != 'closed' OR failure_count > 0)
+                 RETURNING id
+                """, (fields.Datetime.now(), server_id))
+                if cr.fetchone():
+                    _logger.info("Circuit refermé pour le serveur LimeSurvey %s", server_id)
+        except Exception as e:
+            _logger.warning("Remise à zéro du disjoncteur du serveur %s impossible: %s", server_id, str(e))
@@ -1,17 +1,53 @@
+import base64
 import logging
+import hashlib
+import time
 import xmlrpc.client
-from datetime import datetime
-from odoo import models, fields, api, _
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from odoo import models, fields, api, modules, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools.lru import LRU
 import requests
 from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode
 import re
 import json
 import traceback
 import ssl
+from contextlib import contextmanager
+
+from ..tools.export_stream import iter_export_rows
+from ..tools.rpc_telemetry import RpcTelemetry, payload_summary
+from ..tools.limesurvey_client import (
+    LimeSurveyAuthError, LimeSurveyClient, LimeSurveyError, LimeSurveyUnavailable,
+    drop_client, get_client, operation_scope, submit_in_context, subscribe, unsubscribe,
+)
 
 _logger = logging.getLogger(__name__)
 
+# Durée de mise en cache de l'URL d'API découverte (secondes)
+API_DISCOVERY_TTL = 3600
+
+# Borne haute du nombre de requêtes simultanées vers un serveur
+MAX_SYNC_CONCURRENCY = 16
+
+# Clé de classe pour les verrous consultatifs PostgreSQL (un verrou par serveur)
+SYNC_SERVER_LOCK_CLASS = 31417
+
+# Temps maximal consacré par exécution du CRON à démarrer des synchronisations
+# (secondes), en deçà de la limite de temps réel des workers
+SYNC_TIME_BUDGET = 90
+
+# Délai minimal entre deux synchronisations planifiées d'un même serveur (minutes)
+SYNC_MIN_INTERVAL = 60
+
+# Séquence incrémentée à chaque modification des tokens webhook ou des formulaires
+WEBHOOK_INDEX_VERSION_SEQUENCE = 'limesurvey_webhook_token_index_version'
+
+# Index des tokens webhook par processus, par base et par version
+_webhook_token_indexes = LRU(16)
+
 class LimeSurveyServerConfig(models.Model):
     _name = 'limesurvey.server.config'
     _description = 'Configuration du Serveur LimeSurvey'
@@ -38,6 +74,12 @@ class LimeSurveyServerConfig(models.Model):
         required=True,
         tracking=True,
     )
+    verify_ssl = fields.Boolean(
+        string='Vérifier le certificat TLS',
+        default=True,
+        tracking=True,
+        help="Décocher uniquement pour un serveur de développement au certificat auto-signé",
+    )
     connection_status = fields.Selection([
         ('not_tested', 'Non Testé'),
         ('connected', 'Connecté'),
@@ -59,20 +101,170 @@ class LimeSurveyServerConfig(models.Model):
         help='Token de sécurité pour l\'authentification des webhooks LimeSurvey',
         copy=False,
     )
+    sync_concurrency = fields.Integer(
+        string='Requêtes simultanées',
+        default=4,
+        help='Nombre de sondages récupérés en parallèle lors de la synchronisation',
+    )
     form_template_ids = fields.One2many(
         'admission.form.template',
         'server_config_id',
         string='Templates de Formulaires',
     )
+    sync_attempt_date = fields.Datetime(
+        string='Dernière synchronisation planifiée',
+        readonly=True,
+        copy=False,
+        help='Début de la dernière synchronisation lancée par la tâche planifiée',
+    )
+    sync_duration = fields.Float(
+        string='Durée de synchronisation (s)',
+        readonly=True,
+        copy=False,
+    )
+    sync_outcome = fields.Selection([
+        ('running', 'En cours'),
+        ('success', 'Réussie'),
+        ('partial', 'Partielle'),
+        ('failed', 'Échec'),
+    ], string='Résultat de la synchronisation',
+        readonly=True,
+        copy=False,
+    )
+    sync_outcome_message = fields.Text(
+        string='Détail de la synchronisation',
+        readonly=True,
+        copy=False,
+    )
+    circuit_state = fields.Selection([
+        ('closed', 'Fermé'),
+        ('open', 'Ouvert'),
+        ('half_open', 'Semi-ouvert (sonde en cours)'),
+    ], string='Disjoncteur',
+        compute='_compute_circuit',
+        help="Ouvert : le serveur a échoué trop de fois de suite, les appels sont suspendus jusqu'à la prochaine sonde",
+    )
+    circuit_failure_count = fields.Integer(
+        string='Échecs consécutifs',
+        compute='_compute_circuit',
+    )
+    circuit_next_probe_date = fields.Datetime(
+        string='Prochaine sonde',
+        compute='_compute_circuit',
+    )
+    circuit_last_error = fields.Text(
+        string='Dernière erreur de connexion',
+        compute='_compute_circuit',
+    )
 
     _sql_constraints = [
         ('name_uniq', 
          'UNIQUE(name, active)',
-         'Le nom de la configuration doit être unique pour les configurations actives!')
+         'Le nom de la configuration doit être unique pour les configurations actives!'),
+        ('sync_concurrency_range',
+         'CHECK(sync_concurrency >= 1 AND sync_concurrency <= %d)' % MAX_SYNC_CONCURRENCY,
+         'Le nombre de requêtes simultanées doit être compris entre 1 et %d.' % MAX_SYNC_CONCURRENCY)
     ]
 
+    # Champs dont la modification invalide l'index des tokens webhook
+    _WEBHOOK_INDEX_FIELDS = {'webhook_token', 'active'}
+
+    # Champs dont la modification ferme la session RPC partagée
+    _RPC_CLIENT_FIELDS = {'base_url', 'api_username', 'api_password', 'verify_ssl', 'active'}
+
+    def init(self):
+        """Crée la séquence de version de l'index des tokens webhook."""
+        self.env.cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {WEBHOOK_INDEX_VERSION_SEQUENCE}")
+
+    @api.model
+    def _get_webhook_token_index(self):
+        """
+        Retourne l'index des tokens webhook, mis en cache par processus.
+
+        L'index est associé à la version courante de la séquence : seule
+        cette version est lue à chaque appel. Une transaction qui a modifié
+        les tokens ou les formulaires ne met pas en cache l'index qu'elle
+        voit, puisqu'il n'est pas encore validé.
+
+        Returns:
+            dict: empreinte SHA-256 du token -> (ID serveur, frozenset des SID autorisés)
+        """
+        cr = self.env.cr
+        cr.execute(f"SELECT last_value FROM {WEBHOOK_INDEX_VERSION_SEQUENCE}")
+        key = (cr.dbname, cr.fetchone()[0])
+        index = _webhook_token_indexes.get(key)
+        if index is None:
+            index = self._build_webhook_token_index()
+            if not cr.postcommit.data.get(WEBHOOK_INDEX_VERSION_SEQUENCE):
+                _webhook_token_indexes[key] = index
+        return index
+
+    @api.model
+    def _build_webhook_token_index(self):
+        """
+        Construit l'index des tokens webhook.
+
+        Returns:
+            dict: empreinte SHA-256 du token -> (ID serveur, frozenset des SID autorisés)
+        """
+        servers = self.sudo().search([('webhook_token', '!=', False)])
+        sids_by_server = defaultdict(set)
+        for template in self.env['admission.form.template'].sudo().search_read(
+            [('server_config_id', 'in', servers.ids)],
+            ['sid', 'server_config_id'],
+        ):
+            sids_by_server[template['server_config_id'][0]].add(str(template['sid']))
+
+        return {
+            hashlib.sha256(server.webhook_token.encode('utf-8')).digest():
+                (server.id, frozenset(sids_by_server[server.id]))
+            for server in servers
+        }
+
+    @api.model
+    def _invalidate_webhook_token_index(self):
+        """
+        Change la version de l'index des tokens webhook.
+
+        La version change immédiatement, puis de nouveau après la validation
+        de la transaction : un index construit entre-temps par un autre
+        processus, sans les modifications, n'est plus jamais relu.
+        """
+        cr = self.env.cr
+        cr.execute(f"SELECT nextval('{WEBHOOK_INDEX_VERSION_SEQUENCE}')")
+        if cr.postcommit.data.get(WEBHOOK_INDEX_VERSION_SEQUENCE):
+            return
+        cr.postcommit.data[WEBHOOK_INDEX_VERSION_SEQUENCE] = True
+        registry = self.env.registry
+
+        @cr.postcommit.add
+        def bump_version():
+            with registry.cursor() as cr:
+                cr.execute(f"SELECT nextval('{WEBHOOK_INDEX_VERSION_SEQUENCE}')")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalide l'index des tokens webhook à la création."""
+        records = super().create(vals_list)
+        if any(vals.get('webhook_token') for vals in vals_list):
+            self._invalidate_webhook_token_index()
+        return records
+
+    def write(self, vals):
+        """Invalide l'index des tokens webhook si un token change."""
+        result = super().write(vals)
+        if self._WEBHOOK_INDEX_FIELDS.intersection(vals):
+            self._invalidate_webhook_token_index()
+        if self._RPC_CLIENT_FIELDS.intersection(vals):
+            for record in self:
+                drop_client(record._get_rpc_client_key())
+        return result
+
     def unlink(self):
         """Surcharge de la méthode de suppression pour archiver au lieu de supprimer."""
+        self._invalidate_webhook_token_index()
+        for record in self:
+            drop_client(record._get_rpc_client_key())
         for record in self:
             if record.form_template_ids:
                 # Si des templates sont liés, on archive au lieu de supprimer
@@ -86,7 +278,7 @@ class LimeSurveyServerConfig(models.Model):
             # Essai de la méthode get_site_settings sans session
             try:
                 settings = server.get_site_settings()
-                _logger.info("Site settings (no session): %s", settings)
+                _logger.debug("Site settings (no session): %s", payload_summary(settings))
                 return settings
             except:
                 pass
@@ -94,7 +286,7 @@ class LimeSurveyServerConfig(models.Model):
             # Essai avec différents formats d'authentification basique
             try:
                 settings = server.get_site_settings(self.api_username, self.api_password)
-                _logger.info("Site settings (basic auth): %s", settings)
+                _logger.debug("Site settings (basic auth): %s", payload_summary(settings))
                 return settings
             except:
                 pass
@@ -105,7 +297,7 @@ class LimeSurveyServerConfig(models.Model):
                     'username': self.api_username,
                     'password': self.api_password
                 })
-                _logger.info("Site settings (named params): %s", settings)
+                _logger.debug("Site settings (named params): %s", payload_summary(settings))
                 return settings
             except:
                 pass
@@ -186,40 +378,43 @@ class LimeSurveyServerConfig(models.Model):
 
     def _check_api_accessibility(self, base_url):
         """Vérifie l'accessibilité de l'API avant la tentative de connexion."""
-        try:
-            # Test de l'URL de base
-            response = requests.get(base_url, timeout=5, verify=False)
-            _logger.info("Test URL de base - Status: %s", response.status_code)
-            
-            # Test des différents chemins d'API
-            api_paths = [
-                'admin/remotecontrol',
-                'index.php/admin/remotecontrol',
-                'remotecontrol'
-            ]
-            
-            for path in api_paths:
-                api_url = urljoin(base_url + '/', path)
+        return bool(self._discover_api_url(base_url))
+
+    def _discover_api_url(self, base_url, verify=True):
+        """
+        Découvre l'URL de l'API RemoteControl du serveur.
+
+        Les chemins candidats sont sondés dans l'ordre ; le premier qui
+        répond est retenu. Le résultat est conservé avec le client RPC.
+
+        :param verify: vérifier le certificat TLS du serveur
+        :return: URL de l'API, ou None si aucun chemin ne répond
+        """
+        candidates = [self.clean_limesurvey_url(base_url, 'api')]
+        for path in ('index.php/admin/remotecontrol', 'admin/remotecontrol', 'remotecontrol'):
+            url = urljoin(base_url.rstrip('/') + '/', path)
+            if url not in candidates:
+                candidates.append(url)
+
+        with requests.Session() as http:
+            for api_url in candidates:
                 try:
-                    response = requests.post(
+                    # Appel sans effet : aucune session n'est ouverte par la sonde
+                    response = http.post(
                         api_url,
-                        json={'method': 'get_session_key', 'params': [self.api_username, self.api_password]},
+                        json={'method': 'release_session_key', 'params': ['probe'], 'id': 1},
                         headers={'Content-Type': 'application/json'},
                         timeout=5,
-                        verify=False
+                        verify=verify
                     )
-                    _logger.info("Test API %s - Status: %s", api_url, response.status_code)
-                    if response.status_code in [200, 401]:  # 401 est acceptable car cela signifie que l'API est accessible mais nécessite une authentification
-                        return True
+                    _logger.debug("Test API %s - Status: %s", api_url, response.status_code)
+                    # 401 est acceptable : l'API est accessible mais nécessite une authentification
+                    if response.status_code in [200, 401]:
+                        return api_url
                 except Exception as e:
                     _logger.warning("Échec du test API %s: %s", api_url, str(e))
                     continue
-            
-            return False
-            
-        except Exception as e:
-            _logger.error("Erreur lors du test d'accessibilité: %s", str(e))
-            return False
+        return None
 
     def _get_csrf_token(self, base_url):
         """Récupère le token CSRF de LimeSurvey."""
@@ -264,7 +459,7 @@ class LimeSurveyServerConfig(models.Model):
                             csrf_token = csrf_match.group(1)
             
             if csrf_token:
-                _logger.info("Token CSRF trouvé: %s", csrf_token)
+                _logger.debug("Token CSRF trouvé")
                 return csrf_token, session.cookies
             else:
                 _logger.warning("Aucun token CSRF trouvé dans la réponse. Status: %s", response.status_code)
@@ -275,73 +470,186 @@ class LimeSurveyServerConfig(models.Model):
             _logger.error("Erreur lors de la récupération du token CSRF: %s", str(e))
             return None, None
 
-    def _get_rpc_session(self):
+    def _get_rpc_client_key(self):
+        """Clé du client RPC partagé de ce serveur dans le registre du processus."""
+        return (self.env.cr.dbname, self.id)
+
+    def _get_rpc_client(self):
         """
-        Établit une connexion RPC avec le serveur LimeSurvey.
-        Retourne l'objet serveur avec la session_key comme attribut ou None en cas d'échec.
+        Retourne le client RPC partagé du serveur.
+
+        Le client est créé à la première utilisation (découverte de l'URL
+        d'API comprise) puis réutilisé par le processus ; il est recréé
+        si les paramètres de connexion changent. Après l'expiration de la
+        découverte, l'URL d'API est sondée à nouveau et mise à jour dans
+        le client existant, sans fermer la session utilisée par les
+        autres threads.
+
+        :raises LimeSurveyError: si l'API n'est pas accessible
         """
-        try:
-            # Construction de l'URL de l'API
-            api_url = self.clean_limesurvey_url(self.base_url, 'api')
-            _logger.info("URL de l'API: %s", api_url)
-            
-            # Vérification de l'accessibilité
-            if not self._check_api_accessibility(self.base_url):
-                _logger.error("L'API LimeSurvey n'est pas accessible")
-                return None
-            
-            # Création du serveur RPC
-            server = xmlrpc.client.ServerProxy(
+        self.ensure_one()
+        ICP = self.env['ir.config_parameter'].sudo()
+        username = str(self.api_username or '')
+        password = str(self.api_password or '')
+        if not username or not password:
+            raise LimeSurveyError(_("Les identifiants API ne peuvent pas être vides"))
+
+        # Une connexion HTTP par thread de synchronisation
+        pool_size = max(
+            int(ICP.get_param('edu_admission_portal.rpc_pool_size', 4)),
+            self._get_sync_concurrency(),
+        )
+        signature = (
+            self.base_url, username, hashlib.sha256(password.encode('utf-8')).hexdigest(),
+            pool_size, self.verify_ssl,
+        )
+
+        def factory():
+            api_url = self._discover_api_url(self.base_url, verify=self.verify_ssl)
+            if not api_url:
+                raise LimeSurveyError(_("L'API LimeSurvey n'est pas accessible"))
+            _logger.info("URL de l'API LimeSurvey découverte: %s", api_url)
+            return LimeSurveyClient(
                 api_url,
-                allow_none=True,
-                use_datetime=True,
-                context=ssl._create_unverified_context()
+                username,
+                password,
+                session_ttl=int(ICP.get_param('edu_admission_portal.rpc_session_ttl', 1800)),
+                timeout=int(ICP.get_param('edu_admission_portal.rpc_timeout', 30)),
+                pool_size=pool_size,
+                verify=self.verify_ssl,
             )
-            
-            # S'assurer que les identifiants sont des chaînes
-            username = str(self.api_username or '')
-            password = str(self.api_password or '')
-            
-            if not username or not password:
-                _logger.error("Les identifiants API ne peuvent pas être vides")
-                return None
-            
+
+        client = get_client(self._get_rpc_client_key(), signature, factory)
+        if client.claim_discovery(API_DISCOVERY_TTL):
+            api_url = self._discover_api_url(self.base_url, verify=self.verify_ssl)
+            if api_url:
+                client.set_api_url(api_url)
+            else:
+                _logger.warning(
+                    "Nouvelle découverte de l'API LimeSurvey sans réponse, URL conservée: %s",
+                    client.api_url,
+                )
+        return client
+
+    def _compute_circuit(self):
+        """Expose l'état du disjoncteur de chaque serveur."""
+        breakers = {
+            breaker.server_id.id: breaker
+            for breaker in self.env['limesurvey.circuit.breaker'].sudo().search([
+                ('server_id', 'in', self.ids),
+            ])
+        }
+        for record in self:
+            breaker = breakers.get(record.id)
+            record.circuit_state = breaker.state if breaker else 'closed'
+            record.circuit_failure_count = breaker.failure_count if breaker else 0
+            record.circuit_next_probe_date = breaker.next_probe_date if breaker else False
+            record.circuit_last_error = breaker.last_error if breaker else False
+
+    def action_reset_circuit(self):
+        """Referme le disjoncteur pour autoriser immédiatement de nouveaux appels."""
+        Breaker = self.env['limesurvey.circuit.breaker']
+        for record in self:
+            Breaker._record_success(record.id)
+            drop_client(record._get_rpc_client_key())
+        return True
+
+    @contextmanager
+    def _rpc_telemetry(self, operation):
+        """
+        Mesure les appels RPC d'une opération et l'enregistre comme exécution.
+
+        Un agrégateur est abonné aux appels du client du serveur le temps de
+        l'opération ; il ne reçoit que les appels faits dans l'opération (et
+        dans les threads lancés avec ``submit_in_context``), pas ceux d'une
+        autre opération simultanée sur le même serveur. L'exécution et ses
+        statistiques par méthode et par sondage sont enregistrées à la sortie.
+        L'appelant peut préciser le résultat en renseignant
+        ``telemetry.outcome`` ('success' ou 'partial').
+        """
+        self.ensure_one()
+        telemetry = RpcTelemetry()
+        key = self._get_rpc_client_key()
+        subscribe(key, telemetry, operation=telemetry)
+        start_date = fields.Datetime.now()
+        start = time.monotonic()
+        outcome = None
+        try:
+            with operation_scope(telemetry):
+                yield telemetry
+        except Exception:
+            outcome = 'failed'
+            raise
+        finally:
+            unsubscribe(key, telemetry)
             try:
-                # Essai avec la nouvelle méthode (LimeSurvey 5+)
-                try:
-                    session_key = server.get_session_key(username, password)
-                    _logger.info("Connexion réussie avec la nouvelle méthode")
-                except xmlrpc.client.Fault as e:
-                    if "Calling parameters do not match signature" in str(e):
-                        # Fallback pour l'ancienne méthode
-                        _logger.info("Tentative avec l'ancienne méthode...")
-                        session_key = server.get_session_key(username, password, 'Odoo')
-                        _logger.info("Connexion réussie avec l'ancienne méthode")
-                    else:
-                        _logger.error("Erreur RPC lors de l'authentification: %s", str(e))
-                        return None
-                except Exception as e:
-                    _logger.error("Erreur lors de la tentative de connexion: %s", str(e))
-                    return None
+                with self.env.cr.savepoint():
+                    self.env['limesurvey.sync.run']._record_run(
+                        self, operation, telemetry, start_date, time.monotonic() - start,
+                        outcome or telemetry.outcome or 'success',
+                    )
             except Exception as e:
-                _logger.error("Erreur lors de la tentative de connexion: %s", str(e))
-                return None
-            
-            if not session_key or session_key == 'Invalid user name or password':
-                _logger.error("Identifiants LimeSurvey invalides")
-                return None
-                
-            # Ajout de la clé de session comme attribut du serveur
-            server.session_key = session_key
-            _logger.info("Session LimeSurvey établie avec succès")
-            
-            return server
-            
+                _logger.warning("Enregistrement de la télémétrie RPC impossible: %s", str(e))
+
+    def _get_unavailable_message(self):
+        """Message expliquant l'absence de session RPC."""
+        self.ensure_one()
+        self.invalidate_recordset(['circuit_state', 'circuit_next_probe_date', 'circuit_last_error'])
+        if self.circuit_state in ('open', 'half_open'):
+            return _(
+                "Le serveur LimeSurvey a échoué %(count)d fois de suite : les appels sont "
+                "suspendus jusqu'au %(date)s.\n\nDernière erreur : %(error)s"
+            ) % {
+                'count': self.circuit_failure_count,
+                'date': self.circuit_next_probe_date,
+                'error': self.circuit_last_error,
+            }
+        return _("Impossible de se connecter au serveur LimeSurvey")
+
+    def _get_rpc_session(self):
+        """
+        Établit une connexion RPC avec le serveur LimeSurvey.
+        Retourne le client partagé avec la session_key comme attribut ou None en cas d'échec.
+
+        Le disjoncteur du serveur est consulté d'abord : tant qu'il est
+        ouvert, aucune requête n'est envoyée. Les échecs de connexion, et le
+        client devenu injoignable lors d'une opération précédente, sont
+        enregistrés ; un succès referme le circuit.
+        """
+        self.ensure_one()
+        Breaker = self.env['limesurvey.circuit.breaker']
+        circuit = Breaker._acquire(self.id)
+        if not circuit:
+            _logger.info("Serveur LimeSurvey %s suspendu par son disjoncteur, appel évité", self.name)
+            return None
+
+        try:
+            client = self._get_rpc_client()
+            if client.unavailable:
+                raise LimeSurveyUnavailable(client.last_error)
+            # Ouvre la session si elle n'existe pas ou a expiré
+            client.session_key
+            if circuit != 'closed':
+                Breaker._record_success(self.id)
+            return client
+
+        except LimeSurveyAuthError as e:
+            # Le serveur répond : identifiants refusés, pas d'indisponibilité
+            _logger.error("Connexion LimeSurvey refusée: %s", str(e))
+            drop_client(self._get_rpc_client_key())
+            return None
+        except LimeSurveyError as e:
+            _logger.error("Connexion LimeSurvey impossible: %s", str(e))
+            Breaker._record_failure(self.id, e)
+            drop_client(self._get_rpc_client_key())
+            return None
         except xmlrpc.client.Fault as e:
             _logger.error("Erreur RPC lors de la connexion: %s", str(e))
             return None
         except Exception as e:
             _logger.error("Erreur inattendue lors de la connexion: %s", str(e))
+            Breaker._record_failure(self.id, e)
+            drop_client(self._get_rpc_client_key())
             return None
 
     def action_test_connection(self):
@@ -349,6 +657,8 @@ class LimeSurveyServerConfig(models.Model):
         try:
             # Test de la connexion
             server = self._get_rpc_session()
+            if not server:
+                raise LimeSurveyError(self._get_unavailable_message())
             
             # Test de l'API avec une requête simple
             try:
@@ -410,154 +720,183 @@ class LimeSurveyServerConfig(models.Model):
         error_details = []
         try:
             server = self._get_rpc_session()
+            if not server:
+                raise LimeSurveyError(self._get_unavailable_message())
             _logger.info("Session RPC obtenue avec succès")
-            
-            # Récupération de la liste des sondages
-            try:
-                surveys = server.list_surveys(server.session_key)
-                _logger.info("Liste des sondages récupérée: %s", surveys)
-            except Exception as e:
-                error_msg = f"Erreur lors de la récupération de la liste des sondages: {str(e)}"
-                _logger.error(error_msg)
-                error_details.append(error_msg)
-                surveys = []
-            
-            if not surveys:
-                _logger.warning("Aucun formulaire trouvé sur le serveur")
-                return {
-                    'type': 'ir.actions.client',
-                    'tag': 'display_notification',
-                    'params': {
-                        'title': _('Synchronisation terminée'),
-                        'message': _('Aucun formulaire trouvé sur le serveur'),
-                        'type': 'warning',
+            with self._rpc_telemetry('sync_forms') as telemetry:
+                # Récupération de la liste des sondages
+                try:
+                    surveys = server.list_surveys(server.session_key)
+                    _logger.debug("Liste des sondages récupérée: %s", payload_summary(surveys))
+                except Exception as e:
+                    error_msg = f"Erreur lors de la récupération de la liste des sondages: {str(e)}"
+                    _logger.error(error_msg)
+                    error_details.append(error_msg)
+                    surveys = []
+
+                if not isinstance(surveys, list):
+                    # {'status': 'No surveys found'}
+                    surveys = []
+            
+                if not surveys:
+                    _logger.warning("Aucun formulaire trouvé sur le serveur")
+                    return {
+                        'type': 'ir.actions.client',
+                        'tag': 'display_notification',
+                        'params': {
+                            'title': _('Synchronisation terminée'),
+                            'message': _('Aucun formulaire trouvé sur le serveur'),
+                            'type': 'warning',
+                        }
                     }
-                }
-            
-            # Compteurs pour le suivi
-            created = 0
-            updated = 0
-            errors = 0
-            skipped = 0
-            responses_count = 0
             
-            # Traitement de chaque sondage
-            for survey in surveys:
-                try:
-                    sid = str(survey.get('sid'))
+                # Compteurs pour le suivi
+                created = 0
+                updated = 0
+                errors = 0
+                skipped = 0
+                unchanged = 0
+
+                sids = []
+                for survey in surveys:
+                    sid = str(survey.get('sid') or '') if isinstance(survey, dict) else ''
                     if not sid:
                         error_msg = "Sondage ignoré: pas de SID"
                         _logger.warning(error_msg)
                         error_details.append(error_msg)
                         skipped += 1
                         continue
+                    sids.append(sid)
 
-                    _logger.info("Traitement du sondage %s", sid)
-                    
-                    # Vérification si le template existe déjà
-                    template = self.env['admission.form.template'].search([
-                        ('sid', '=', sid),
+                # Lecture en une fois des templates existants
+                Template = self.env['admission.form.template']
+                templates = {
+                    template.sid: template
+                    for template in Template.search([
+                        ('sid', 'in', sids),
                         ('server_config_id', '=', self.id)
-                    ], limit=1)
-                    
-                    # Récupération des propriétés du formulaire
-                    survey_properties = self.get_survey_properties(sid)
-                    if not survey_properties:
+                    ])
+                }
+
+                # Récupération concurrente ; les écritures restent dans la transaction principale
+                sent_before, received_before = server.traffic()
+                # Indicateur de changement : la structure des sondages actifs inchangés n'est pas retéléchargée
+                rows = {str(survey.get('sid')): survey for survey in surveys if isinstance(survey, dict)}
+                indicators = {sid: Template._survey_change_indicator(rows.get(sid)) for sid in sids}
+                fresh_sids = {
+                    sid for sid, template in templates.items()
+                    if not template._structure_fetch_needed(indicators.get(sid))
+                }
+                results = self._fetch_surveys_concurrently(
+                    server, sids, surveys, skip_structure=fresh_sids,
+                )
+                sent_after, received_after = server.traffic()
+                transferred = (sent_after - sent_before) + (received_after - received_before)
+                _logger.info(
+                    "Synchronisation de %d sondages: %d octets envoyés, %d octets reçus",
+                    len(sids), sent_after - sent_before, received_after - received_before
+                )
+
+                for sid in sids:
+                    result = results[sid]
+                    if result['error']:
+                        error_msg = f"Erreur lors du traitement du sondage {sid}: {result['error']}"
+                        _logger.error(error_msg)
+                        error_details.append(error_msg)
+                        errors += 1
+                        continue
+
+                    survey_properties = result['properties']
+                    if not survey_properties and not result['unchanged']:
                         error_msg = f"Impossible de récupérer les propriétés du sondage {sid}"
                         _logger.error(error_msg)
                         error_details.append(error_msg)
                         errors += 1
                         continue
-                        
-                    # Préparation des valeurs
-                    vals = {
-                        'sid': sid,
-                        'server_config_id': self.id,
-                        'title': survey_properties.get('surveyls_title', ''),
-                        'description': survey_properties.get('surveyls_description', ''),
-                        'is_active': survey_properties.get('active', 'N') == 'Y',
-                        'owner': survey_properties.get('owner_id'),
-                        'metadata': survey_properties,
-                    }
-                    
-                    # Mise à jour ou création du template
-                    if template:
-                        template.write(vals)
-                        updated += 1
-                        _logger.info("Template mis à jour: %s", template.name)
-                    else:
-                        template = self.env['admission.form.template'].create(vals)
-                        created += 1
-                        _logger.info("Nouveau template créé pour le sondage %s", sid)
-
-                    # Synchronisation des réponses si le template existe
-                    if template and survey_properties.get('response_count', 0) > 0:
-                        try:
-                            # Récupération des réponses
-                            responses = server.export_responses(
-                                server.session_key,
-                                int(sid),
-                                'json'
+
+                    try:
+                        with self.env.cr.savepoint():
+                            template = templates.get(sid)
+                            fingerprint = (
+                                Template._structure_fingerprint(survey_properties)
+                                if survey_properties else None
                             )
-                            
-                            if responses and isinstance(responses, str):
-                                responses_data = json.loads(responses)
-                                if isinstance(responses_data, dict):
-                                    for response in responses_data.get('responses', []):
-                                        try:
-                                            # Création ou mise à jour du candidat
-                                            template._process_survey_response(response)
-                                            responses_count += 1
-                                        except Exception as e:
-                                            error_msg = f"Erreur lors du traitement de la réponse: {str(e)}"
-                                            _logger.error(error_msg)
-                                            error_details.append(error_msg)
-                                            
-                        except Exception as e:
-                            error_msg = f"Erreur lors de la synchronisation des réponses du sondage {sid}: {str(e)}"
-                            _logger.error(error_msg)
-                            error_details.append(error_msg)
-                            errors += 1
-                            
-                except Exception as e:
-                    error_msg = f"Erreur lors du traitement du sondage {sid}: {str(e)}"
-                    _logger.error("%s\n%s", error_msg, traceback.format_exc())
-                    error_details.append(error_msg)
-                    errors += 1
-            # Mise à jour de la date de synchronisation
-            self.write({'last_sync_date': fields.Datetime.now()})
-            
-            # Message de résultat
-            message = _(
-                'Synchronisation terminée\n\n'
-                'Formulaires créés : %(created)d\n'
-                'Formulaires mis à jour : %(updated)d\n'
-                'Réponses synchronisées : %(responses)d\n'
-                'Erreurs : %(errors)d\n'
-                'Ignorés : %(skipped)d\n'
-                'Total traité : %(total)d\n\n'
-            ) % {
-                'created': created,
-                'updated': updated,
-                'responses': responses_count,
-                'errors': errors,
-                'skipped': skipped,
-                'total': len(surveys)
-            }
+
+                            if result['unchanged'] or (
+                                template and template._structure_unchanged(fingerprint, indicators.get(sid))
+                            ):
+                                # Structure identique : aucune réécriture du template
+                                unchanged += 1
+                                _logger.debug("Structure inchangée pour le sondage %s", sid)
+                            else:
+                                # Préparation des valeurs
+                                vals = {
+                                    'sid': sid,
+                                    'server_config_id': self.id,
+                                    'title': survey_properties.get('surveyls_title', ''),
+                                    'description': survey_properties.get('surveyls_description', ''),
+                                    'is_active': survey_properties.get('active', 'N') == 'Y',
+                                    'owner': survey_properties.get('owner_id'),
+                                    'metadata': survey_properties,
+                                    'structure_hash': fingerprint,
+                                    'structure_indicator': indicators.get(sid),
+                                    'structure_checked_date': fields.Datetime.now(),
+                                }
+
+                                # Mise à jour ou création du template
+                                if template:
+                                    template.write(vals)
+                                    updated += 1
+                                    _logger.info("Template mis à jour: %s", template.name)
+                                else:
+                                    template = Template.create(vals)
+                                    created += 1
+                                    _logger.info("Nouveau template créé pour le sondage %s", sid)
+
+                    except Exception as e:
+                        error_msg = f"Erreur lors du traitement du sondage {sid}: {str(e)}"
+                        _logger.error("%s\n%s", error_msg, traceback.format_exc())
+                        error_details.append(error_msg)
+                        errors += 1
+                        continue
+
+                # Mise à jour de la date de synchronisation
+                self.write({'last_sync_date': fields.Datetime.now()})
+            
+                # Message de résultat
+                message = _(
+                    'Synchronisation terminée\n\n'
+                    'Formulaires créés : %(created)d\n'
+                    'Formulaires mis à jour : %(updated)d\n'
+                    'Formulaires inchangés : %(unchanged)d\n'
+                    'Erreurs : %(errors)d\n'
+                    'Ignorés : %(skipped)d\n'
+                    'Total traité : %(total)d\n'
+                    'Données échangées : %(kbytes).1f Ko\n\n'
+                ) % {
+                    'created': created,
+                    'updated': updated,
+                    'unchanged': unchanged,
+                    'errors': errors,
+                    'skipped': skipped,
+                    'total': len(surveys),
+                    'kbytes': transferred / 1024.0,
+                }
             
-            if error_details:
-                message += _('Détails des erreurs :\n%s') % '\n'.join(error_details)
+                if error_details:
+                    message += _('Détails des erreurs :\n%s') % '\n'.join(error_details)
             
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'title': _('Synchronisation terminée'),
-                    'message': message,
-                    'sticky': True if errors > 0 else False,
-                    'type': 'success' if errors == 0 else 'warning',
+                telemetry.outcome = 'success' if errors == 0 else 'partial'
+                return {
+                    'type': 'ir.actions.client',
+                    'tag': 'display_notification',
+                    'params': {
+                        'title': _('Synchronisation terminée'),
+                        'message': message,
+                        'sticky': True if errors > 0 else False,
+                        'type': 'success' if errors == 0 else 'warning',
+                    }
                 }
-            }
             
         except Exception as e:
             error_msg = f"Erreur lors de la synchronisation: {str(e)}"
@@ -572,6 +911,173 @@ class LimeSurveyServerConfig(models.Model):
                 "Détail : %s"
             ) % error_msg)
 
+    @api.model
+    def _get_sync_time_budget(self):
+        """Temps consacré par exécution du CRON à démarrer des synchronisations (secondes)."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.sync_time_budget', SYNC_TIME_BUDGET
+        ))
+
+    @api.model
+    def _get_sync_min_interval(self):
+        """Délai minimal entre deux synchronisations planifiées d'un serveur (minutes)."""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.sync_min_interval', SYNC_MIN_INTERVAL
+        ))
+
+    def _commit_progress(self):
+        """Rend durable le travail du serveur courant (sauf pendant les tests)."""
+        if not modules.module.current_test:
+            self.env.cr.commit()
+
+    @api.model
+    def _cron_sync_servers(self):
+        """
+        Synchronise les serveurs actifs à tour de rôle.
+
+        Les serveurs sont pris par ordre de dernière tentative : celui qui
+        attend depuis le plus longtemps passe en premier, et un serveur lent
+        ou en échec repasse en fin de file. Un verrou consultatif par
+        serveur empêche deux workers de synchroniser le même serveur. Au-delà
+        du budget de temps, la tâche s'interrompt et se relance pour les
+        serveurs restants.
+
+        Returns:
+            dict: Nombre de serveurs synchronisés, verrouillés ailleurs et restants
+        """
+        budget = self._get_sync_time_budget()
+        threshold = fields.Datetime.now() - timedelta(minutes=self._get_sync_min_interval())
+        servers = self.search([
+            '|', ('sync_attempt_date', '=', False), ('sync_attempt_date', '<=', threshold),
+        ], order='sync_attempt_date asc nulls first, id')
+
+        start = time.monotonic()
+        stats = {'synced': 0, 'locked': 0, 'remaining': 0}
+        for index, server in enumerate(servers):
+            if stats['synced'] and time.monotonic() - start >= budget:
+                stats['remaining'] = len(servers) - index
+                break
+
+            self.env.cr.execute(
+                "SELECT pg_try_advisory_lock(%s, %s)",
+                (SYNC_SERVER_LOCK_CLASS, server.id),
+            )
+            if not self.env.cr.fetchone()[0]:
+                stats['locked'] += 1
+                continue
+            try:
+                server._run_scheduled_sync()
+                stats['synced'] += 1
+            finally:
+                self.env.cr.execute(
+                    "SELECT pg_advisory_unlock(%s, %s)",
+                    (SYNC_SERVER_LOCK_CLASS, server.id),
+                )
+
+        if stats['remaining']:
+            _logger.info(
+                "Budget de synchronisation épuisé, %d serveurs reportés", stats['remaining']
+            )
+            cron = self.env.ref(
+                'edu_admission_portal.ir_cron_sync_limesurvey_forms',
+                raise_if_not_found=False,
+            )
+            if cron:
+                cron.sudo()._trigger()
+        return stats
+
+    def _run_scheduled_sync(self):
+        """
+        Synchronise le serveur et enregistre la durée et le résultat.
+
+        La tentative est enregistrée avant la synchronisation : un serveur
+        dont la synchronisation interrompt le worker passe en fin de file au
+        lieu de bloquer les suivants.
+        """
+        self.ensure_one()
+        server = self.with_context(mail_notrack=True)
+        server.write({
+            'sync_attempt_date': fields.Datetime.now(),
+            'sync_outcome': 'running',
+            'sync_outcome_message': False,
+        })
+        self._commit_progress()
+
+        start = time.monotonic()
+        try:
+            with self.env.cr.savepoint():
+                result = self.action_sync_forms()
+            params = result.get('params', {})
+            outcome = 'success' if params.get('type') == 'success' else 'partial'
+            message = params.get('message')
+        except Exception as e:
+            _logger.error("Échec de la synchronisation planifiée du serveur %s: %s", self.name, str(e))
+            outcome = 'failed'
+            message = str(e)
+
+        duration = time.monotonic() - start
+        server.write({
+            'sync_duration': duration,
+            'sync_outcome': outcome,
+            'sync_outcome_message': message,
+        })
+        self._commit_progress()
+        _logger.info(
+            "Synchronisation planifiée du serveur %s : %s en %.1f s", self.name, outcome, duration
+        )
+        return outcome
+
+    def _get_sync_concurrency(self):
+        """Nombre de sondages récupérés simultanément lors d'une synchronisation."""
+        self.ensure_one()
+        return max(1, min(self.sync_concurrency or 1, MAX_SYNC_CONCURRENCY))
+
+    def _fetch_surveys_concurrently(self, server, sids, surveys=None, skip_structure=()):
+        """
+        Récupère les propriétés de plusieurs sondages en parallèle.
+
+        Les appels RPC sont répartis sur un pool de threads borné par
+        ``sync_concurrency`` ; les threads n'accèdent pas à la base. Une
+        erreur sur un sondage n'interrompt pas les autres. Les réponses ne
+        sont pas exportées ici : elles passent par les lots d'import.
+
+        :param server: Client RPC LimeSurvey partagé
+        :param sids: SID des sondages à récupérer
+        :param surveys: Résultat de list_surveys, réutilisé pour les titres
+        :param skip_structure: SID dont la structure est connue inchangée : aucun
+                               appel n'est fait pour eux
+        :return: dict SID -> {'properties', 'unchanged', 'error'}
+        """
+        self.ensure_one()
+        if not sids:
+            return {}
+
+        workers = min(self._get_sync_concurrency(), len(sids))
+
+        def fetch(sid):
+            result = {
+                'properties': None,
+                'unchanged': sid in skip_structure,
+                'error': None,
+            }
+            if not result['unchanged']:
+                try:
+                    result['properties'] = self._fetch_survey_properties(server, sid, surveys)
+                except Exception as e:
+                    _logger.debug("Échec de récupération du sondage %s", sid, exc_info=True)
+                    result['error'] = str(e) or e.__class__.__name__
+            return result
+
+        _logger.info(
+            "Récupération de %d sondages avec %d requêtes simultanées", len(sids), workers
+        )
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='limesurvey_sync') as executor:
+            futures = {submit_in_context(executor, fetch, sid): sid for sid in sids}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+
     def generate_webhook_token(self):
         """Génère un nouveau token pour le webhook."""
         import secrets
@@ -594,57 +1100,117 @@ class LimeSurveyServerConfig(models.Model):
             # Obtention de la session RPC
             server = self._get_rpc_session()
             if not server:
-                raise ValidationError(_("Impossible de se connecter au serveur LimeSurvey"))
+                raise ValidationError(self._get_unavailable_message())
 
-            _logger.info("Tentative de récupération des propriétés pour le sondage %s", sid)
-            
-            # Initialisation des variables
-            languages = ['fr']  # Langue par défaut
-            default_lang = 'fr'
-            survey_properties = {}
-            
-            # Récupération des langues disponibles
-            try:
-                lang_result = server.get_survey_languages(server.session_key, int(sid))
-                if lang_result and isinstance(lang_result, (list, tuple)):
-                    languages = lang_result
-                    default_lang = languages[0] if languages else 'fr'
-                    _logger.info("Langues disponibles: %s", languages)
-            except Exception as e:
-                _logger.warning("Impossible de récupérer les langues: %s", str(e))
+            return self._fetch_survey_properties(server, sid)
 
-            # Récupération des propriétés pour chaque langue
-            title = None
-            for lang in languages:
-                try:
-                    lang_properties = server.get_language_properties(
-                        server.session_key,
-                        int(sid),
-                        lang
-                    )
-                    if isinstance(lang_properties, dict):
-                        # Récupérer le titre si disponible
-                        survey_title = lang_properties.get('surveyls_title', '').strip()
-                        if survey_title and survey_title != '' and not survey_title.startswith('Formulaire'):
-                            title = survey_title
-                            survey_properties['surveyls_title'] = title
-                            _logger.info("Titre trouvé en langue %s: %s", lang, title)
-                        survey_properties.update(lang_properties)
-                        _logger.info("Propriétés de langue %s: %s", lang, lang_properties)
-                        
-                        # Si c'est la langue par défaut, prioriser son titre
-                        if lang == default_lang and survey_title:
-                            title = survey_title
-                            survey_properties['surveyls_title'] = title
-                            
-                except Exception as e:
-                    _logger.warning("Impossible de récupérer les propriétés pour la langue %s: %s", lang, str(e))
+        except Exception as e:
+            _logger.error(
+                "Erreur lors de la récupération des propriétés du sondage %s: %s\n%s",
+                sid, str(e), traceback.format_exc()
+            )
+            raise ValidationError(_(
+                "Erreur lors de la récupération des propriétés du formulaire.\n\n"
+                "Détail : %s"
+            ) % str(e))
 
-            # Récupération des propriétés de base
+    def _fetch_survey_properties(self, server, sid, surveys=None):
+        """
+        Récupère les propriétés d'un formulaire à partir d'un client RPC.
+
+        N'accède ni à la base ni à l'environnement : peut être exécutée
+        depuis un thread de synchronisation.
+
+        :param server: Client RPC LimeSurvey
+        :param sid: ID du sondage
+        :param surveys: Résultat de list_surveys déjà obtenu, le cas échéant
+        :return: Propriétés du formulaire ; ``response_count`` vaut None si
+                 les statistiques sont indisponibles
+        """
+        _logger.info("Tentative de récupération des propriétés pour le sondage %s", sid)
+        
+        # Initialisation des variables
+        languages = ['fr']  # Langue par défaut
+        default_lang = 'fr'
+        survey_properties = {}
+        
+        # Langues, groupes et statistiques en un seul aller-retour
+        lang_result, groups_result, summary_result = server.multicall([
+            ('get_survey_languages', [int(sid)]),
+            ('list_groups', [int(sid)]),
+            ('get_summary', [int(sid), 'all']),
+        ])
+
+        # Récupération des langues disponibles
+        if isinstance(lang_result, Exception):
+            _logger.warning("Impossible de récupérer les langues: %s", str(lang_result))
+        elif lang_result and isinstance(lang_result, (list, tuple)):
+            languages = lang_result
+            default_lang = languages[0] if languages else 'fr'
+            _logger.debug("Langues disponibles: %s", languages)
+
+        groups_list = []
+        if isinstance(groups_result, Exception):
+            _logger.warning("Impossible de récupérer les groupes: %s", str(groups_result))
+        elif isinstance(groups_result, list):
+            groups_list = [group for group in groups_result if isinstance(group, dict)]
+
+        # Propriétés de chaque langue et questions de chaque groupe en un aller-retour
+        grouped = [group for group in groups_list if group.get('gid')]
+        results = server.multicall(
+            [('get_language_properties', [int(sid), lang]) for lang in languages]
+            + [('list_questions', [int(sid), int(group['gid'])]) for group in grouped]
+        )
+        lang_results = results[:len(languages)]
+        question_results = results[len(languages):]
+
+        # Récupération des propriétés pour chaque langue
+        title = None
+        for lang, lang_properties in zip(languages, lang_results):
+            if isinstance(lang_properties, Exception):
+                _logger.warning("Impossible de récupérer les propriétés pour la langue %s: %s", lang, str(lang_properties))
+                continue
+            if isinstance(lang_properties, dict):
+                # Récupérer le titre si disponible
+                survey_title = (lang_properties.get('surveyls_title') or '').strip()
+                if survey_title and survey_title != '' and not survey_title.startswith('Formulaire'):
+                    title = survey_title
+                    survey_properties['surveyls_title'] = title
+                    _logger.info("Titre trouvé en langue %s: %s", lang, title)
+                survey_properties.update(lang_properties)
+                _logger.debug("Propriétés de langue %s: %s", lang, payload_summary(lang_properties))
+
+                # Si c'est la langue par défaut, prioriser son titre
+                if lang == default_lang and survey_title:
+                    title = survey_title
+                    survey_properties['surveyls_title'] = title
+
+        # Récupération des propriétés de base
+        try:
+            base_properties = server.get_survey_properties(
+                server.session_key,
+                int(sid)
+            )
+            if isinstance(base_properties, dict):
+                # Récupérer le titre des propriétés de base si pas encore trouvé
+                if not title:
+                    base_title = base_properties.get('surveyls_title', '').strip()
+                    if base_title and base_title != '' and not base_title.startswith('Formulaire'):
+                        title = base_title
+                        survey_properties['surveyls_title'] = title
+                        _logger.info("Titre trouvé dans les propriétés de base: %s", title)
+                
+                # Ajouter les autres propriétés sans écraser le titre si déjà trouvé
+                if title:
+                    base_properties.pop('surveyls_title', None)
+                survey_properties.update(base_properties)
+                _logger.info("Propriétés de base récupérées avec succès")
+        except xmlrpc.client.Fault:
             try:
                 base_properties = server.get_survey_properties(
                     server.session_key,
-                    int(sid)
+                    int(sid),
+                    None
                 )
                 if isinstance(base_properties, dict):
                     # Récupérer le titre des propriétés de base si pas encore trouvé
@@ -653,173 +1219,182 @@ class LimeSurveyServerConfig(models.Model):
                         if base_title and base_title != '' and not base_title.startswith('Formulaire'):
                             title = base_title
                             survey_properties['surveyls_title'] = title
-                            _logger.info("Titre trouvé dans les propriétés de base: %s", title)
+                            _logger.info("Titre trouvé dans les propriétés de base (signature étendue): %s", title)
                     
                     # Ajouter les autres propriétés sans écraser le titre si déjà trouvé
                     if title:
                         base_properties.pop('surveyls_title', None)
                     survey_properties.update(base_properties)
-                    _logger.info("Propriétés de base récupérées avec succès")
+                    _logger.info("Propriétés de base récupérées avec succès (signature étendue)")
             except xmlrpc.client.Fault:
                 try:
-                    base_properties = server.get_survey_properties(
+                    json_properties = server.get_survey_properties_json(
                         server.session_key,
-                        int(sid),
-                        None
+                        int(sid)
                     )
-                    if isinstance(base_properties, dict):
-                        # Récupérer le titre des propriétés de base si pas encore trouvé
+                    if isinstance(json_properties, str):
+                        json_properties = json.loads(json_properties)
+                    if isinstance(json_properties, dict):
+                        # Récupérer le titre des propriétés JSON si pas encore trouvé
                         if not title:
-                            base_title = base_properties.get('surveyls_title', '').strip()
-                            if base_title and base_title != '' and not base_title.startswith('Formulaire'):
-                                title = base_title
+                            json_title = json_properties.get('surveyls_title', '').strip()
+                            if json_title and json_title != '' and not json_title.startswith('Formulaire'):
+                                title = json_title
                                 survey_properties['surveyls_title'] = title
-                                _logger.info("Titre trouvé dans les propriétés de base (signature étendue): %s", title)
+                                _logger.info("Titre trouvé dans les propriétés JSON: %s", title)
                         
                         # Ajouter les autres propriétés sans écraser le titre si déjà trouvé
                         if title:
-                            base_properties.pop('surveyls_title', None)
-                        survey_properties.update(base_properties)
-                        _logger.info("Propriétés de base récupérées avec succès (signature étendue)")
-                except xmlrpc.client.Fault:
-                    try:
-                        json_properties = server.get_survey_properties_json(
-                            server.session_key,
-                            int(sid)
-                        )
-                        if isinstance(json_properties, str):
-                            json_properties = json.loads(json_properties)
-                        if isinstance(json_properties, dict):
-                            # Récupérer le titre des propriétés JSON si pas encore trouvé
-                            if not title:
-                                json_title = json_properties.get('surveyls_title', '').strip()
-                                if json_title and json_title != '' and not json_title.startswith('Formulaire'):
-                                    title = json_title
-                                    survey_properties['surveyls_title'] = title
-                                    _logger.info("Titre trouvé dans les propriétés JSON: %s", title)
-                            
-                            # Ajouter les autres propriétés sans écraser le titre si déjà trouvé
-                            if title:
-                                json_properties.pop('surveyls_title', None)
-                            survey_properties.update(json_properties)
-                            _logger.info("Propriétés JSON récupérées avec succès")
-                    except Exception as e:
-                        _logger.error("Toutes les tentatives ont échoué: %s", str(e))
-
-            # Si toujours pas de titre, utiliser un titre par défaut amélioré
-            if not title or not survey_properties.get('surveyls_title'):
-                # Essayer de récupérer le nom du sondage directement
-                try:
-                    surveys_list = server.list_surveys(server.session_key)
-                    if surveys_list:
-                        matching_survey = next((s for s in surveys_list if str(s.get('sid')) == str(sid)), None)
-                        if matching_survey:
-                            survey_name = matching_survey.get('surveyls_title', '').strip()
-                            if survey_name and survey_name != '':
-                                title = survey_name
-                                survey_properties['surveyls_title'] = title
-                                _logger.info("Titre récupéré depuis la liste des sondages: %s", title)
+                            json_properties.pop('surveyls_title', None)
+                        survey_properties.update(json_properties)
+                        _logger.info("Propriétés JSON récupérées avec succès")
                 except Exception as e:
-                    _logger.warning("Impossible de récupérer le titre depuis la liste des sondages: %s", str(e))
-                    
-                # Si toujours pas de titre, utiliser un titre par défaut
-                if not title:
-                    title = f"Sondage {sid}"
-                    survey_properties['surveyls_title'] = title
-                    _logger.warning("Aucun titre trouvé, utilisation du titre par défaut: %s", title)
+                    _logger.error("Toutes les tentatives ont échoué: %s", str(e))
 
-            # Récupération des réponses
+        # Si toujours pas de titre, utiliser un titre par défaut amélioré
+        if not title or not survey_properties.get('surveyls_title'):
+            # Essayer de récupérer le nom du sondage directement
             try:
-                responses = server.export_responses(
-                    server.session_key,
-                    int(sid),
-                    'json'
-                )
-                if isinstance(responses, str):
-                    try:
-                        responses_data = json.loads(responses)
-                        if isinstance(responses_data, dict):
-                            survey_properties['response_count'] = len(responses_data.get('responses', []))
-                    except json.JSONDecodeError:
-                        _logger.warning("Impossible de décoder les réponses JSON")
-                        survey_properties['response_count'] = 0
+                surveys_list = surveys if surveys is not None else server.list_surveys(server.session_key)
+                if surveys_list:
+                    matching_survey = next((s for s in surveys_list if str(s.get('sid')) == str(sid)), None)
+                    if matching_survey:
+                        survey_name = matching_survey.get('surveyls_title', '').strip()
+                        if survey_name and survey_name != '':
+                            title = survey_name
+                            survey_properties['surveyls_title'] = title
+                            _logger.info("Titre récupéré depuis la liste des sondages: %s", title)
             except Exception as e:
-                _logger.warning("Impossible de récupérer les réponses: %s", str(e))
-                survey_properties['response_count'] = 0
+                _logger.warning("Impossible de récupérer le titre depuis la liste des sondages: %s", str(e))
+                
+            # Si toujours pas de titre, utiliser un titre par défaut
+            if not title:
+                title = f"Sondage {sid}"
+                survey_properties['surveyls_title'] = title
+                _logger.warning("Aucun titre trouvé, utilisation du titre par défaut: %s", title)
+
+        # Statistiques de réponses : get_summary, sans export des réponses
+        summary = self._parse_survey_summary(summary_result, sid)
+        survey_properties['response_count'] = summary.get('completed_responses') if summary else None
+        survey_properties['incomplete_response_count'] = summary.get('incomplete_responses') if summary else None
+
+        # Récupération de la structure des groupes et questions
+        groups = []
+        all_questions = []  # Initialisation de la variable
+        for group, questions in zip(grouped, question_results):
+            if isinstance(questions, Exception):
+                _logger.warning(
+                    "Impossible de récupérer les questions du groupe %s: %s",
+                    group.get('gid'), str(questions)
+                )
+                continue
+            if not isinstance(questions, list):
+                # {'status': 'No questions found'}
+                questions = []
+
+            # Ajouter les questions au groupe
+            group['questions'] = questions
+            groups.append(group)
 
-            # Récupération de la structure des groupes et questions
-            groups = []
-            all_questions = []  # Initialisation de la variable
+            # Ajouter les questions à la liste globale
+            all_questions.extend(questions)
+
+        if isinstance(groups_result, Exception):
+            # Si pas de groupes, essayer de récupérer toutes les questions
             try:
-                groups_list = server.list_groups(
+                all_questions = server.list_questions(
                     server.session_key,
                     int(sid)
                 ) or []
-                
-                # Pour chaque groupe, récupérer ses questions
-                for group in groups_list:
-                    group_id = group.get('gid')
-                    if group_id:
-                        try:
-                            questions = server.list_questions(
-                                server.session_key,
-                        int(sid),
-                                int(group_id)
-                            ) or []
-                            
-                            # Ajouter les questions au groupe
-                            group['questions'] = questions
-                            groups.append(group)
-                            
-                            # Ajouter les questions à la liste globale
-                            all_questions.extend(questions)
-                        except Exception as e:
-                            _logger.warning(
-                                "Impossible de récupérer les questions du groupe %s: %s",
-                                group_id, str(e)
-                            )
-            except Exception as e:
-                _logger.warning("Impossible de récupérer les groupes: %s", str(e))
-                # Si pas de groupes, essayer de récupérer toutes les questions
-                try:
-                    all_questions = server.list_questions(
-                        server.session_key,
-                        int(sid)
-                    ) or []
-                except Exception as e:
-                    _logger.warning("Impossible de récupérer les questions: %s", str(e))
+                if not isinstance(all_questions, list):
                     all_questions = []
-                    if all_questions:
-                        # Créer un groupe par défaut
-                        groups.append({
-                            'gid': 0,
-                            'group_name': 'Questions',
-                            'questions': all_questions
-                        })
+                if all_questions:
+                    # Créer un groupe par défaut
+                    groups.append({
+                        'gid': 0,
+                        'group_name': 'Questions',
+                        'questions': all_questions
+                    })
             except Exception as e:
-                _logger.warning(
-                        "Impossible de récupérer les questions: %s",
-                    str(e)
-                )
-            
-            # Ajout des données structurelles
-            survey_properties['groups'] = groups
-            survey_properties['questions'] = all_questions
-            survey_properties['languages'] = languages
-            survey_properties['default_language'] = default_lang
-
-            _logger.info("Propriétés récupérées avec succès pour le sondage %s", sid)
-            return survey_properties
-            
+                _logger.warning("Impossible de récupérer les questions: %s", str(e))
+                all_questions = []
+        
+        # Ajout des données structurelles
+        survey_properties['groups'] = groups
+        survey_properties['questions'] = all_questions
+        survey_properties['languages'] = languages
+        survey_properties['default_language'] = default_lang
+
+        _logger.debug("Propriétés récupérées avec succès pour le sondage %s", sid)
+        return survey_properties
+
+    @api.model
+    def _parse_survey_summary(self, summary, sid):
+        """
+        Normalise le résultat de get_summary.
+
+        :return: dict des compteurs entiers (completed_responses,
+                 incomplete_responses, full_responses, ...), ou {} si indisponible
+        """
+        if isinstance(summary, Exception):
+            _logger.warning("Statistiques indisponibles pour le sondage %s: %s", sid, str(summary))
+            return {}
+        if not isinstance(summary, dict) or 'status' in summary:
+            # {'status': 'No available data'} : sondage jamais activé
+            return {}
+        counters = {}
+        for key, value in summary.items():
+            try:
+                counters[key] = int(value)
+            except (TypeError, ValueError):
+                continue
+        return counters
+
+    def _get_survey_summary(self, sid):
+        """
+        Statistiques de réponses d'un sondage (get_summary).
+
+        :return: dict des compteurs, ou {} si indisponibles
+        """
+        self.ensure_one()
+        server = self._get_rpc_session()
+        if not server:
+            return {}
+        try:
+            summary = server.get_summary(server.session_key, int(sid), 'all')
         except Exception as e:
-            _logger.error(
-                "Erreur lors de la récupération des propriétés du sondage %s: %s\n%s",
-                sid, str(e), traceback.format_exc()
-            )
-            raise ValidationError(_(
-                "Erreur lors de la récupération des propriétés du formulaire.\n\n"
-                "Détail : %s"
-            ) % str(e))
+            summary = e
+        return self._parse_survey_summary(summary, sid)
+
+    def _fetch_group_questions(self, server, sid, groups, language=None):
+        """
+        Récupère les questions de plusieurs groupes en un minimum d'allers-retours.
+
+        :param server: Client RPC LimeSurvey
+        :param sid: ID du sondage
+        :param groups: Groupes renvoyés par list_groups
+        :param language: Langue des questions (langue par défaut du sondage si vide)
+        :return: Liste de couples (groupe, questions) pour les groupes récupérés
+        """
+        if not isinstance(groups, list):
+            # {'status': 'No groups found'}
+            return []
+        groups = [group for group in groups if isinstance(group, dict) and group.get('gid')]
+        results = server.multicall([
+            ('list_questions', [int(sid), int(group['gid'])] + ([language] if language else []))
+            for group in groups
+        ])
+
+        fetched = []
+        for group, questions in zip(groups, results):
+            if isinstance(questions, Exception):
+                _logger.error(
+                    "Erreur lors de la récupération des questions du groupe %s: %s",
+                    group.get('gid'), str(questions)
+                )
+                continue
+            fetched.append((group, questions if isinstance(questions, list) else []))
+        return fetched
 
     def action_force_delete(self):
         """Force la suppression de la configuration."""
@@ -870,14 +1445,14 @@ class LimeSurveyServerConfig(models.Model):
             _logger.info("Tentative de connexion au serveur LimeSurvey...")
             
             server = self._get_rpc_session()
-            _logger.info("Connexion réussie avec la clé de session: %s", server.session_key)
+            _logger.debug("Session RPC obtenue pour le sondage %s", sid)
             
             # Obtenir les propriétés du sondage
             _logger.info("Récupération des propriétés du sondage %s...", sid)
             survey_properties = self.get_survey_properties(sid)
             if not survey_properties:
                 raise Exception("Impossible de récupérer les propriétés du sondage")
-            _logger.info("Propriétés du sondage récupérées: %s", survey_properties)
+            _logger.debug("Propriétés du sondage récupérées: %s", payload_summary(survey_properties))
             
             # S'assurer d'avoir un titre valide
             title = survey_properties.get('surveyls_title')
@@ -893,30 +1468,18 @@ class LimeSurveyServerConfig(models.Model):
             _logger.info("Récupération des groupes de questions...")
             try:
                 groups = server.list_groups(server.session_key, int(sid), language)
-                _logger.info("Groupes de questions récupérés: %s", groups)
+                _logger.debug("Groupes de questions récupérés: %s", payload_summary(groups))
             except Exception as e:
                 _logger.error("Erreur lors de la récupération des groupes: %s", str(e), exc_info=True)
                 groups = []
             
-            # Récupérer les questions pour chaque groupe
+            # Récupérer les questions de tous les groupes en un minimum d'allers-retours
             all_questions = []
             if groups:
-                _logger.info("Récupération des questions par groupe...")
-                for group in groups:
-                    try:
-                        group_id = group.get('gid')
-                        _logger.info("Récupération des questions du groupe %s...", group_id)
-                        questions = server.list_questions(
-                            server.session_key, 
-                            int(sid),
-                            group_id,
-                            language
-                        )
-                        _logger.info("Questions du groupe %s récupérées: %s", group_id, questions)
-                        if questions:
-                            all_questions.extend(questions)
-                    except Exception as e:
-                        _logger.error("Erreur lors de la récupération des questions du groupe %s: %s", group_id, str(e), exc_info=True)
+                _logger.info("Récupération des questions de %d groupes...", len(groups))
+                for group, questions in self._fetch_group_questions(server, sid, groups, language):
+                    _logger.debug("Questions du groupe %s récupérées: %s", group.get('gid'), payload_summary(questions))
+                    all_questions.extend(questions)
             else:
                 # Si pas de groupes, essayer de récupérer toutes les questions
                 _logger.info("Aucun groupe trouvé, tentative de récupération de toutes les questions...")
@@ -927,7 +1490,7 @@ class LimeSurveyServerConfig(models.Model):
                         None,
                         language
                     )
-                    _logger.info("Questions sans groupe récupérées: %s", questions)
+                    _logger.debug("Questions sans groupe récupérées: %s", payload_summary(questions))
                     if questions:
                         all_questions.extend(questions)
                 except Exception as e:
@@ -962,14 +1525,14 @@ class LimeSurveyServerConfig(models.Model):
             _logger.info("Tentative de connexion au serveur LimeSurvey...")
             
             server = self._get_rpc_session()
-            _logger.info("Connexion réussie avec la clé de session: %s", server.session_key)
+            _logger.debug("Session RPC obtenue pour le sondage %s", self.sid)
             
             # Obtenir les propriétés du sondage
             _logger.info("Récupération des propriétés du sondage %s...", self.sid)
             survey_properties = self.get_survey_properties(self.sid)
             if not survey_properties:
                 raise Exception("Impossible de récupérer les propriétés du sondage")
-            _logger.info("Propriétés du sondage récupérées: %s", survey_properties)
+            _logger.debug("Propriétés du sondage récupérées: %s", payload_summary(survey_properties))
             
             # S'assurer d'avoir un titre valide
             title = survey_properties.get('surveyls_title')
@@ -985,30 +1548,18 @@ class LimeSurveyServerConfig(models.Model):
             _logger.info("Récupération des groupes de questions...")
             try:
                 groups = server.list_groups(server.session_key, int(self.sid), language)
-                _logger.info("Groupes de questions récupérés: %s", groups)
+                _logger.debug("Groupes de questions récupérés: %s", payload_summary(groups))
             except Exception as e:
                 _logger.error("Erreur lors de la récupération des groupes: %s", str(e), exc_info=True)
                 groups = []
             
-            # Récupérer les questions pour chaque groupe
+            # Récupérer les questions de tous les groupes en un minimum d'allers-retours
             all_questions = []
             if groups:
-                _logger.info("Récupération des questions par groupe...")
-                for group in groups:
-                    try:
-                        group_id = group.get('gid')
-                        _logger.info("Récupération des questions du groupe %s...", group_id)
-                        questions = server.list_questions(
-                            server.session_key, 
-                            int(self.sid),
-                            group_id,
-                            language
-                        )
-                        _logger.info("Questions du groupe %s récupérées: %s", group_id, questions)
-                        if questions:
-                            all_questions.extend(questions)
-                    except Exception as e:
-                        _logger.error("Erreur lors de la récupération des questions du groupe %s: %s", group_id, str(e), exc_info=True)
+                _logger.info("Récupération des questions de %d groupes...", len(groups))
+                for group, questions in self._fetch_group_questions(server, self.sid, groups, language):
+                    _logger.debug("Questions du groupe %s récupérées: %s", group.get('gid'), payload_summary(questions))
+                    all_questions.extend(questions)
             else:
                 # Si pas de groupes, essayer de récupérer toutes les questions
                 _logger.info("Aucun groupe trouvé, tentative de récupération de toutes les questions...")
@@ -1019,7 +1570,7 @@ class LimeSurveyServerConfig(models.Model):
                         None,
                         language
                     )
-                    _logger.info("Questions sans groupe récupérées: %s", questions)
+                    _logger.debug("Questions sans groupe récupérées: %s", payload_summary(questions))
                     if questions:
                         all_questions.extend(questions)
                 except Exception as e:
@@ -1038,7 +1589,7 @@ class LimeSurveyServerConfig(models.Model):
                 'sync_status': 'synced',
                 'metadata': survey_properties,
             }
-            _logger.info("Mise à jour du template avec les valeurs: %s", vals)
+            _logger.debug("Mise à jour du template %s (%s)", self.sid, ", ".join(sorted(vals)))
             
             # Créer d'abord le mapping principal
             mapping = self.env['admission.form.mapping'].create({
@@ -1099,7 +1650,7 @@ class LimeSurveyServerConfig(models.Model):
                             'odoo_field': '',  # À mapper manuellement
                             'confidence_score': 0,
                         }
-                        _logger.info("Création de la ligne de mapping: %s", mapping_line_vals)
+                        _logger.debug("Création de la ligne de mapping %s", mapping_line_vals.get('question_code'))
                         self.env['admission.mapping.line'].create(mapping_line_vals)
                     except Exception as e:
                         _logger.error("Erreur lors de la création du mapping pour la question %s: %s", question.get('title'), str(e), exc_info=True)
@@ -1114,14 +1665,36 @@ class LimeSurveyServerConfig(models.Model):
                 "Détail : %s"
             ) % str(e))
 
-    def get_survey_responses(self, sid):
+    @api.model
+    def _get_export_page_size(self):
+        """Nombre maximal de réponses demandées par appel à export_responses."""
+        return max(1, int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.export_page_size', 1000
+        )))
+
+    def get_survey_responses(self, sid, from_response_id=None, to_response_id=None):
         """
-        Récupère les réponses d'un sondage avec gestion d'erreur améliorée.
+        Récupère les réponses complètes d'un sondage, par pages d'ID.
+
+        Les plages d'ID de RemoteControl (iFromResponseID / iToResponseID)
+        permettent de ne demander que les réponses plus récentes qu'un
+        point de reprise. Les ID LimeSurvey pouvant comporter des trous,
+        une page vide déclenche une dernière demande sans borne haute.
+
+        Les réponses sont toutes chargées en mémoire : l'import utilise
+        ``iter_survey_responses``, qui les rend une à une.
+
         :param sid: ID du sondage
-        :return: Liste des réponses ou [] en cas d'erreur
+        :param from_response_id: Premier ID de réponse demandé (inclus)
+        :param to_response_id: Dernier ID de réponse demandé (inclus)
+        :return: Liste des réponses normalisées
+                 ({'id', 'submitdate', 'answers'}), ou None en cas d'erreur
         """
-        _logger.info("Récupération des réponses pour le sondage %s", sid)
-        
+        _logger.info(
+            "Récupération des réponses pour le sondage %s (à partir de %s)",
+            sid, from_response_id or 1
+        )
+
         try:
             # Validation du SID
             if not sid or not str(sid).isdigit():
@@ -1132,68 +1705,212 @@ class LimeSurveyServerConfig(models.Model):
             server = self._get_rpc_session()
             if not server:
                 _logger.error("Impossible de se connecter au serveur LimeSurvey")
-                return []
+                return None
 
-            # Préparation des paramètres selon la version de LimeSurvey
-            try:
-                # Essai avec la nouvelle signature (LimeSurvey 5+)
-                responses = server.export_responses(
-                    sSessionKey=server.session_key,
-                    iSurveyID=sid,
-                    sDocumentType='json',
-                    sLanguageCode='fr',
-                    sCompletionStatus='complete',
-                    sHeadingType='code',
-                    sResponseType='long'
-                )
-            except xmlrpc.client.Fault as e:
-                if "Calling parameters do not match signature" in str(e):
-                    # Fallback pour l'ancienne signature
-                    _logger.info("Utilisation de l'ancienne signature API pour le sondage %s", sid)
-                    responses = server.export_responses(
-                        server.session_key,
-                        sid,
-                        'json',
-                        'fr',
-                        'complete',
-                        'code',
-                        'long'
-                    )
-                else:
-                    _logger.error("Erreur RPC lors de la récupération des réponses: %s", str(e))
-                    return []
+            return self._fetch_survey_responses(
+                server, sid, self._get_export_page_size(), from_response_id, to_response_id,
+            )
 
-            # Traitement de la réponse
-            if not responses:
-                _logger.warning("Aucune réponse trouvée pour le sondage %s", sid)
-                return []
-                
-            # Décodage des réponses
-            try:
-                if isinstance(responses, str):
-                    decoded_responses = json.loads(responses)
-                elif isinstance(responses, bytes):
-                    decoded_responses = json.loads(responses.decode('utf-8'))
-                else:
-                    decoded_responses = responses
+        except Exception as e:
+            _logger.error("Erreur inattendue lors de la récupération des réponses du sondage %s: %s\n%s",
+                         sid, str(e), traceback.format_exc())
+            return None
 
-                if not isinstance(decoded_responses, (list, dict)):
-                    _logger.error("Format de réponse invalide pour le sondage %s", sid)
-                    return []
+    def iter_survey_responses(self, sid, from_response_id=None, to_response_id=None,
+                              completion_status='complete'):
+        """
+        Rend une à une les réponses d'un sondage, par pages d'ID.
 
-                # Normalisation du format
-                if isinstance(decoded_responses, dict):
-                    decoded_responses = [decoded_responses]
+        Chaque export est lu et décodé au fil de l'eau : la mémoire utilisée
+        ne dépend pas de la taille du sondage.
 
-                _logger.info("Récupération réussie de %d réponses pour le sondage %s",
-                            len(decoded_responses), sid)
-                return decoded_responses
+        :param sid: ID du sondage
+        :param from_response_id: Premier ID de réponse demandé (inclus)
+        :param to_response_id: Dernier ID de réponse demandé (inclus)
+        :param completion_status: ``complete``, ``incomplete`` ou ``all`` ; les
+                                  réponses incomplètes n'ont pas de ``submitdate``
+        :raises LimeSurveyError: si la connexion ou l'export échoue
+        """
+        self.ensure_one()
+        if not sid or not str(sid).isdigit():
+            raise LimeSurveyError(_("L'ID du sondage doit être un nombre valide: %s") % sid)
 
-            except json.JSONDecodeError as e:
-                _logger.error("Erreur de décodage JSON pour le sondage %s: %s", sid, str(e))
-                return []
+        server = self._get_rpc_session()
+        if not server:
+            raise LimeSurveyError(_(
+                "Impossible de récupérer les réponses. "
+                "Vérifiez la connexion au serveur LimeSurvey."
+            ))
 
-        except Exception as e:
-            _logger.error("Erreur inattendue lors de la récupération des réponses du sondage %s: %s\n%s",
-                         sid, str(e), traceback.format_exc())
-            return []
\ No newline at end of file
+        _logger.info(
+            "Export en flux des réponses du sondage %s (à partir de %s)",
+            sid, from_response_id or 1
+        )
+        yield from self._iter_survey_responses(
+            server, sid, self._get_export_page_size(), from_response_id, to_response_id,
+            completion_status,
+        )
+
+    def _fetch_survey_responses(self, server, sid, page_size, from_response_id=None, to_response_id=None):
+        """
+        Exporte les réponses d'un sondage page par page à partir d'un client RPC.
+
+        N'accède ni à la base ni à l'environnement : peut être exécutée
+        depuis un thread de synchronisation.
+
+        :return: Liste des réponses normalisées, ou None en cas d'erreur
+        """
+        try:
+            responses = list(self._iter_survey_responses(
+                server, sid, page_size, from_response_id, to_response_id,
+            ))
+        except (LimeSurveyError, xmlrpc.client.Error, ValueError) as e:
+            _logger.error("Erreur lors de la récupération des réponses du sondage %s: %s", sid, str(e))
+            return None
+
+        _logger.info("Récupération réussie de %d réponses pour le sondage %s",
+                     len(responses), sid)
+        return responses
+
+    def _iter_survey_responses(self, server, sid, page_size, from_response_id=None, to_response_id=None,
+                               completion_status='complete'):
+        """
+        Rend les réponses d'un sondage page par page, une réponse à la fois.
+
+        Si le serveur ne connaît pas les plages d'ID, le premier export porte
+        déjà sur tout le sondage : il est lu une seule fois et filtré, au lieu
+        d'être redemandé à chaque page.
+
+        N'accède ni à la base ni à l'environnement.
+
+        :raises LimeSurveyError: si un export échoue
+        """
+        current = max(1, from_response_id or 1)
+
+        while to_response_id is None or current <= to_response_id:
+            page_end = current + page_size - 1
+            if to_response_id is not None:
+                page_end = min(page_end, to_response_id)
+
+            chunks, legacy = self._export_responses(server, sid, current, page_end, completion_status)
+            if legacy:
+                # Export complet : la plage demandée est filtrée en une passe
+                yield from self._iter_exported_rows(sid, chunks, current, to_response_id)
+                return
+
+            count = 0
+            for response in self._iter_exported_rows(sid, chunks):
+                count += 1
+                yield response
+
+            if not count:
+                if to_response_id is not None:
+                    current = page_end + 1
+                    continue
+                # Trou dans les ID : le reste est demandé en une fois
+                chunks, legacy = self._export_responses(server, sid, current, None, completion_status)
+                yield from self._iter_exported_rows(sid, chunks, current, None)
+                return
+
+            current = page_end + 1
+
+    def _iter_export_responses(self, server, sid, from_response_id, to_response_id):
+        """
+        Exporte une plage d'ID et rend les réponses normalisées une à une.
+
+        :raises LimeSurveyError: si l'export échoue ou est refusé
+        """
+        chunks, legacy = self._export_responses(server, sid, from_response_id, to_response_id)
+        if legacy:
+            yield from self._iter_exported_rows(sid, chunks, from_response_id, to_response_id)
+        else:
+            yield from self._iter_exported_rows(sid, chunks)
+
+    def _export_responses(self, server, sid, from_response_id, to_response_id, completion_status='complete'):
+        """
+        Lance l'export d'une plage d'ID.
+
+        Le document base64 est décodé au fil de sa réception (voir
+        ``tools.export_stream``). Seul le statut ``No Response found``
+        correspond à une plage vide.
+
+        :return: (morceaux du document ou None si la plage est vide, True si
+                 le serveur a ignoré la plage et exporté tout le sondage)
+        :raises LimeSurveyError: si l'export échoue ou est refusé
+        """
+        params = (int(sid), 'json', 'fr', completion_status, 'code', 'long')
+        legacy = False
+        try:
+            value, chunks = server.call_stream('export_responses', *params, from_response_id, to_response_id)
+        except xmlrpc.client.Fault as e:
+            if "Calling parameters do not match signature" not in str(e):
+                raise LimeSurveyError("Erreur RPC lors de la récupération des réponses: %s" % str(e)) from e
+            # Anciennes versions sans plage d'ID : filtrage côté Odoo
+            _logger.info("Utilisation de l'ancienne signature API pour le sondage %s", sid)
+            legacy = True
+            value, chunks = server.call_stream('export_responses', *params)
+
+        if chunks is None:
+            status = value.get('status') if isinstance(value, dict) else value
+            if isinstance(status, str) and status.startswith('No Response found'):
+                # Plage vide
+                return None, legacy
+            # Permission refusée, sondage ou langue inconnus... : pas un export vide
+            raise LimeSurveyError(
+                "Export des réponses du sondage %s refusé: %s" % (sid, status)
+            )
+        return chunks, legacy
+
+    def _iter_exported_rows(self, sid, chunks, from_response_id=None, to_response_id=None):
+        """
+        Rend les réponses normalisées d'un export, filtrées sur la plage d'ID
+        indiquée le cas échéant.
+
+        :raises LimeSurveyError: si le document est illisible
+        """
+        if chunks is None:
+            return
+        filtered = bool(from_response_id or to_response_id)
+        try:
+            for row in iter_export_rows(chunks):
+                response = self._normalize_exported_row(row)
+                if response is None:
+                    continue
+                if filtered and not self._response_in_range(response, from_response_id, to_response_id):
+                    continue
+                yield response
+        except ValueError as e:
+            raise LimeSurveyError(
+                "Export des réponses du sondage %s illisible: %s" % (sid, str(e))
+            ) from e
+
+    @api.model
+    def _response_in_range(self, response, from_response_id, to_response_id):
+        """Indique si l'ID d'une réponse est dans la plage demandée."""
+        try:
+            response_id = int(response.get('id'))
+        except (TypeError, ValueError):
+            return True
+        if from_response_id and response_id < from_response_id:
+            return False
+        return not to_response_id or response_id <= to_response_id
+
+    @api.model
+    def _normalize_exported_row(self, row):
+        """
+        Normalise une ligne d'export.
+
+        :return: {'id', 'submitdate', 'answers'}, ou None si la ligne est invalide
+        """
+        if not isinstance(row, dict):
+            return None
+        # Selon la version : {"<id>": {...}} ou directement {...}
+        if 'id' not in row and len(row) == 1:
+            key, value = next(iter(row.items()))
+            if isinstance(value, dict):
+                row = dict(value, id=value.get('id', key))
+        return {
+            'id': str(row.get('id')),
+            'submitdate': row.get('submitdate'),
+            'answers': row,
+        }
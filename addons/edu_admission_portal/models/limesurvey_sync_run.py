@@ -0,0 +1,229 @@
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api, _
+
+from ..tools.rpc_telemetry import NO_SURVEY
+
+_logger = logging.getLogger(__name__)
+
+# Nombre maximal de statistiques conservées par dimension et par exécution
+RPC_STAT_LIMIT = 50
+
+# Durée de conservation des exécutions (jours)
+SYNC_RUN_RETENTION_DAYS = 90
+
+
+class LimeSurveySyncRun(models.Model):
+    _name = 'limesurvey.sync.run'
+    _description = 'Exécution de Synchronisation LimeSurvey'
+    _order = 'start_date desc, id desc'
+
+    name = fields.Char(
+        string='Nom',
+        compute='_compute_name',
+    )
+    server_id = fields.Many2one(
+        'limesurvey.server.config',
+        string='Serveur LimeSurvey',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    operation = fields.Selection([
+        ('sync_forms', 'Synchronisation des formulaires'),
+        ('import', 'Import des réponses'),
+    ], string='Opération',
+        required=True,
+    )
+    state = fields.Selection([
+        ('success', 'Réussie'),
+        ('partial', 'Partielle'),
+        ('failed', 'Échec'),
+    ], string='Résultat',
+        required=True,
+    )
+    start_date = fields.Datetime(
+        string='Début',
+        required=True,
+        index=True,
+    )
+    duration = fields.Float(
+        string='Durée (s)',
+    )
+    call_count = fields.Integer(
+        string='Appels RPC',
+    )
+    error_count = fields.Integer(
+        string='Appels en erreur',
+    )
+    rpc_duration = fields.Float(
+        string='Temps RPC cumulé (s)',
+        help="Somme des durées des appels ; supérieure à la durée de l'exécution "
+             "lorsque des appels ont lieu en parallèle",
+    )
+    bytes_sent = fields.Float(
+        string='Octets envoyés',
+        digits=(16, 0),
+    )
+    bytes_received = fields.Float(
+        string='Octets reçus',
+        digits=(16, 0),
+    )
+    stat_ids = fields.One2many(
+        'limesurvey.rpc.stat',
+        'run_id',
+        string='Statistiques',
+    )
+    method_stat_ids = fields.One2many(
+        'limesurvey.rpc.stat',
+        'run_id',
+        string='Méthodes',
+        domain=[('dimension', '=', 'method')],
+    )
+    survey_stat_ids = fields.One2many(
+        'limesurvey.rpc.stat',
+        'run_id',
+        string='Sondages',
+        domain=[('dimension', '=', 'survey')],
+    )
+
+    @api.depends('server_id', 'operation', 'start_date')
+    def _compute_name(self):
+        """Calcule un libellé lisible pour l'exécution."""
+        operations = dict(self._fields['operation'].selection)
+        for run in self:
+            run.name = f"{run.server_id.name} - {operations.get(run.operation, '')} ({run.start_date})"
+
+    @api.model
+    def _record_run(self, server, operation, telemetry, start_date, duration, state):
+        """
+        Enregistre une exécution et ses statistiques agrégées.
+
+        Seules les ``RPC_STAT_LIMIT`` méthodes et sondages les plus coûteux
+        sont conservés.
+
+        Args:
+            server (record): Serveur LimeSurvey
+            operation (str): Opération mesurée
+            telemetry (RpcTelemetry): Agrégats des appels
+            start_date (datetime): Début de l'opération
+            duration (float): Durée de l'opération (secondes)
+            state (str): Résultat de l'opération
+
+        Returns:
+            record: L'exécution créée
+        """
+        stats = []
+        for dimension in ('method', 'survey'):
+            for key, call_stats in telemetry.slowest(dimension, RPC_STAT_LIMIT):
+                stats.append((0, 0, {
+                    'dimension': dimension,
+                    'key': key if key != NO_SURVEY else _('(aucun sondage)'),
+                    'call_count': call_stats.calls,
+                    'error_count': call_stats.errors,
+                    'total_duration': call_stats.duration,
+                    'max_duration': call_stats.max_duration,
+                    'bytes_sent': call_stats.sent,
+                    'bytes_received': call_stats.received,
+                }))
+
+        total = telemetry.total
+        run = self.create({
+            'server_id': server.id,
+            'operation': operation,
+            'state': state,
+            'start_date': start_date,
+            'duration': duration,
+            'call_count': total.calls,
+            'error_count': total.errors,
+            'rpc_duration': total.duration,
+            'bytes_sent': total.sent,
+            'bytes_received': total.received,
+            'stat_ids': stats,
+        })
+        _logger.info(
+            "%s sur %s : %d appels RPC (%d en erreur), %.1f s de RPC en %.1f s, %d octets reçus",
+            operation, server.name, total.calls, total.errors, total.duration, duration, total.received,
+        )
+        return run
+
+    @api.autovacuum
+    def _gc_sync_runs(self):
+        """Supprime les exécutions plus anciennes que la durée de conservation."""
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'edu_admission_portal.sync_run_retention_days', SYNC_RUN_RETENTION_DAYS
+        ))
+        self.search([
+            ('start_date', '<', fields.Datetime.now() - timedelta(days=days)),
+        ]).unlink()
+
+
+class LimeSurveyRpcStat(models.Model):
+    _name = 'limesurvey.rpc.stat'
+    _description = "Statistique d'Appels RPC LimeSurvey"
+    _order = 'total_duration desc, id'
+
+    run_id = fields.Many2one(
+        'limesurvey.sync.run',
+        string='Exécution',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    server_id = fields.Many2one(
+        related='run_id.server_id',
+        store=True,
+    )
+    start_date = fields.Datetime(
+        related='run_id.start_date',
+        store=True,
+    )
+    dimension = fields.Selection([
+        ('method', 'Méthode'),
+        ('survey', 'Sondage'),
+    ], string='Dimension',
+        required=True,
+    )
+    key = fields.Char(
+        string='Méthode / Sondage',
+        required=True,
+    )
+    call_count = fields.Integer(
+        string='Appels',
+        group_operator='sum',
+    )
+    error_count = fields.Integer(
+        string='Erreurs',
+        group_operator='sum',
+    )
+    total_duration = fields.Float(
+        string='Durée totale (s)',
+        group_operator='sum',
+    )
+    max_duration = fields.Float(
+        string='Durée max. (s)',
+        group_operator='max',
+    )
+    avg_duration = fields.Float(
+        string='Durée moyenne (s)',
+        compute='_compute_avg_duration',
+        store=True,
+        group_operator='avg',
+    )
+    bytes_sent = fields.Float(
+        string='Octets envoyés',
+        digits=(16, 0),
+        group_operator='sum',
+    )
+    bytes_received = fields.Float(
+        string='Octets reçus',
+        digits=(16, 0),
+        group_operator='sum',
+    )
+
+    @api.depends('total_duration', 'call_count')
+    def _compute_avg_duration(self):
+        """Durée moyenne d'un appel."""
+        for stat in self:
+            stat.avg_duration = stat.total_duration / stat.call_count if stat.call_count else 0.0
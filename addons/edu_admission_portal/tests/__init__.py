@@ -0,0 +1,17 @@
+from . import test_import_queries
+from . import test_sync_forms
+from . import test_limesurvey_client
+from . import test_mapping_reconcile
+from . import test_sync_scheduler
+from . import test_circuit_breaker
+from . import test_rpc_telemetry
+from . import test_fake_server
+from . import test_dashboard_stats
+from . import test_candidate_stats
+from . import test_dashboard_endpoint
+from . import test_stage_transitions
+from . import test_completeness_batch
+from . import test_webhook_queue
+from . import test_webhook_token_index
+from . import test_batch_transform
+from . import test_snippet_sandbox
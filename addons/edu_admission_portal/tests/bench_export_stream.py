@@ -0,0 +1,99 @@
+"""
+Benchmark mémoire du décodage des exports de réponses.
+
+Compare, sur un export synthétique encodé en base64 :
+
+- l'ancien décodage (``base64.b64decode`` puis ``json.loads`` sur tout le
+  document, liste complète des réponses en mémoire) ;
+- le décodage au fil de l'eau de ``tools/export_stream.py``, consommé
+  par paquets comme le fait l'import.
+
+La chaîne base64 elle-même est créée avant la mesure : seul le surcoût
+du décodage est comparé (pic mesuré avec ``tracemalloc``).
+
+Utilisation :
+    python tests/bench_export_stream.py [taille_en_Mo]
+"""
+import base64
+import importlib
+import itertools
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+IMPORT_CHUNK_SIZE = 500
+
+# Les modules de tools sont chargés par leur chemin, sans le __init__ du
+# paquet : ils ne dépendent pas d'Odoo
+_TOOLS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools',
+)
+admission_tools = types.ModuleType('admission_tools')
+admission_tools.__path__ = [_TOOLS_PATH]
+sys.modules['admission_tools'] = admission_tools
+export_stream = importlib.import_module('admission_tools.export_stream')
+
+
+def build_payload(size_mb):
+    """Construit un export base64 d'environ ``size_mb`` Mo de JSON."""
+    long_text = 'Lettre de motivation : ' + 'é' * 2000
+    rows = []
+    size = 0
+    n = 0
+    while size < size_mb * 1024 * 1024:
+        n += 1
+        row = json.dumps({str(n): {
+            'id': n,
+            'submitdate': '2024-01-01 10:00:00',
+            'G01Q02': f'Nom{n}',
+            'G01Q03': f'Prenom{n}',
+            'G03Q14': f'candidat{n}@example.com',
+            'G04Q01': long_text,
+        }})
+        rows.append(row)
+        size += len(row)
+    document = '{"responses": [' + ', '.join(rows) + ']}'
+    del rows
+    return base64.b64encode(document.encode('utf-8')).decode('ascii'), n
+
+
+def decode_whole(payload):
+    """Ancien comportement : tout le document est décodé d'un bloc."""
+    rows = json.loads(base64.b64decode(payload))['responses']
+    responses = [row for row in rows]
+    return len(responses)
+
+
+def decode_stream(payload):
+    """Nouveau comportement : réponses rendues une à une, consommées par paquets."""
+    rows = export_stream.iter_export_rows(export_stream.iter_text_chunks(payload))
+    count = 0
+    while True:
+        chunk = list(itertools.islice(rows, IMPORT_CHUNK_SIZE))
+        if not chunk:
+            return count
+        count += len(chunk)
+
+
+def measure(func, payload):
+    """Retourne (nombre de réponses, pic mémoire en Mo, durée en s)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func(payload)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, peak / (1024 * 1024), elapsed
+
+
+if __name__ == '__main__':
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    payload, row_count = build_payload(size_mb)
+
+    print(f"Export synthétique : {row_count} réponses, {len(payload) / (1024 * 1024):.0f} Mo en base64")
+    for label, func in (('décodage complet', decode_whole), ('décodage en flux', decode_stream)):
+        count, peak, elapsed = measure(func, payload)
+        print(f"  {label:17}: {count} réponses, pic {peak:8.1f} Mo, {elapsed:6.1f} s")
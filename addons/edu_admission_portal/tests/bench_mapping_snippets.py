@@ -0,0 +1,105 @@
+"""
+Micro-benchmark du coût par valeur des extraits de mapping.
+
+Compare l'exécution du code source brut (``exec`` sur le texte, comme
+avant la mise en cache) à l'exécution du code compilé récupéré dans le
+cache LRU, pour un mapping de 50 lignes.
+
+Utilisation :
+    python tests/bench_mapping_snippets.py [nombre_de_reponses]
+"""
+import importlib
+import os
+import sys
+import time
+import types
+
+LINE_COUNT = 50
+
+# Les modules de tools sont chargés par leur chemin, sans le __init__ du
+# paquet : ils ne dépendent pas d'Odoo
+_TOOLS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools',
+)
+admission_tools = types.ModuleType('admission_tools')
+admission_tools.__path__ = [_TOOLS_PATH]
+sys.modules['admission_tools'] = admission_tools
+mapping_plan = importlib.import_module('admission_tools.mapping_plan')
+
+TRANSFORM = """
+if isinstance(value, str):
+    value = value.strip()
+    if value.replace('.', '', 1).isdigit():
+        result = float(value)
+    else:
+        result = value.upper()
+else:
+    result = value
+"""
+
+VALIDATION = """
+result = value is not None and value != ''
+"""
+
+
+def build_mapping():
+    """Construit 50 lignes (id, code question, transformation, validation)."""
+    return [
+        (line_id, f'G01Q{line_id:02d}', TRANSFORM + f'# ligne {line_id}\n', VALIDATION)
+        for line_id in range(1, LINE_COUNT + 1)
+    ]
+
+
+def build_responses(count):
+    """Construit des réponses factices pour chaque ligne du mapping."""
+    return [
+        {f'G01Q{line_id:02d}': (f' {n}.5 ' if line_id % 2 else f' val{n} ')
+         for line_id in range(1, LINE_COUNT + 1)}
+        for n in range(count)
+    ]
+
+
+def run_source(lines, responses):
+    """Ancien comportement : exec() sur le texte source à chaque valeur."""
+    for response in responses:
+        for line_id, code, transform, validation in lines:
+            local_vars = {'value': response[code]}
+            exec(transform, globals(), local_vars)
+            local_vars = {'value': local_vars['result']}
+            exec(validation, globals(), local_vars)
+
+
+def run_cached(lines, responses):
+    """Nouveau comportement : code compilé récupéré dans le cache LRU."""
+    cache = mapping_plan.snippet_cache
+    for response in responses:
+        for line_id, code, transform, validation in lines:
+            local_vars = {'value': response[code]}
+            exec(cache.get(line_id, 'transform_python', transform), globals(), local_vars)
+            local_vars = {'value': local_vars['result']}
+            exec(cache.get(line_id, 'validation_python', validation), globals(), local_vars)
+
+
+def bench(func, lines, responses):
+    """Retourne le coût moyen par valeur, en microsecondes."""
+    start = time.perf_counter()
+    func(lines, responses)
+    elapsed = time.perf_counter() - start
+    return elapsed / (len(lines) * len(responses)) * 1e6
+
+
+if __name__ == '__main__':
+    response_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    lines = build_mapping()
+    responses = build_responses(response_count)
+
+    before = bench(run_source, lines, responses)
+    mapping_plan.snippet_cache.clear()
+    after = bench(run_cached, lines, responses)
+
+    print(f"Mapping de {LINE_COUNT} lignes, {response_count} réponses")
+    print(f"  exec(source)      : {before:8.2f} µs/valeur")
+    print(f"  code en cache LRU : {after:8.2f} µs/valeur")
+    print(f"  gain              : x{before / after:.1f}")
+    print(f"  cache : {len(mapping_plan.snippet_cache)} entrées, "
+          f"{mapping_plan.snippet_cache.hits} hits, {mapping_plan.snippet_cache.misses} misses")
@@ -0,0 +1,77 @@
+"""
+Benchmark des allers-retours RemoteControl contre un serveur simulé.
+
+Récupère les questions de tous les groupes d'un sondage synthétique, sur
+un serveur local à latence injectée (``tests/fake_limesurvey.py``) :
+
+- un appel ``list_questions`` par groupe, en séquence ;
+- les mêmes appels regroupés par ``system.multicall`` ;
+- les mêmes appels en parallèle sur les connexions keep-alive, lorsque
+  le serveur refuse ``system.multicall``.
+
+Aucun serveur LimeSurvey n'est nécessaire ; ``requests`` doit être installé.
+
+Utilisation :
+    python tests/bench_rpc_roundtrips.py [groupes] [latence_en_ms]
+"""
+import importlib
+import os
+import sys
+import time
+import types
+
+from fake_limesurvey import FakeLimeSurveyServer, FakeSurvey
+
+# Les modules de tools sont chargés par leur chemin, sans le __init__ du
+# paquet : ils ne dépendent pas d'Odoo
+_TOOLS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools',
+)
+admission_tools = types.ModuleType('admission_tools')
+admission_tools.__path__ = [_TOOLS_PATH]
+sys.modules['admission_tools'] = admission_tools
+limesurvey_client = importlib.import_module('admission_tools.limesurvey_client')
+
+SID = 123456
+
+
+def sequential(client, gids):
+    return [client.call('list_questions', SID, gid) for gid in gids]
+
+
+def batched(client, gids):
+    return client.multicall([('list_questions', [SID, gid]) for gid in gids])
+
+
+def measure(fake, func, gids, multicall):
+    """Retourne (questions récupérées, requêtes HTTP, durée en s)."""
+    fake.remote_control.multicall = multicall
+    client = limesurvey_client.LimeSurveyClient(fake.api_url, 'admin', 'admin', pool_size=4)
+    try:
+        client.session_key
+        requests_before = len(fake.requests)
+        start = time.perf_counter()
+        results = func(client, gids)
+        elapsed = time.perf_counter() - start
+        questions = sum(len(result) for result in results if isinstance(result, list))
+        return questions, len(fake.requests) - requests_before, elapsed
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    group_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency_ms = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    survey = FakeSurvey(SID, groups=group_count, questions_per_group=10)
+    gids = [group['gid'] for group in survey.groups]
+    with FakeLimeSurveyServer([survey]) as fake:
+        fake.method_latency['list_questions'] = latency_ms / 1000.0
+        print(f"Sondage synthétique : {group_count} groupes, {latency_ms} ms par list_questions")
+        for label, func, multicall in (
+            ('séquentiel', sequential, True),
+            ('system.multicall', batched, True),
+            ('parallèle', batched, False),
+        ):
+            questions, http_requests, elapsed = measure(fake, func, gids, multicall)
+            print(f"  {label:16}: {questions} questions, {http_requests:3d} requêtes HTTP, {elapsed:6.2f} s")
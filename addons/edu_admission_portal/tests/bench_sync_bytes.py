@@ -0,0 +1,64 @@
+"""
+Benchmark du volume reçu pour compter les réponses d'un sondage.
+
+Compare, sur un sondage synthétique de N réponses servi par un serveur
+local (``tests/fake_limesurvey.py``), les octets reçus par le transport :
+
+- avant : ``export_responses`` complet, décodé pour compter les réponses ;
+- après : ``get_summary``, utilisé par la synchronisation des formulaires.
+
+Aucun serveur LimeSurvey n'est nécessaire ; ``requests`` doit être installé.
+
+Utilisation :
+    python tests/bench_sync_bytes.py [réponses ...]
+"""
+import importlib
+import os
+import sys
+import types
+
+from fake_limesurvey import FakeLimeSurveyServer, FakeSurvey
+
+# Les modules de tools sont chargés par leur chemin, sans le __init__ du
+# paquet : ils ne dépendent pas d'Odoo
+_TOOLS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools',
+)
+admission_tools = types.ModuleType('admission_tools')
+admission_tools.__path__ = [_TOOLS_PATH]
+sys.modules['admission_tools'] = admission_tools
+limesurvey_client = importlib.import_module('admission_tools.limesurvey_client')
+
+SID = 123456
+
+
+def export_count(client):
+    return client.call('export_responses', SID, 'json')
+
+
+def summary_count(client):
+    return client.call('get_summary', SID, 'all')
+
+
+def measure(fake, func):
+    """Retourne les octets reçus par le transport pour un appel."""
+    client = limesurvey_client.LimeSurveyClient(fake.api_url, 'admin', 'admin', pool_size=1)
+    try:
+        client.session_key
+        received_before = client.transport.bytes_received
+        func(client)
+        return client.transport.bytes_received - received_before
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+
+    print("Octets reçus pour compter les réponses d'un sondage (3 groupes de 5 questions)")
+    for size in sizes:
+        survey = FakeSurvey(SID, groups=3, questions_per_group=5, responses=size)
+        with FakeLimeSurveyServer([survey]) as fake:
+            before = measure(fake, export_count)
+            after = measure(fake, summary_count)
+        print(f"  {size:6d} réponses : avant {before:10d} octets, après {after:5d} octets")
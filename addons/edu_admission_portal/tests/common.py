@@ -0,0 +1,51 @@
+from odoo.tests.common import TransactionCase
+
+
+class AdmissionCase(TransactionCase):
+    """
+    Serveur LimeSurvey et formulaires communs aux tests du module.
+
+    Les valeurs de ``server_vals`` complètent celles du serveur de test.
+    Pour un test HTTP, la classe se combine avec ``HttpCase`` :
+    ``class TestX(HttpCase, AdmissionCase)``.
+    """
+
+    server_vals = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = cls.env['limesurvey.server.config'].create({
+            'name': 'Serveur de test',
+            'base_url': 'http://limesurvey.test',
+            'api_username': 'admin',
+            'api_password': 'admin',
+            **cls.server_vals,
+        })
+        cls.ServerConfig = type(cls.server)
+
+    @classmethod
+    def _create_form_template(cls, sid):
+        """Crée un formulaire du serveur de test."""
+        return cls.env['admission.form.template'].create({
+            'title': f'Formulaire {sid}',
+            'sid': sid,
+            'server_config_id': cls.server.id,
+        })
+
+    @classmethod
+    def _create_validated_mapping(cls, form, fields_by_code):
+        """Crée un mapping validé à partir de couples (code de question, champ candidat)."""
+        mapping = cls.env['admission.form.mapping'].create({
+            'form_template_id': form.id,
+        })
+        cls.env['admission.mapping.line'].create([{
+            'mapping_id': mapping.id,
+            'question_code': code,
+            'question_text': code,
+            'question_type': 'text',
+            'odoo_field': field,
+            'status': 'validated',
+        } for code, field in fields_by_code])
+        mapping.state = 'validated'
+        return mapping
@@ -0,0 +1,514 @@
+"""
+Serveur RemoteControl2 LimeSurvey simulé, pour les tests et benchmarks hors ligne.
+
+Le serveur tourne dans le processus de test, sur un port local libre, et
+répond en XML-RPC (y compris ``system.multicall``) comme en JSON-RPC, à
+n'importe quel chemin se terminant par ``remotecontrol``. Il sert des
+sondages synthétiques dont les groupes, questions, langues, réponses et
+pièces jointes sont configurables, et permet d'injecter de la latence et
+des pannes :
+
+    survey = FakeSurvey(123456, groups=3, questions_per_group=5, responses=200)
+    with FakeLimeSurveyServer([survey], latency=0.01) as fake:
+        fake.inject_fault('list_questions', 'http_500', times=2)
+        server_config.base_url = fake.base_url
+
+Seule la bibliothèque standard est utilisée : le module ne dépend ni
+d'Odoo ni de ``requests``.
+"""
+import base64
+import json
+import secrets
+import threading
+import time
+import xmlrpc.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Code d'erreur XML-RPC renvoyé par LimeSurvey pour une méthode inconnue
+METHOD_NOT_FOUND = 620
+
+# Types de questions des sondages synthétiques, en rotation
+QUESTION_TYPES = ('S', 'T', 'N', 'D', 'L', 'M')
+
+# Pannes injectables en plus des Fault XML-RPC et des statuts LimeSurvey
+FAULT_KINDS = ('http_500', 'disconnect')
+
+
+class FakeSurvey:
+    """Sondage synthétique servi par ``FakeLimeSurveyServer``."""
+
+    def __init__(self, sid, title=None, languages=('fr',), groups=3, questions_per_group=5,
+                 responses=0, attachments=False, active=True, first_response_id=1, answers=None):
+        self.sid = int(sid)
+        self.title = title or f'Sondage {sid}'
+        self.languages = list(languages)
+        self.active = active
+        self.attachments = attachments
+        # Modèles de réponse par code de question, ex. {'G03Q04': 'candidat{id}@example.com'}
+        self.answers = dict(answers or {})
+        self.response_ids = list(range(first_response_id, first_response_id + responses))
+
+        self.groups = []
+        self.questions = []
+        for g in range(1, groups + 1):
+            gid = self.sid * 100 + g
+            self.groups.append({
+                'gid': gid,
+                'sid': self.sid,
+                'group_name': f'Groupe {g}',
+                'group_order': g,
+                'description': '',
+            })
+            for q in range(1, questions_per_group + 1):
+                self.questions.append({
+                    'qid': gid * 100 + q,
+                    'gid': gid,
+                    'sid': self.sid,
+                    'parent_qid': 0,
+                    'title': f'G{g:02d}Q{q:02d}',
+                    'question': f'<p>Question {q} du groupe {g}</p>',
+                    'type': QUESTION_TYPES[(q - 1) % len(QUESTION_TYPES)],
+                    'mandatory': 'Y' if q == 1 else 'N',
+                    'question_order': q,
+                })
+            if attachments and g == 1:
+                self.questions.append({
+                    'qid': gid * 100 + 99,
+                    'gid': gid,
+                    'sid': self.sid,
+                    'parent_qid': 0,
+                    'title': 'G01PJ',
+                    'question': '<p>Pièce justificative</p>',
+                    'type': '|',
+                    'mandatory': 'N',
+                    'question_order': 99,
+                })
+
+    def survey_row(self):
+        """Ligne renvoyée par ``list_surveys``."""
+        return {
+            'sid': str(self.sid),
+            'surveyls_title': self.title,
+            'startdate': None,
+            'expires': None,
+            'active': 'Y' if self.active else 'N',
+        }
+
+    def properties(self):
+        """Propriétés renvoyées par ``get_survey_properties``."""
+        return {
+            'sid': self.sid,
+            'active': 'Y' if self.active else 'N',
+            'language': self.languages[0],
+            'additional_languages': ' '.join(self.languages[1:]),
+            'owner_id': 1,
+            'format': 'G',
+            'anonymized': 'N',
+        }
+
+    def language_properties(self, language):
+        """Propriétés renvoyées par ``get_language_properties``."""
+        return {
+            'surveyls_survey_id': self.sid,
+            'surveyls_language': language,
+            'surveyls_title': self.title if language == self.languages[0] else f'{self.title} ({language})',
+            'surveyls_description': f'<p>Description {language}</p>',
+        }
+
+    def file_metadata(self, response_id):
+        """Métadonnées LimeSurvey du fichier joint à une réponse."""
+        return {
+            'title': 'Pièce justificative',
+            'comment': '',
+            'size': '0.02',
+            'name': f'piece_{response_id}.pdf',
+            'filename': f'fu_{self.sid}_{response_id}',
+            'ext': 'pdf',
+        }
+
+    def file_content(self, response_id):
+        return b'%PDF-1.4\n% reponse ' + str(response_id).encode('ascii') + b'\n'
+
+    def response(self, response_id):
+        """Ligne d'export d'une réponse complète."""
+        row = {
+            'id': str(response_id),
+            'submitdate': '2024-01-%02d 10:00:00' % (response_id % 28 + 1),
+            'lastpage': '1',
+            'startlanguage': self.languages[0],
+        }
+        for question in self.questions:
+            code = question['title']
+            qtype = question['type']
+            if code in self.answers:
+                row[code] = self.answers[code].format(id=response_id)
+            elif qtype == '|':
+                row[code] = json.dumps([self.file_metadata(response_id)])
+                row[f'{code}_filecount'] = '1'
+            elif qtype == 'N':
+                row[code] = str(response_id)
+            elif qtype == 'D':
+                row[code] = '2000-01-01 00:00:00'
+            elif qtype in ('L', 'M'):
+                row[code] = 'A1'
+            else:
+                row[code] = f'{code} réponse {response_id}'
+        return row
+
+
+class FakeRemoteControl:
+    """Implémentation des méthodes RemoteControl2 sur des sondages synthétiques."""
+
+    def __init__(self, surveys=(), username='admin', password='admin', latency=0.0, multicall=True):
+        self.surveys = {survey.sid: survey for survey in surveys}
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.method_latency = {}
+        self.multicall = multicall
+        self.sessions = set()
+        # Méthodes appelées (multicall développé), dans l'ordre de réception
+        self.calls = []
+        # Requêtes HTTP reçues : 'xmlrpc' ou 'jsonrpc'
+        self.requests = []
+        self._faults = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Pilotage
+    # ------------------------------------------------------------------
+
+    def inject_fault(self, method, fault, times=1):
+        """
+        Fait échouer les ``times`` prochains appels d'une méthode.
+
+        Args:
+            method (str): Méthode visée ('*' pour toutes)
+            fault: ``xmlrpc.client.Fault``, dictionnaire de statut LimeSurvey
+                renvoyé comme résultat, 'http_500' ou 'disconnect'
+            times (int): Nombre d'appels concernés (None : tous)
+        """
+        with self._lock:
+            self._faults.setdefault(method, []).append([fault, times])
+
+    def clear_faults(self):
+        with self._lock:
+            self._faults.clear()
+
+    def expire_sessions(self):
+        """Invalide toutes les clés de session, comme à leur expiration."""
+        with self._lock:
+            self.sessions.clear()
+
+    def call_count(self, method):
+        with self._lock:
+            return self.calls.count(method)
+
+    def take_fault(self, method):
+        """Retourne la panne à appliquer à un appel, ou None."""
+        with self._lock:
+            for key in (method, '*'):
+                queue = self._faults.get(key)
+                if not queue:
+                    continue
+                entry = queue[0]
+                if entry[1] is not None:
+                    entry[1] -= 1
+                    if entry[1] <= 0:
+                        queue.pop(0)
+                return entry[0]
+        return None
+
+    # ------------------------------------------------------------------
+    # Répartition
+    # ------------------------------------------------------------------
+
+    def dispatch(self, method, params, fault=None):
+        """
+        Exécute un appel après latence et panne éventuelles.
+
+        Les pannes HTTP ('http_500', 'disconnect') sont remontées telles
+        quelles au gestionnaire de requête.
+        """
+        with self._lock:
+            self.calls.append(method)
+        delay = self.method_latency.get(method, self.latency)
+        if delay:
+            time.sleep(delay)
+        if fault is None:
+            fault = self.take_fault(method)
+        if isinstance(fault, dict):
+            return fault
+        if fault is not None and not isinstance(fault, str):
+            raise fault
+
+        handler = getattr(self, 'rc_' + method, None)
+        if handler is None:
+            raise xmlrpc.client.Fault(METHOD_NOT_FOUND, f'Method "{method}" does not exist')
+        try:
+            return handler(*params)
+        except TypeError as e:
+            raise xmlrpc.client.Fault(
+                METHOD_NOT_FOUND, f'Calling parameters do not match signature ({e})'
+            ) from e
+
+    def multicall_results(self, calls):
+        """Résultats d'un ``system.multicall`` : [valeur] ou {faultCode, faultString}."""
+        results = []
+        for call in calls:
+            method = call.get('methodName')
+            try:
+                results.append([self.dispatch(method, call.get('params') or [])])
+            except xmlrpc.client.Fault as e:
+                results.append({'faultCode': e.faultCode, 'faultString': e.faultString})
+        return results
+
+    def _check_session(self, session_key):
+        with self._lock:
+            return session_key in self.sessions
+
+    def _survey(self, session_key, sid):
+        """Sondage demandé, ou dictionnaire de statut en cas de refus."""
+        if not self._check_session(session_key):
+            return None, {'status': 'Invalid session key'}
+        survey = self.surveys.get(int(sid))
+        if survey is None:
+            return None, {'status': 'Error: Invalid survey ID'}
+        return survey, None
+
+    # ------------------------------------------------------------------
+    # Méthodes RemoteControl2
+    # ------------------------------------------------------------------
+
+    def rc_get_session_key(self, username, password, plugin='Authdb'):
+        if username != self.username or password != self.password:
+            return {'status': 'Invalid user name or password'}
+        session_key = secrets.token_hex(16)
+        with self._lock:
+            self.sessions.add(session_key)
+        return session_key
+
+    def rc_release_session_key(self, session_key):
+        with self._lock:
+            self.sessions.discard(session_key)
+        return 'OK'
+
+    def rc_list_surveys(self, session_key, username=None):
+        if not self._check_session(session_key):
+            return {'status': 'Invalid session key'}
+        if not self.surveys:
+            return {'status': 'No surveys found'}
+        return [survey.survey_row() for survey in self.surveys.values()]
+
+    def rc_get_survey_properties(self, session_key, sid, settings=None):
+        survey, status = self._survey(session_key, sid)
+        if status:
+            return status
+        properties = survey.properties()
+        if settings:
+            properties = {key: properties.get(key) for key in settings}
+        return properties
+
+    def rc_get_language_properties(self, session_key, sid, settings=None, language=None):
+        survey, status = self._survey(session_key, sid)
+        if status:
+            return status
+        # La langue est aussi acceptée en second paramètre, comme l'appelle le module
+        if isinstance(settings, str):
+            language, settings = settings, None
+        language = language or survey.languages[0]
+        if language not in survey.languages:
+            return {'status': 'Error: Invalid language'}
+        properties = survey.language_properties(language)
+        if settings:
+            properties = {key: properties.get(key) for key in settings}
+        return properties
+
+    def rc_list_groups(self, session_key, sid, language=None):
+        survey, status = self._survey(session_key, sid)
+        if status:
+            return status
+        if not survey.groups:
+            return {'status': 'No groups found'}
+        return [dict(group, language=language or survey.languages[0]) for group in survey.groups]
+
+    def rc_list_questions(self, session_key, sid, gid=None, language=None):
+        survey, status = self._survey(session_key, sid)
+        if status:
+            return status
+        questions = [
+            dict(question, language=language or survey.languages[0])
+            for question in survey.questions
+            if gid is None or question['gid'] == int(gid)
+        ]
+        return questions or {'status': 'No questions found'}
+
+    def rc_get_summary(self, session_key, sid, stat_name='all'):
+        survey, status = self._survey(session_key, sid)
+        if status:
+            return status
+        summary = {
+            'completed_responses': str(len(survey.response_ids)),
+            'incomplete_responses': '0',
+            'full_responses': str(len(survey.response_ids)),
+        }
+        if stat_name and stat_name != 'all':
+            return summary.get(stat_name, {'status': 'No available data'})
+        return summary
+
+    def rc_export_responses(self, session_key, sid, document_type, language=None,
+                            completion_status='all', heading_type='code', response_type='short',
+                            from_response_id=None, to_response_id=None, fields=None):
+        survey, status = self._survey(session_key, sid)
+        if status:
+            return status
+        if document_type != 'json':
+            return {'status': 'Invalid extension'}
+        rows = [
+            {str(response_id): survey.response(response_id)}
+            for response_id in survey.response_ids
+            if (not from_response_id or response_id >= int(from_response_id))
+            and (not to_response_id or response_id <= int(to_response_id))
+        ]
+        if not rows:
+            return {'status': 'No Response found for Token'}
+        document = json.dumps({'responses': rows}).encode('utf-8')
+        return base64.b64encode(document).decode('ascii')
+
+    def rc_get_uploaded_files(self, session_key, sid, token=None, response_id=None):
+        survey, status = self._survey(session_key, sid)
+        if status:
+            return status
+        if not survey.attachments:
+            return {'status': 'No Response found for Token'}
+        response_ids = [int(response_id)] if response_id else survey.response_ids
+        files = {}
+        for rid in response_ids:
+            if rid not in survey.response_ids:
+                continue
+            meta = survey.file_metadata(rid)
+            files[meta['filename']] = {
+                'meta': meta,
+                'content': base64.b64encode(survey.file_content(rid)).decode('ascii'),
+            }
+        return files
+
+
+class _RemoteControlHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP : XML-RPC ou JSON-RPC selon le corps de la requête."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        rc = self.server.remote_control
+        if not self.path.rstrip('/').endswith('remotecontrol'):
+            self._send(404, b'Not Found', 'text/plain')
+            return
+
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        is_json = 'json' in (self.headers.get('Content-Type') or '') or body.lstrip()[:1] == b'{'
+        try:
+            if is_json:
+                request = json.loads(body)
+                method, params = request.get('method'), request.get('params') or []
+            else:
+                params, method = xmlrpc.client.loads(body, use_datetime=True)
+        except Exception:
+            self._send(400, b'Bad Request', 'text/plain')
+            return
+        with rc._lock:
+            rc.requests.append('jsonrpc' if is_json else 'xmlrpc')
+
+        # Pannes de transport : avant toute exécution
+        fault = rc.take_fault(method)
+        if fault == 'http_500':
+            with rc._lock:
+                rc.calls.append(method)
+            self._send(500, b'Internal Server Error', 'text/plain')
+            return
+        if fault == 'disconnect':
+            with rc._lock:
+                rc.calls.append(method)
+            self.close_connection = True
+            return
+
+        if is_json:
+            self._answer_json(rc, request, method, params, fault)
+        else:
+            self._answer_xml(rc, method, params, fault)
+
+    def _answer_xml(self, rc, method, params, fault):
+        try:
+            if method == 'system.multicall' and rc.multicall:
+                result = rc.multicall_results(params[0] if params else [])
+            else:
+                result = rc.dispatch(method, params, fault)
+            payload = xmlrpc.client.dumps((result,), methodresponse=True, allow_none=True)
+        except xmlrpc.client.Fault as e:
+            payload = xmlrpc.client.dumps(e, allow_none=True)
+        self._send(200, payload.encode('utf-8'), 'text/xml')
+
+    def _answer_json(self, rc, request, method, params, fault):
+        answer = {'id': request.get('id'), 'result': None, 'error': None}
+        try:
+            answer['result'] = rc.dispatch(method, params, fault)
+        except xmlrpc.client.Fault as e:
+            answer['error'] = e.faultString
+        self._send(200, json.dumps(answer).encode('utf-8'), 'application/json')
+
+    def _send(self, status, payload, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeLimeSurveyServer:
+    """Serveur HTTP local exposant un ``FakeRemoteControl``."""
+
+    def __init__(self, surveys=(), **options):
+        self.remote_control = FakeRemoteControl(surveys, **options)
+        self._httpd = None
+        self._thread = None
+
+    def __getattr__(self, name):
+        # Pilotage délégué : inject_fault, expire_sessions, calls, latency...
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.remote_control, name)
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _RemoteControlHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.remote_control = self.remote_control
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name='fake-limesurvey', daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def base_url(self):
+        """URL de base à renseigner sur la configuration du serveur."""
+        return 'http://127.0.0.1:%d/limesurvey' % self._httpd.server_address[1]
+
+    @property
+    def api_url(self):
+        return self.base_url + '/index.php/admin/remotecontrol'
@@ -0,0 +1,107 @@
+from unittest import skipIf
+from unittest.mock import patch
+
+from odoo.tests.common import tagged
+
+from ..tools.mapping_plan import MappingPlan, numpy
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestBatchTransform(AdmissionCase):
+    """Vérifie les transformations par lot et le repli valeur par valeur."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.form = cls._create_form_template('980001')
+        cls.mapping = cls.env['admission.form.mapping'].create({
+            'form_template_id': cls.form.id,
+        })
+        cls.Line = type(cls.env['admission.mapping.line'])
+
+    def _plan(self, *lines):
+        self.env['admission.mapping.line'].create([dict({
+            'mapping_id': self.mapping.id,
+            'question_text': line['question_code'],
+            'question_type': 'text',
+            'mapping_type': 'transform',
+            'status': 'validated',
+        }, **line) for line in lines])
+        return MappingPlan.from_mapping(self.mapping)
+
+    def _spy(self, method):
+        original = getattr(self.Line, method)
+        return patch.object(self.Line, method, autospec=True, side_effect=original)
+
+    def _column(self, pairs, code):
+        return [
+            [value for spec, value in response if spec.question_code == code]
+            for response in pairs
+        ]
+
+    def test_batch_line_runs_once_per_chunk(self):
+        plan = self._plan({
+            'question_code': 'G01Q01',
+            'transform_python': "results = [v.upper() for v in values]",
+            'batch_transform': True,
+        }, {
+            'question_code': 'G01Q02',
+            'transform_python': "result = value.strip()",
+        })
+        responses = [{'G01Q01': f'nom{n}', 'G01Q02': f' prenom{n} '} for n in range(3)]
+        responses.append({'G01Q02': ' seul '})
+
+        with self._spy('_run_batch_transform') as batch, self._spy('_run_transform') as scalar:
+            pairs = plan.iter_batch(self.env, responses)
+
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual(list(batch.call_args.args[2]), ['nom0', 'nom1', 'nom2'])
+        # Les extraits sans contrat par lot suivent le chemin valeur par valeur
+        self.assertEqual(scalar.call_count, 4)
+        self.assertEqual(self._column(pairs, 'G01Q01'), [['NOM0'], ['NOM1'], ['NOM2'], []])
+        self.assertEqual(self._column(pairs, 'G01Q02'), [['prenom0'], ['prenom1'], ['prenom2'], ['seul']])
+
+    def test_batch_line_applies_to_single_response(self):
+        plan = self._plan({
+            'question_code': 'G01Q01',
+            'transform_python': "results = [v[::-1] for v in values]",
+            'batch_transform': True,
+        })
+        self.assertEqual(
+            [value for _spec, value in plan.iter_values(self.env, {'G01Q01': 'abc'})],
+            ['cba'],
+        )
+
+    def test_batch_result_length_mismatch_drops_column(self):
+        plan = self._plan({
+            'question_code': 'G01Q01',
+            'transform_python': "results = values[:1]",
+            'batch_transform': True,
+        })
+        pairs = plan.iter_batch(self.env, [{'G01Q01': 'a'}, {'G01Q01': 'b'}])
+        self.assertEqual(pairs, [[], []])
+
+    @skipIf(numpy is None, "NumPy n'est pas installé")
+    def test_numeric_column_is_numpy_array(self):
+        plan = self._plan({
+            'question_code': 'G02Q01',
+            'question_type': 'numeric',
+            'transform_python': "results = values * 2",
+            'batch_transform': True,
+        })
+        with self._spy('_run_batch_transform') as batch:
+            pairs = plan.iter_batch(self.env, [{'G02Q01': '1.5'}, {'G02Q01': 4}])
+
+        self.assertIsInstance(batch.call_args.args[2], numpy.ndarray)
+        self.assertEqual(self._column(pairs, 'G02Q01'), [[3.0], [8.0]])
+
+    def test_unconvertible_numeric_column_is_list(self):
+        plan = self._plan({
+            'question_code': 'G02Q01',
+            'question_type': 'numeric',
+            'transform_python': "results = [type(values).__name__] * len(values)",
+            'batch_transform': True,
+        })
+        pairs = plan.iter_batch(self.env, [{'G02Q01': '2'}, {'G02Q01': 'deux'}])
+        self.assertEqual(self._column(pairs, 'G02Q01'), [['list'], ['list']])
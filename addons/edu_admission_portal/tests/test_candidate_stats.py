@@ -0,0 +1,87 @@
+from datetime import date
+
+from odoo.tests.common import tagged
+
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestCandidateStats(AdmissionCase):
+    """Vérifie la table de statistiques des candidatures et sa réconciliation."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.form = cls._create_form_template('920001')
+        cls.Stat = cls.env['admission.candidate.stat']
+
+    def _create(self, count, status='new', day='2024-03-10'):
+        return self.env['admission.candidate'].create([{
+            'form_id': self.form.id,
+            'status': status,
+            'submission_date': f'{day} 09:00:00',
+            'response_data': {
+                'G01Q02': f'Nom{n}',
+                'G01Q03': f'Prenom{n}',
+                'G03Q14': f'stat{status}{n}@example.com',
+            },
+        } for n in range(count)])
+
+    def _counts(self):
+        return {
+            (stat.day, stat.status): stat.candidate_count
+            for stat in self.Stat.search([('form_id', '=', self.form.id)])
+            if stat.candidate_count
+        }
+
+    def test_hooks_update_rollup(self):
+        """Création, changement de statut, archivage et suppression sont reportés."""
+        candidates = self._create(4)
+        self.assertEqual(self._counts(), {(date(2024, 3, 10), 'new'): 4})
+
+        candidates[:2].write({'status': 'complete'})
+        candidates[2].write({'submission_date': '2024-03-11 09:00:00'})
+        self.assertEqual(self._counts(), {
+            (date(2024, 3, 10), 'new'): 1,
+            (date(2024, 3, 10), 'complete'): 2,
+            (date(2024, 3, 11), 'new'): 1,
+        })
+
+        candidates[0].active = False
+        candidates[3].unlink()
+        self.assertEqual(self._counts(), {
+            (date(2024, 3, 10), 'complete'): 1,
+            (date(2024, 3, 11), 'new'): 1,
+        })
+
+    def test_cron_reconciles_drift(self):
+        """La réconciliation corrige les comptes faussés et supprime les lignes orphelines."""
+        self._create(3, status='accepted')
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE admission_candidate_stat SET candidate_count = 99 WHERE form_id = %s",
+            [self.form.id],
+        )
+        self.env.cr.execute("""
+            INSERT INTO admission_candidate_stat (day, form_id, status, candidate_count)
+            VALUES ('2020-01-01', %s, 'refused', 5)
+        """, [self.form.id])
+
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+        self.Stat._cron_refresh_stats()
+
+        self.assertEqual(self._counts(), {(date(2024, 3, 10), 'accepted'): 3})
+
+    def test_dashboard_counts_pending_statuses(self):
+        """Les candidats en attente sont comptés avec les statuts existants."""
+        dashboard = self.env['admission.dashboard'].browse(1)
+        pending_before = dashboard.pending_candidates
+
+        self._create(2, status='new')
+        self._create(1, status='invited')
+        self._create(1, status='refused')
+        self.env.flush_all()
+        dashboard.invalidate_recordset()
+
+        self.assertEqual(dashboard.pending_candidates, pending_before + 3)
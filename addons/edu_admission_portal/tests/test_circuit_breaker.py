@@ -0,0 +1,96 @@
+import xmlrpc.client
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from odoo import fields
+from odoo.tests.common import tagged
+
+from ..tools.limesurvey_client import (
+    LimeSurveyClient, LimeSurveyError, LimeSurveyTransportError, LimeSurveyUnavailable,
+)
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestCircuitBreaker(AdmissionCase):
+    """Vérifie le disjoncteur des serveurs LimeSurvey."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Breaker = cls.env['limesurvey.circuit.breaker']
+
+    def setUp(self):
+        super().setUp()
+        # Le disjoncteur écrit dans un curseur séparé
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+    def _breaker(self):
+        breaker = self.Breaker.search([('server_id', '=', self.server.id)])
+        breaker.invalidate_recordset()
+        return breaker
+
+    def test_open_circuit_short_circuits_calls(self):
+        """Au seuil d'échecs, plus aucune tentative de connexion n'est faite."""
+        with patch.object(self.ServerConfig, '_get_rpc_client',
+                          side_effect=LimeSurveyError("API injoignable")) as get_client:
+            for _attempt in range(5):
+                self.assertIsNone(self.server._get_rpc_session())
+
+        self.assertEqual(get_client.call_count, 3)
+        breaker = self._breaker()
+        self.assertEqual(breaker.state, 'open')
+        self.assertEqual(breaker.failure_count, 3)
+        self.assertGreater(breaker.next_probe_date, fields.Datetime.now())
+        self.assertIn('injoignable', self.server._get_unavailable_message())
+
+    def test_single_probe_then_recovery(self):
+        """Une fois la date de sonde passée, un seul appel sonde le serveur."""
+        for _attempt in range(3):
+            self.Breaker._record_failure(self.server.id, "délai dépassé")
+        self._breaker().next_probe_date = fields.Datetime.now() - timedelta(seconds=1)
+        self.env.flush_all()
+
+        self.assertEqual(self.Breaker._acquire(self.server.id), 'probe')
+        self.assertFalse(self.Breaker._acquire(self.server.id))
+        self.assertEqual(self._breaker().state, 'half_open')
+
+        client = MagicMock(unavailable=False)
+        with patch.object(self.ServerConfig, '_get_rpc_client', return_value=client):
+            self._breaker().next_probe_date = fields.Datetime.now() - timedelta(seconds=1)
+            self.env.flush_all()
+            self.assertIs(self.server._get_rpc_session(), client)
+
+        breaker = self._breaker()
+        self.assertEqual(breaker.state, 'closed')
+        self.assertEqual(breaker.failure_count, 0)
+
+    def test_backoff_grows_with_jitter(self):
+        delays = [self.Breaker._backoff_delay(attempt, 60, 3600) for attempt in range(8)]
+        for attempt, delay in enumerate(delays):
+            ceiling = min(3600, 60 * 2 ** attempt)
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+
+    def test_client_stops_calling_unreachable_server(self):
+        """Le client n'envoie plus de requête après trois échecs de transport."""
+        client = LimeSurveyClient('http://limesurvey.test/index.php/admin/remotecontrol', 'admin', 'admin')
+        proxy = MagicMock()
+        proxy.list_surveys.side_effect = LimeSurveyTransportError("Connection refused")
+        client.proxy = proxy
+
+        for _attempt in range(3):
+            with self.assertRaises(LimeSurveyTransportError):
+                client._call('list_surveys', 'key')
+        with self.assertRaises(LimeSurveyUnavailable):
+            client._call('list_surveys', 'key')
+        self.assertEqual(proxy.list_surveys.call_count, 3)
+
+        # Une erreur métier ne compte pas comme une indisponibilité
+        client.consecutive_failures = 0
+        proxy.list_surveys.side_effect = xmlrpc.client.Fault(1, 'Invalid survey ID')
+        for _attempt in range(5):
+            with self.assertRaises(xmlrpc.client.Fault):
+                client._call('list_surveys', 'key')
+        self.assertFalse(client.unavailable)
@@ -0,0 +1,85 @@
+from unittest.mock import Mock, patch
+
+from odoo.tests.common import tagged
+
+from ..models.admission_candidate import COMPLETENESS_CURSOR_CODE
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestCompletenessBatch(AdmissionCase):
+    """Vérifie la vérification par paquets de la complétude des dossiers."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.form = cls._create_form_template('950001')
+        Stage = cls.env['admission.candidate.stage']
+        Stage.create_default_stages(cls.form)
+        cls.stages = {
+            stage.code: stage
+            for stage in Stage.search([('form_template_id', '=', cls.form.id)])
+        }
+        cls.candidates = cls.env['admission.candidate'].create([{
+            'form_id': cls.form.id,
+            'submission_date': '2024-03-01 09:00:00',
+            'response_data': {
+                'G01Q02': f'Nom{n}',
+                'G01Q03': f'Prenom{n}',
+                'G03Q14': f'complet{n}@example.com',
+            },
+        } for n in range(4)])
+        cls.Mapping = type(cls.env['admission.form.mapping'])
+        cls.ICP = cls.env['ir.config_parameter'].sudo()
+        cls.Cursor = cls.env['admission.cron.cursor']
+        cls.Cursor._set_cursor(COMPLETENESS_CURSOR_CODE, min(cls.candidates.ids) - 1)
+
+    def test_batch_loads_plan_once_per_form(self):
+        """Le plan est chargé une fois pour tout le formulaire."""
+        self.candidates[0].action_move_to_stage(self.stages['pending_review'])
+        original = self.Mapping._get_mapping_plan
+        with patch.object(self.Mapping, '_get_mapping_plan', autospec=True,
+                          side_effect=original) as get_plan:
+            completed, failed = self.candidates._check_completeness_batch()
+
+        self.assertEqual(get_plan.call_count, 1)
+        self.assertEqual(completed, self.candidates)
+        self.assertFalse(failed)
+        self.assertEqual(set(self.candidates.mapped('status')), {'complete'})
+        # L'étape qui admet le statut est conservée, les autres candidats changent d'étape
+        self.assertEqual(self.candidates[0].stage_id, self.stages['pending_review'])
+        self.assertEqual(self.candidates[1:].stage_id, self.stages['complete'])
+        self.assertIn(
+            "complet automatiquement",
+            self.candidates[1].message_ids[0].body,
+        )
+
+    def test_missing_required_answer_keeps_candidate_new(self):
+        """Un dossier sans réponse à une question requise reste nouveau."""
+        self.candidates[2].response_data = dict(self.candidates[2].response_data, G05Q01='Oui')
+        plan = Mock(missing_required=lambda data: [] if (data or {}).get('G05Q01') else ['G05Q01'])
+        with patch.object(self.Mapping, '_get_mapping_plan', return_value=plan):
+            completed, _failed = self.candidates._check_completeness_batch()
+
+        self.assertEqual(completed, self.candidates[2])
+        self.assertEqual(set((self.candidates - completed).mapped('status')), {'new'})
+
+    def test_time_budget_resumes_from_cursor(self):
+        """Au-delà du budget, la vérification reprend au candidat suivant."""
+        self.ICP.set_param('edu_admission_portal.completeness_batch_size', 2)
+        self.ICP.set_param('edu_admission_portal.completeness_time_budget', 0)
+        Candidate = self.env['admission.candidate']
+
+        stats = Candidate._auto_check_completeness()
+        self.assertEqual(stats['checked'], 2)
+        self.assertFalse(stats['finished'])
+        self.assertEqual(self.Cursor._get_cursor(COMPLETENESS_CURSOR_CODE), self.candidates[1].id)
+        self.assertEqual(set(self.candidates[:2].mapped('status')), {'complete'})
+        self.assertEqual(set(self.candidates[2:].mapped('status')), {'new'})
+
+        Candidate._auto_check_completeness()
+        self.assertEqual(set(self.candidates.mapped('status')), {'complete'})
+
+        stats = Candidate._auto_check_completeness()
+        self.assertTrue(stats['finished'])
+        self.assertEqual(self.Cursor._get_cursor(COMPLETENESS_CURSOR_CODE), 0)
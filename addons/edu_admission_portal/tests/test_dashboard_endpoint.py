@@ -0,0 +1,53 @@
+from odoo.tests.common import HttpCase, tagged
+
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestDashboardEndpoint(HttpCase, AdmissionCase):
+    """Vérifie le point d'accès JSON du tableau de bord et ses réponses conditionnelles."""
+
+    URL = '/admission/dashboard/data?year=2024'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.form = cls._create_form_template('930001')
+
+    def _create_candidate(self, n):
+        self.env['admission.candidate'].create({
+            'form_id': self.form.id,
+            'submission_date': '2024-05-02 09:00:00',
+            'response_data': {
+                'G01Q02': f'Nom{n}',
+                'G01Q03': f'Prenom{n}',
+                'G03Q14': f'endpoint{n}@example.com',
+            },
+        })
+        # Simule la validation de la transaction : la version des statistiques change
+        self.env.cr.postcommit.run()
+
+    def test_etag_and_not_modified(self):
+        self._create_candidate(1)
+        self.authenticate('admin', 'admin')
+
+        response = self.url_open(self.URL)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        total = response.json()['kpis']['total_candidates']
+        self.assertGreaterEqual(total, 1)
+
+        response = self.url_open(self.URL, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        # Une nouvelle candidature invalide l'ETag
+        self._create_candidate(2)
+        response = self.url_open(self.URL, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.json()['kpis']['total_candidates'], total + 1)
+
+    def test_invalid_filter(self):
+        self.authenticate('admin', 'admin')
+        response = self.url_open('/admission/dashboard/data?academic_level=doctorat')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,62 @@
+from odoo.tests.common import tagged
+
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestDashboardStats(AdmissionCase):
+    """Vérifie le calcul des indicateurs du tableau de bord des candidats."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.forms = cls._create_form_template('910001') | cls._create_form_template('910002')
+        cls.Candidate = cls.env['admission.candidate']
+        cls.candidates = cls.Candidate.create([{
+            'form_id': cls.forms[n % 2].id,
+            'status': status,
+            'submission_date': f'2024-0{n % 3 + 1}-15 10:00:00',
+            'response_data': {
+                'G01Q02': f'Nom{n}',
+                'G01Q03': f'Prenom{n}',
+                'G03Q14': f'dashboard{n}@example.com',
+            },
+        } for n, status in enumerate(['new', 'new', 'complete', 'accepted', 'refused', 'invited'])])
+
+    def _dashboard(self):
+        domain = [('form_id', 'in', self.forms.ids)]
+        self.patch(type(self.Candidate), '_get_dashboard_domain', lambda self: domain)
+        return self.candidates[:3]
+
+    def test_single_query_for_all_computes(self):
+        """Indicateurs et séries proviennent d'une seule requête groupée."""
+        records = self._dashboard()
+        self.env.flush_all()
+        self.env.invalidate_all()
+
+        # Requête groupée, puis lecture des noms des formulaires
+        with self.assertQueryCount(2):
+            records.mapped('total_candidates')
+            records.mapped('status_distribution')
+            records.mapped('submission_timeline')
+            records.mapped('form_distribution')
+            records.mapped('academic_level_distribution')
+
+        record = records[0]
+        self.assertEqual(record.total_candidates, 6)
+        self.assertEqual(record.accepted_candidates, 1)
+        self.assertEqual(record.pending_candidates, 4)
+        self.assertEqual(record.refused_candidates, 1)
+        self.assertEqual(record.submission_timeline['labels'], ['2024-01', '2024-02', '2024-03'])
+        self.assertEqual(record.submission_timeline['datasets'][0]['data'], [2, 2, 2])
+        self.assertEqual(record.form_distribution['datasets'][0]['data'], [3, 3])
+
+    def test_write_invalidates_cached_stats(self):
+        """Une écriture sur un candidat rend les agrégats à nouveau exacts."""
+        records = self._dashboard()
+        self.assertEqual(records[0].accepted_candidates, 1)
+
+        self.candidates.filtered(lambda c: c.status == 'new').write({'status': 'accepted'})
+        records.invalidate_recordset(['accepted_candidates'])
+
+        self.assertEqual(records[0].accepted_candidates, 3)
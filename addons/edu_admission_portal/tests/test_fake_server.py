@@ -0,0 +1,97 @@
+from odoo.tests.common import tagged
+
+from ..tools.limesurvey_client import drop_client
+from .common import AdmissionCase
+from .fake_limesurvey import FakeLimeSurveyServer, FakeSurvey
+
+
+@tagged('post_install', '-at_install')
+class TestFakeServer(AdmissionCase):
+    """Synchronisation et import de bout en bout contre un serveur RemoteControl simulé."""
+
+    def setUp(self):
+        super().setUp()
+        # Le disjoncteur et la télémétrie écrivent dans un curseur séparé
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+    def _start(self, surveys, **options):
+        """Démarre le serveur simulé et y raccorde la configuration de test."""
+        fake = FakeLimeSurveyServer(surveys, **options).start()
+        self.addCleanup(fake.stop)
+        self.addCleanup(drop_client, self.server._get_rpc_client_key())
+        self.server.base_url = fake.base_url
+        return fake
+
+    def test_sync_forms(self):
+        """Les sondages sont créés, puis non retéléchargés s'ils n'ont pas changé."""
+        inactive = FakeSurvey(800003, active=False)
+        fake = self._start([
+            FakeSurvey(800001, groups=2, questions_per_group=4),
+            FakeSurvey(800002, languages=('fr', 'en'), responses=5),
+            inactive,
+        ], latency=0.005)
+
+        result = self.server.action_sync_forms()
+        self.assertEqual(result['params']['type'], 'success')
+
+        templates = self.env['admission.form.template'].search([
+            ('server_config_id', '=', self.server.id),
+        ])
+        self.assertEqual(sorted(templates.mapped('sid')), ['800001', '800002', '800003'])
+        self.assertEqual(
+            templates.filtered(lambda t: t.sid == '800003').is_active, False,
+        )
+        self.assertIn('xmlrpc', fake.requests)
+        run = self.env['limesurvey.sync.run'].search([('server_id', '=', self.server.id)])
+        self.assertEqual(run.state, 'success')
+        self.assertGreater(run.call_count, 0)
+
+        # Sondages actifs inchangés : seule la structure du sondage inactif est redemandée
+        questions_before = fake.call_count('list_questions')
+        self.server.action_sync_forms()
+        self.assertEqual(fake.call_count('list_questions'), questions_before + len(inactive.groups))
+
+    def test_import_responses(self):
+        """Les réponses exportées en flux par le serveur deviennent des candidats."""
+        fake = self._start([FakeSurvey(800010, responses=25, answers={
+            'G01Q02': 'Nom{id}',
+            'G01Q03': 'Prenom{id}',
+            'G03Q04': 'candidat{id}@example.com',
+        })])
+        form = self._create_form_template('800010')
+        self._create_validated_mapping(form, (
+            ('G01Q02', 'last_name'),
+            ('G01Q03', 'first_name'),
+            ('G03Q04', 'email'),
+        ))
+
+        form.action_import_responses()
+        self.env['admission.import.batch']._cron_process_import_batches()
+
+        self.assertEqual(form.candidate_count, 25)
+        self.assertIn('export_responses', fake.calls)
+
+    def test_server_errors_open_the_circuit(self):
+        """Des erreurs HTTP 500 répétées ouvrent le disjoncteur du serveur."""
+        fake = self._start([FakeSurvey(800020)])
+        fake.inject_fault('get_session_key', 'http_500', times=None)
+
+        for _attempt in range(5):
+            self.assertIsNone(self.server._get_rpc_session())
+
+        self.assertEqual(fake.call_count('get_session_key'), 3)
+        self.server.invalidate_recordset(['circuit_state'])
+        self.assertEqual(self.server.circuit_state, 'open')
+
+    def test_expired_session_is_renewed(self):
+        """Une clé de session expirée côté serveur est renouvelée une fois."""
+        fake = self._start([FakeSurvey(800030)])
+        client = self.server._get_rpc_session()
+        client.session_key
+        fake.expire_sessions()
+
+        surveys = client.call('list_surveys')
+
+        self.assertEqual([survey['sid'] for survey in surveys], ['800030'])
+        self.assertEqual(fake.call_count('get_session_key'), 2)
@@ -0,0 +1,223 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from odoo.tests.common import tagged
+
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestImportQueries(AdmissionCase):
+    """Vérifie que l'import des réponses est ensembliste."""
+
+    def _create_form(self, sid):
+        """Crée un formulaire avec un mapping validé nom / prénom / email."""
+        form = self._create_form_template(sid)
+        self._create_validated_mapping(form, (
+            ('G01Q02', 'last_name'),
+            ('G01Q03', 'first_name'),
+            ('G03Q14', 'email'),
+        ))
+        return form
+
+    def _make_responses(self, count, with_files=False):
+        responses = []
+        for n in range(count):
+            response = {
+                'id': str(n + 1),
+                'submitdate': '2024-01-01 10:00:00',
+                'answers': {
+                    'G01Q02': f'Nom{n}',
+                    'G01Q03': f'Prenom{n}',
+                    'G03Q14': f'candidat{n}@example.com',
+                },
+            }
+            if with_files:
+                response['files'] = [{
+                    'name': f'bac_{n}.pdf',
+                    'content': 'JVBERi0xLjQK',
+                    'type': 'application/pdf',
+                }]
+            responses.append(response)
+        return responses
+
+    @contextmanager
+    def _patch_export(self, responses):
+        """Simule l'export en flux des réponses, sans statistiques de sondage."""
+        def iter_survey_responses(sid, from_response_id=None, to_response_id=None, completion_status='complete'):
+            return iter(responses)
+
+        with patch.object(self.ServerConfig, 'iter_survey_responses', side_effect=iter_survey_responses) as export, \
+                patch.object(self.ServerConfig, '_get_survey_summary', return_value={}):
+            yield export
+
+    def _import(self, form, responses):
+        """Importe les réponses et retourne le nombre de requêtes SQL exécutées."""
+        self.env.flush_all()
+        with self._patch_export(responses):
+            start = self.env.cr.sql_log_count
+            form.action_import_responses()
+            self.env['admission.import.batch']._cron_process_import_batches()
+            self.env.flush_all()
+            return self.env.cr.sql_log_count - start
+
+    def test_queries_per_candidate(self):
+        """Le coût marginal d'un candidat importé reste de l'ordre d'une requête."""
+        small_form = self._create_form('900001')
+        large_form = self._create_form('900002')
+
+        small = self._import(small_form, self._make_responses(10))
+        large = self._import(large_form, self._make_responses(60))
+
+        self.assertEqual(small_form.candidate_count, 10)
+        self.assertEqual(large_form.candidate_count, 60)
+
+        # L'ancien import coûtait plus de 20 requêtes par candidat
+        per_candidate = (large - small) / 50
+        self.assertLessEqual(per_candidate, 2, f"{per_candidate:.1f} requêtes par candidat")
+
+    def test_reimport_is_incremental(self):
+        """Une nouvelle synchronisation ne demande que les réponses plus récentes."""
+        form = self._create_form('900003')
+        responses = self._make_responses(30)
+        self._import(form, responses)
+        self.assertEqual(form.last_response_id, 30)
+        first_batch = form.candidate_ids.import_batch_id
+
+        with self._patch_export(responses) as export:
+            form.action_import_responses()
+            self.env['admission.import.batch']._cron_process_import_batches()
+        self.assertEqual(export.call_args.kwargs['from_response_id'], 31)
+
+        self.assertEqual(form.candidate_count, 30)
+        batch = self.env['admission.import.batch'].search([
+            ('form_template_id', '=', form.id),
+            ('id', 'not in', first_batch.ids),
+        ])
+        self.assertEqual(batch.state, 'done')
+        self.assertEqual(batch.imported_count, 0)
+
+    def test_resume_from_cursor(self):
+        """Un lot interrompu reprend après la dernière réponse traitée."""
+        form = self._create_form('900005')
+        responses = self._make_responses(12)
+        self.env['ir.config_parameter'].sudo().set_param('edu_admission_portal.import_chunk_size', 5)
+
+        batch = self.env['admission.import.batch'].create({
+            'form_template_id': form.id,
+            'start_date': '2024-01-01 10:00:00',
+            'state': 'running',
+            'cursor_response_id': 5,
+            'processed_count': 5,
+        })
+        with self._patch_export(responses):
+            self.env['admission.import.batch']._cron_process_import_batches()
+
+        self.assertEqual(batch.state, 'done')
+        self.assertEqual(batch.cursor_response_id, 12)
+        self.assertEqual(batch.processed_count, 12)
+        self.assertEqual(batch.total_count, 12)
+        self.assertEqual(
+            sorted(form.candidate_ids.mapped('response_id'), key=int),
+            [str(n) for n in range(6, 13)],
+        )
+
+    def test_cursor_stops_before_failed_response(self):
+        """Le curseur et le point de reprise ne dépassent pas une réponse en erreur."""
+        form = self._create_form('900006')
+        responses = self._make_responses(12)
+        responses[2]['answers'] = {}
+        self.env['ir.config_parameter'].sudo().set_param('edu_admission_portal.import_chunk_size', 5)
+
+        self._import(form, responses)
+        batch = form.candidate_ids.import_batch_id
+
+        self.assertEqual(batch.state, 'partial')
+        self.assertEqual(batch.error_count, 1)
+        self.assertEqual(batch.cursor_response_id, 2)
+        self.assertEqual(form.last_response_id, 2)
+        self.assertEqual(form.candidate_count, 11)
+
+        # Une fois la réponse corrigée, la reprise l'importe
+        responses[2]['answers'] = self._make_responses(3)[2]['answers']
+        with self._patch_export(responses):
+            batch.action_resume()
+            self.env['admission.import.batch']._cron_process_import_batches()
+
+        self.assertEqual(batch.state, 'done')
+        self.assertEqual(batch.cursor_response_id, 12)
+        self.assertEqual(form.last_response_id, 12)
+        self.assertEqual(form.candidate_count, 12)
+        # Les réponses relues à la reprise ne sont pas recomptées
+        self.assertEqual(batch.processed_count, 12)
+        self.assertEqual(batch.skipped_count, 0)
+        self.assertFalse(self.env['admission.import.failure'].search([('form_template_id', '=', form.id)]))
+
+    def test_invalid_response_is_abandoned_after_max_attempts(self):
+        """Une réponse toujours invalide finit abandonnée et ne retient plus le curseur."""
+        form = self._create_form('900007')
+        responses = self._make_responses(6)
+        responses[1]['answers'] = {}
+        self.env['ir.config_parameter'].sudo().set_param('edu_admission_portal.import_max_attempts', 2)
+
+        self._import(form, responses)
+        batch = form.candidate_ids.import_batch_id
+        failure = self.env['admission.import.failure'].search([('form_template_id', '=', form.id)])
+        self.assertEqual((failure.response_id, failure.attempt_count, failure.state), ('2', 1, 'retry'))
+        self.assertEqual(batch.cursor_response_id, 1)
+
+        with self._patch_export(responses):
+            batch.action_resume()
+            self.env['admission.import.batch']._cron_process_import_batches()
+        self.assertEqual((failure.attempt_count, failure.state), (2, 'dead'))
+        self.assertEqual(batch.cursor_response_id, 6)
+        self.assertEqual(form.last_response_id, 6)
+        self.assertEqual(batch.processed_count, 6)
+
+        # Les imports suivants ne la redemandent plus
+        responses.append(self._make_responses(7)[6])
+        with self._patch_export(responses) as export:
+            form.action_import_responses()
+            self.env['admission.import.batch']._cron_process_import_batches()
+        self.assertEqual(export.call_args.kwargs['from_response_id'], 7)
+        self.assertEqual(form.candidate_count, 6)
+        self.assertEqual(failure.attempt_count, 2)
+
+    def test_response_completed_later_is_imported(self):
+        """Une réponse terminée après des réponses d'ID supérieur est importée au lot suivant."""
+        form = self._create_form('900008')
+        responses = self._make_responses(5)
+        responses[1]['submitdate'] = None
+
+        self._import(form, responses)
+        batch = form.candidate_ids.import_batch_id
+        self.assertEqual(form.candidate_count, 4)
+        self.assertEqual(form.last_response_id, 5)
+        self.assertEqual(form.first_incomplete_response_id, 2)
+        self.assertEqual(batch.processed_count, 4)
+
+        # La réponse 2 est terminée après la 5 : le lot suivant repart d'elle
+        responses[1]['submitdate'] = '2024-01-02 09:00:00'
+        with self._patch_export(responses) as export:
+            form.action_import_responses()
+            self.env['admission.import.batch']._cron_process_import_batches()
+        self.assertEqual(export.call_args.kwargs['from_response_id'], 2)
+        self.assertEqual(export.call_args.kwargs['completion_status'], 'all')
+        self.assertEqual(form.candidate_count, 5)
+        self.assertEqual(form.first_incomplete_response_id, 0)
+
+        with self._patch_export(responses) as export:
+            form.action_import_responses()
+            self.env['admission.import.batch']._cron_process_import_batches()
+        self.assertEqual(export.call_args.kwargs['from_response_id'], 6)
+
+    def test_attachments_created_in_bulk(self):
+        """Les pièces jointes d'un paquet sont créées et rattachées aux candidats."""
+        form = self._create_form('900004')
+        self._import(form, self._make_responses(5, with_files=True))
+
+        candidates = form.candidate_ids
+        self.assertEqual(len(candidates), 5)
+        for candidate in candidates:
+            self.assertEqual(len(candidate.attachment_ids), 1)
+            self.assertEqual(candidate.attachment_ids.res_id, candidate.id)
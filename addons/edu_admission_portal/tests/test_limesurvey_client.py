@@ -0,0 +1,206 @@
+import base64
+import json
+import xmlrpc.client
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase, tagged
+
+from ..tools.export_stream import iter_text_chunks
+from ..tools.limesurvey_client import LimeSurveyClient, LimeSurveyError
+
+
+class FakeRemoteControl:
+    """Serveur RemoteControl simulé au niveau des appels RPC bruts."""
+
+    def __init__(self, multicall=True):
+        self.multicall = multicall
+        self.requests = []
+        self.dispatched = []
+        self.keys = 0
+
+    def __call__(self, method, *params):
+        self.requests.append(method)
+        if method == 'get_session_key':
+            self.keys += 1
+            return f'key-{self.keys}'
+        if method == 'release_session_key':
+            return 'OK'
+        if method == 'system.multicall':
+            if not self.multicall:
+                raise xmlrpc.client.Fault(-32601, 'Method not found')
+            results = []
+            for call in params[0]:
+                try:
+                    results.append([self.dispatch(call['methodName'], *call['params'])])
+                except xmlrpc.client.Fault as e:
+                    results.append({'faultCode': e.faultCode, 'faultString': e.faultString})
+            return results
+        return self.dispatch(method, *params)
+
+    def dispatch(self, method, session_key, *params):
+        self.dispatched.append(method)
+        if session_key == 'key-1' and method == 'list_questions' and params[1] == 99:
+            return {'status': 'Invalid session key'}
+        if method == 'list_questions':
+            if params[1] == 13:
+                raise xmlrpc.client.Fault(1, 'Invalid group ID')
+            return [{'qid': params[1] * 10, 'title': f'G{params[1]}Q1'}]
+        if method == 'get_language_properties':
+            return {'surveyls_title': f'Titre {params[1]}'}
+        if method == 'get_survey_languages':
+            return ['fr', 'en']
+        if method == 'list_groups':
+            return [{'gid': 1, 'group_name': 'Identité'}, {'gid': 2, 'group_name': 'Parcours'}]
+        if method == 'get_summary':
+            return {'completed_responses': '12', 'incomplete_responses': '3', 'full_responses': '15'}
+        if method == 'get_survey_properties':
+            return {'active': 'Y'}
+        raise xmlrpc.client.Fault(-32601, 'Method not found')
+
+
+@tagged('post_install', '-at_install')
+class TestLimeSurveyClient(TransactionCase):
+    """Vérifie le regroupement des appels RPC du client LimeSurvey."""
+
+    def _client(self, fake):
+        client = LimeSurveyClient('http://limesurvey.test/index.php/admin/remotecontrol', 'admin', 'admin')
+        patcher = patch.object(client, '_call', side_effect=fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return client
+
+    def _structure_calls(self):
+        """Appels d'un sondage de 15 groupes et 3 langues."""
+        return (
+            [('get_language_properties', [123456, lang]) for lang in ('fr', 'en', 'de')]
+            + [('list_questions', [123456, gid]) for gid in range(1, 16)]
+        )
+
+    def test_multicall_single_round_trip(self):
+        fake = FakeRemoteControl()
+        client = self._client(fake)
+
+        results = client.multicall(self._structure_calls())
+
+        self.assertEqual(len(results), 18)
+        self.assertEqual(results[0], {'surveyls_title': 'Titre fr'})
+        self.assertIsInstance(results[3 + 12], xmlrpc.client.Fault)
+        self.assertEqual(fake.requests, ['get_session_key', 'system.multicall'])
+        self.assertTrue(client.multicall_supported)
+
+    def test_fallback_without_multicall(self):
+        fake = FakeRemoteControl(multicall=False)
+        client = self._client(fake)
+
+        results = client.multicall(self._structure_calls())
+
+        self.assertFalse(client.multicall_supported)
+        self.assertEqual(results[4], [{'qid': 20, 'title': 'G2Q1'}])
+        self.assertIsInstance(results[3 + 12], xmlrpc.client.Fault)
+        # Le support n'est sondé qu'une fois
+        client.multicall(self._structure_calls())
+        self.assertEqual(fake.requests.count('system.multicall'), 1)
+
+    def test_multicall_renews_rejected_session(self):
+        fake = FakeRemoteControl()
+        client = self._client(fake)
+
+        results = client.multicall([('list_questions', [123456, 99])])
+
+        self.assertEqual(results, [[{'qid': 990, 'title': 'G99Q1'}]])
+        self.assertEqual(fake.keys, 2)
+
+    def test_tls_verification_by_default(self):
+        """Le certificat du serveur est vérifié sauf désactivation explicite."""
+        url = 'https://limesurvey.test/index.php/admin/remotecontrol'
+        self.assertTrue(LimeSurveyClient(url, 'admin', 'admin').http.verify)
+        self.assertFalse(LimeSurveyClient(url, 'admin', 'admin', verify=False).http.verify)
+
+    def test_discovery_refresh_keeps_session(self):
+        """Une nouvelle découverte change l'URL sans fermer la session."""
+        fake = FakeRemoteControl()
+        client = self._client(fake)
+        client.multicall([('get_survey_properties', [123456])])
+
+        self.assertFalse(client.claim_discovery(3600))
+        self.assertTrue(client.claim_discovery(0))
+        client.set_api_url('http://limesurvey.test/admin/remotecontrol')
+
+        self.assertEqual(client.transport._url, 'http://limesurvey.test/admin/remotecontrol')
+        client.multicall([('get_survey_properties', [123456])])
+        self.assertEqual(fake.keys, 1)
+        self.assertNotIn('release_session_key', fake.requests)
+
+    def test_properties_use_summary_instead_of_export(self):
+        """Le nombre de réponses provient de get_summary, sans export."""
+        fake = FakeRemoteControl()
+        client = self._client(fake)
+
+        properties = self.env['limesurvey.server.config']._fetch_survey_properties(
+            client, '123456', surveys=[],
+        )
+
+        self.assertEqual(properties['response_count'], 12)
+        self.assertEqual(properties['incomplete_response_count'], 3)
+        self.assertEqual(len(properties['questions']), 2)
+        self.assertNotIn('export_responses', fake.requests)
+        self.assertNotIn('export_responses', fake.dispatched)
+
+    def test_export_is_decoded_as_a_stream(self):
+        """Les réponses d'un export base64 sont rendues une à une."""
+        client = self._client(FakeRemoteControl())
+        document = json.dumps({'responses': [
+            {str(n): {'id': n, 'submitdate': '2024-01-01 10:00:00', 'G01Q02': 'é' * n}}
+            for n in range(1, 51)
+        ]})
+        payload = base64.b64encode(document.encode('utf-8')).decode('ascii')
+        empty = ({'status': 'No Response found'}, None)
+
+        with patch.object(client, '_stream', side_effect=[
+            (None, iter_text_chunks(payload, 97)), empty, empty,
+        ]) as stream:
+            responses = self.env['limesurvey.server.config']._iter_survey_responses(
+                client, '123456', 1000, from_response_id=1,
+            )
+            first = next(responses)
+            self.assertEqual(first['id'], '1')
+            self.assertEqual(stream.call_count, 1)
+            rest = list(responses)
+
+        self.assertEqual(len(rest), 49)
+        self.assertEqual(rest[-1]['answers']['G01Q02'], 'é' * 50)
+        # Page suivante vide, puis dernière demande sans borne haute
+        self.assertEqual(stream.call_args_list[1].args[-2:], (1001, 2000))
+        self.assertEqual(stream.call_args_list[2].args[-2:], (1001, None))
+
+    def test_legacy_export_is_read_once(self):
+        """Sans plage d'ID côté serveur, le sondage est exporté une seule fois et non à chaque page."""
+        client = self._client(FakeRemoteControl())
+        document = json.dumps({'responses': [
+            {str(n): {'id': n, 'submitdate': '2024-01-01 10:00:00'}} for n in range(1, 26)
+        ]})
+        payload = base64.b64encode(document.encode('utf-8')).decode('ascii')
+        signature = xmlrpc.client.Fault(-32601, 'Calling parameters do not match signature')
+
+        with patch.object(client, '_stream', side_effect=[
+            signature, (None, iter_text_chunks(payload, 97)),
+        ]) as stream:
+            responses = list(self.env['limesurvey.server.config']._iter_survey_responses(
+                client, '123456', 5, from_response_id=4, to_response_id=20,
+            ))
+
+        self.assertEqual([r['id'] for r in responses], [str(n) for n in range(4, 21)])
+        # Un appel refusé avec plage, puis un seul export complet
+        self.assertEqual(stream.call_count, 2)
+
+    def test_refused_export_is_an_error(self):
+        """Seul « No Response found » est une plage vide ; les autres statuts lèvent une erreur."""
+        client = self._client(FakeRemoteControl())
+        ServerConfig = self.env['limesurvey.server.config']
+        with patch.object(client, '_stream', return_value=({'status': 'No Response found'}, None)):
+            self.assertEqual(list(ServerConfig._iter_export_responses(client, '123456', 1, 10)), [])
+        for value in ({'status': 'No permission'}, 'Invalid survey ID'):
+            with self.subTest(value=value), \
+                    patch.object(client, '_stream', return_value=(value, None)), \
+                    self.assertRaises(LimeSurveyError):
+                list(ServerConfig._iter_export_responses(client, '123456', 1, 10))
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+from odoo.tests.common import tagged
+
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestMappingReconcile(AdmissionCase):
+    """Vérifie la réconciliation des lignes de mapping lors d'une resynchronisation."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.form = cls._create_form_template('740001')
+        cls.Line = type(cls.env['admission.mapping.line'])
+
+    def _questions(self, count=200):
+        return [{
+            'qid': str(1000 + n),
+            'title': f'G{n // 20 + 1:02d}Q{n:03d}',
+            'question': f'<p>Question {n}</p>',
+            'type': 'T',
+            'mandatory': 'Y' if n % 2 else 'N',
+            'group_name': f'Groupe {n // 20 + 1}',
+        } for n in range(count)]
+
+    def _spy(self, method):
+        original = getattr(self.Line, method)
+        return patch.object(self.Line, method, autospec=True, side_effect=original)
+
+    def test_initial_sync_creates_lines_in_one_batch(self):
+        with self._spy('create') as create:
+            mapping = self.form._create_default_mappings(self._questions())
+
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(len(mapping.mapping_line_ids), 200)
+        line = mapping.mapping_line_ids.filtered(lambda l: l.question_qid == '1001')
+        self.assertEqual(line.question_text, 'Question 1')
+        self.assertTrue(line.is_required)
+
+    def test_resync_without_change_writes_nothing(self):
+        mapping = self.form._create_default_mappings(self._questions())
+
+        with self._spy('create') as create, self._spy('write') as write, \
+                self._spy('unlink') as unlink:
+            again = self.form._create_default_mappings(self._questions())
+
+        self.assertEqual(again, mapping)
+        self.assertFalse(create.called or write.called or unlink.called)
+        self.assertEqual(
+            self.env['admission.form.mapping'].search_count([('form_template_id', '=', self.form.id)]),
+            1,
+        )
+
+    def test_resync_applies_diff_and_keeps_operator_work(self):
+        mapping = self.form._create_default_mappings(self._questions())
+        lines = {line.question_qid: line for line in mapping.mapping_line_ids}
+        lines['1000'].write({'odoo_field': 'last_name', 'status': 'validated'})
+        lines['1001'].write({'odoo_field': 'first_name'})
+        lines['1002'].write({'odoo_field': 'email', 'status': 'validated'})
+
+        questions = self._questions()
+        questions[0]['question'] = 'Nom de naissance'
+        questions[1]['title'] = 'PRENOM'
+        questions[1]['question'] = 'Prénom usuel'
+        del questions[2]
+        del questions[3]
+        questions.append({'qid': '9999', 'title': 'NOUVEAU', 'question': 'Nouvelle question', 'type': 'N'})
+
+        with self._spy('create') as create:
+            self.form._create_default_mappings(questions)
+
+        self.assertEqual(create.call_count, 1)
+        by_qid = {line.question_qid: line for line in mapping.mapping_line_ids}
+        # Ligne validée : ni modifiée, ni supprimée même si sa question a disparu
+        self.assertEqual(by_qid['1000'].question_text, 'Question 0')
+        self.assertEqual(by_qid['1002'], lines['1002'])
+        # Ligne en brouillon renommée : retrouvée par qid, choix de l'opérateur conservé
+        self.assertEqual(by_qid['1001'], lines['1001'])
+        self.assertEqual(by_qid['1001'].question_code, 'PRENOM')
+        self.assertEqual(by_qid['1001'].odoo_field, 'first_name')
+        # Question supprimée : ligne en brouillon supprimée ; nouvelle question ajoutée
+        self.assertNotIn('1004', by_qid)
+        self.assertEqual(by_qid['9999'].question_type, 'numeric')
+        self.assertEqual(by_qid['9999'].status, 'draft')
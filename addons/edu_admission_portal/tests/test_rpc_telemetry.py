@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from odoo.tests.common import tagged
+
+from ..tools.limesurvey_client import (
+    LimeSurveyClient, drop_client, get_client, operation_scope, submit_in_context,
+)
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestRpcTelemetry(AdmissionCase):
+    """Vérifie l'agrégation de la télémétrie des appels RPC par exécution."""
+
+    def _client(self):
+        """Client partagé du serveur, dont chaque appel échange 100 / 1000 octets."""
+        client = LimeSurveyClient('http://limesurvey.test/index.php/admin/remotecontrol', 'admin', 'admin')
+
+        def answer(value):
+            def method(*params):
+                client.transport._count(sent=100, received=1000)
+                return value
+            return method
+
+        client.proxy = MagicMock()
+        client.proxy.get_session_key.side_effect = answer('key-1')
+        client.proxy.list_questions.side_effect = answer([{'qid': 1, 'title': 'G01Q01'}])
+        client.proxy.get_summary.side_effect = answer({'completed_responses': '3'})
+        key = self.server._get_rpc_client_key()
+        self.addCleanup(drop_client, key)
+        return get_client(key, 'test', lambda: client)
+
+    def test_run_records_slowest_methods_and_surveys(self):
+        client = self._client()
+
+        with self.server._rpc_telemetry('sync_forms'):
+            for gid in (1, 2, 3):
+                client.call('list_questions', 123456, gid)
+            client.call('get_summary', '654321', 'all')
+
+        run = self.env['limesurvey.sync.run'].search([('server_id', '=', self.server.id)])
+        self.assertEqual(len(run), 1)
+        self.assertEqual(run.state, 'success')
+        self.assertEqual(run.call_count, 5)
+        self.assertEqual(run.bytes_received, 5000)
+
+        methods = {stat.key: stat for stat in run.method_stat_ids}
+        self.assertEqual(methods['list_questions'].call_count, 3)
+        self.assertEqual(methods['list_questions'].bytes_sent, 300)
+        self.assertIn('get_session_key', methods)
+
+        surveys = {stat.key: stat for stat in run.survey_stat_ids}
+        self.assertEqual(surveys['123456'].call_count, 3)
+        self.assertEqual(surveys['654321'].call_count, 1)
+        self.assertEqual(len(surveys), 3)
+
+    def test_calls_outside_a_run_are_not_recorded(self):
+        client = self._client()
+        client.call('list_questions', 123456, 1)
+
+        with self.server._rpc_telemetry('import') as telemetry:
+            telemetry.outcome = 'partial'
+
+        run = self.env['limesurvey.sync.run'].search([('server_id', '=', self.server.id)])
+        self.assertEqual(run.state, 'partial')
+        self.assertEqual(run.call_count, 0)
+
+    def test_concurrent_operations_are_isolated(self):
+        """Un run ne compte ni les appels d'une autre opération ni ceux hors opération."""
+        client = self._client()
+
+        def other_operation():
+            with operation_scope(object()):
+                client.call('list_questions', 123456, 8)
+            client.call('list_questions', 123456, 9)
+
+        with self.server._rpc_telemetry('sync_forms'):
+            client.call('list_questions', 123456, 1)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Thread du run : le contexte de l'opération est propagé
+                submit_in_context(executor, client.call, 'list_questions', 123456, 2).result()
+                # Thread étranger au run
+                executor.submit(other_operation).result()
+
+        run = self.env['limesurvey.sync.run'].search([('server_id', '=', self.server.id)])
+        methods = {stat.key: stat for stat in run.method_stat_ids}
+        self.assertEqual(methods['list_questions'].call_count, 2)
+        self.assertEqual(run.call_count, 3)
@@ -0,0 +1,76 @@
+from odoo.tests.common import TransactionCase, tagged
+
+from ..tools.snippet_sandbox import MODE_BATCH, MODE_TRANSFORM, MODE_VALIDATE, SnippetSandbox
+
+
+@tagged('post_install', '-at_install')
+class TestSnippetSandbox(TransactionCase):
+    """Vérifie l'exécution isolée des extraits de mapping."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sandbox = SnippetSandbox(processes=2, call_timeout=0.2, batch_timeout=2.0)
+        cls.addClassCleanup(cls.sandbox.close)
+
+    def test_modes(self):
+        # Assez de valeurs pour être réparties sur les deux processus
+        outcomes = self.sandbox.run("result = value * 2", MODE_TRANSFORM, range(100))
+        self.assertEqual(outcomes, [(True, n * 2) for n in range(100)])
+        self.assertEqual(
+            self.sandbox.run("results = [v + 1 for v in values]", MODE_BATCH, [1, 2]),
+            [(True, 2), (True, 3)],
+        )
+        self.assertEqual(
+            self.sandbox.run("result = value > 1", MODE_VALIDATE, [1, 2]),
+            [(True, False), (True, True)],
+        )
+
+    def test_cpu_timeout_is_per_value(self):
+        outcomes = self.sandbox.run(
+            "while value:\n    pass\nresult = value", MODE_TRANSFORM, [1, 0],
+        )
+        self.assertFalse(outcomes[0][0])
+        self.assertIn("Délai CPU", outcomes[0][1])
+        self.assertEqual(outcomes[1], (True, 0))
+
+    def test_unpicklable_result_is_an_error_outcome(self):
+        outcomes = self.sandbox.run("result = (v for v in [value])", MODE_TRANSFORM, [1, 2])
+        self.assertEqual([ok for ok, _message in outcomes], [False, False])
+        self.assertIn("inexploitable", outcomes[0][1])
+        # Le pool reste utilisable
+        self.assertEqual(self.sandbox.run("result = value", MODE_TRANSFORM, [3]), [(True, 3)])
+
+    def test_introspection_is_refused(self):
+        for source in (
+            "result = ().__class__.__base__.__subclasses__()",
+            "def g():\n    yield gen.gi_frame.f_back\ngen = g()\nresult = next(gen)",
+            "result = __builtins__",
+            "import os\nresult = os.getpid()",
+        ):
+            with self.subTest(source=source):
+                (ok, _message), = self.sandbox.run(source, MODE_TRANSFORM, [1])
+                self.assertFalse(ok)
+
+    def test_modules_do_not_lead_to_other_modules(self):
+        """Les espaces de noms exposés ne donnent accès ni aux fichiers ni au processus."""
+        for source in (
+            "result = json.codecs.open('/etc/hostname').read()",
+            "result = re.enum.sys.modules['os'].getpid()",
+            "result = datetime.sys.modules['os'].getpid()",
+            "re.match = len\nresult = re.match('a', value)",
+            "import _strptime\nresult = _strptime.time",
+        ):
+            with self.subTest(source=source):
+                (ok, _message), = self.sandbox.run(source, MODE_TRANSFORM, ['a'])
+                self.assertFalse(ok)
+
+    def test_exposed_functions(self):
+        source = (
+            "day = datetime.datetime.strptime(value, '%d/%m/%Y').date()\n"
+            "result = (day.isoformat(), re.sub(r'/', '-', value), json.dumps(math.floor(2.5)))"
+        )
+        self.assertEqual(
+            self.sandbox.run(source, MODE_TRANSFORM, ['02/01/2024']),
+            [(True, ('2024-01-02', '02-01-2024', '2'))],
+        )
@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+from odoo.tests.common import tagged
+
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestStageTransitions(AdmissionCase):
+    """Vérifie l'historique des changements d'étape et l'entonnoir qui en découle."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.form = cls._create_form_template('940001')
+        Stage = cls.env['admission.candidate.stage']
+        Stage.create_default_stages(cls.form)
+        cls.stages = {
+            stage.code: stage
+            for stage in Stage.search([('form_template_id', '=', cls.form.id)])
+        }
+        cls.candidates = cls.env['admission.candidate'].create([{
+            'form_id': cls.form.id,
+            'submission_date': '2024-02-01 09:00:00',
+            'response_data': {
+                'G01Q02': f'Nom{n}',
+                'G01Q03': f'Prenom{n}',
+                'G03Q14': f'transition{n}@example.com',
+            },
+        } for n in range(4)])
+        cls.Transition = cls.env['admission.stage.transition']
+
+    def _transitions(self, stage):
+        return self.Transition.search([
+            ('candidate_id', 'in', self.candidates.ids),
+            ('to_stage_id', '=', stage.id),
+        ])
+
+    def test_mass_move_logs_transitions_in_bulk(self):
+        """Un déplacement de masse journalise chaque candidat en une insertion."""
+        entries = self._transitions(self.stages['new'])
+        self.assertEqual(len(entries), 4)
+        self.assertFalse(entries.from_stage_id)
+        self.assertEqual(entries.campaign, 2024)
+
+        Transition = type(self.Transition)
+        with patch.object(Transition, '_log_transitions', autospec=True,
+                          side_effect=Transition._log_transitions) as log:
+            self.candidates.action_move_to_stage(self.stages['complete'])
+        self.assertEqual(log.call_count, 1)
+
+        moves = self._transitions(self.stages['complete'])
+        self.assertEqual(len(moves), 4)
+        self.assertEqual(moves.from_stage_id, self.stages['new'])
+        self.assertEqual(moves.user_id, self.env.user)
+        self.assertEqual(set(self.candidates.mapped('status')), {'complete'})
+
+    def test_funnel_conversion_and_dwell_time(self):
+        """L'entonnoir donne la conversion par étape et la durée passée dans chacune."""
+        self.candidates[:2].action_move_to_stage(self.stages['complete'])
+        self.candidates[:1].action_move_to_stage(self.stages['under_review'])
+        self.env.flush_all()
+        # Séjours en « new » de 10 h et 30 h
+        self.env.cr.execute("""
+            UPDATE admission_stage_transition
+               SET date = date - make_interval(hours => CASE candidate_id WHEN %s THEN 10 ELSE 30 END)
+             WHERE candidate_id IN %s AND from_stage_id IS NULL
+        """, [self.candidates[0].id, tuple(self.candidates[:2].ids)])
+
+        Funnel = self.env['admission.stage.funnel']
+        Funnel._cron_refresh_funnel()
+        funnel = {
+            row.stage_code: row
+            for row in Funnel.search([('form_id', '=', self.form.id), ('campaign', '=', 2024)])
+        }
+
+        self.assertEqual(funnel['new'].entered_count, 4)
+        self.assertEqual(funnel['new'].reached_count, 4)
+        self.assertEqual(funnel['complete'].reached_count, 2)
+        self.assertAlmostEqual(funnel['complete'].conversion_rate, 0.5)
+        self.assertAlmostEqual(funnel['under_review'].conversion_rate, 0.25)
+        self.assertAlmostEqual(funnel['new'].median_dwell_hours, 20, places=1)
+        self.assertAlmostEqual(funnel['new'].p90_dwell_hours, 28, places=1)
@@ -0,0 +1,146 @@
+import threading
+import time
+from unittest.mock import patch
+
+from odoo.tests.common import tagged
+
+from .common import AdmissionCase
+
+
+class FakeRpcServer:
+    """Client RPC minimal : seule la liste des sondages est servie."""
+
+    session_key = 'test-session'
+
+    def __init__(self, sids):
+        self.sids = sids
+
+    def list_surveys(self, session_key):
+        return [{'sid': sid, 'surveyls_title': f'Sondage {sid}'} for sid in self.sids]
+
+    def traffic(self):
+        return 0, 0
+
+
+@tagged('post_install', '-at_install')
+class TestSyncForms(AdmissionCase):
+    """Vérifie la synchronisation concurrente des formulaires."""
+
+    server_vals = {
+        'sync_concurrency': 3,
+    }
+
+    def _sync(self, sids, fetch_properties):
+        with patch.object(self.ServerConfig, '_get_rpc_session', return_value=FakeRpcServer(sids)), \
+                patch.object(self.ServerConfig, '_fetch_survey_properties', side_effect=fetch_properties), \
+                patch.object(self.ServerConfig, '_fetch_survey_responses') as fetch_responses:
+            result = self.server.action_sync_forms()
+        # Les réponses sont réservées aux lots d'import
+        fetch_responses.assert_not_called()
+        return result
+
+    def test_failures_are_isolated(self):
+        """Un sondage en erreur n'empêche pas l'écriture des autres."""
+        def fetch_properties(server, sid, surveys=None):
+            if sid == '700002':
+                raise ConnectionError("serveur indisponible")
+            return {'surveyls_title': f'Sondage {sid}', 'active': 'Y', 'response_count': 0}
+
+        result = self._sync(['700001', '700002', '700003'], fetch_properties)
+
+        templates = self.env['admission.form.template'].search([
+            ('server_config_id', '=', self.server.id),
+        ])
+        self.assertEqual(sorted(templates.mapped('sid')), ['700001', '700003'])
+        self.assertIn('700002', result['params']['message'])
+        self.assertEqual(result['params']['type'], 'warning')
+
+    def test_fetches_run_concurrently(self):
+        """Les récupérations se chevauchent sans dépasser la limite configurée."""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def fetch_properties(server, sid, surveys=None):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+            return {'surveyls_title': f'Sondage {sid}', 'active': 'Y', 'response_count': 0}
+
+        self._sync([str(710000 + n) for n in range(9)], fetch_properties)
+
+        self.assertGreater(state['peak'], 1)
+        self.assertLessEqual(state['peak'], self.server.sync_concurrency)
+        self.assertEqual(
+            self.env['admission.form.template'].search_count([('server_config_id', '=', self.server.id)]),
+            9,
+        )
+
+    def test_unchanged_structure_is_not_rewritten(self):
+        """Une structure identique ne réécrit ni le template ni ses métadonnées."""
+        def fetch_properties(server, sid, surveys=None):
+            return {'surveyls_title': f'Sondage {sid}', 'active': 'N', 'response_count': 0}
+
+        self._sync(['720001'], fetch_properties)
+        template = self.env['admission.form.template'].search([('sid', '=', '720001')])
+        self.assertEqual(len(template), 1)
+        self.assertTrue(template.structure_hash)
+
+        Template = type(template)
+        with patch.object(Template, 'write', autospec=True, side_effect=Template.write) as write:
+            result = self._sync(['720001'], fetch_properties)
+
+        self.assertIn('Formulaires inchangés : 1', result['params']['message'])
+        self.assertIn('Formulaires mis à jour : 0', result['params']['message'])
+        self.assertFalse([call for call in write.call_args_list if 'metadata' in call.args[1]])
+
+    def test_active_survey_structure_not_downloaded(self):
+        """La structure d'un sondage actif à l'indicateur inchangé n'est pas retéléchargée."""
+        calls = []
+
+        def fetch_properties(server, sid, surveys=None):
+            calls.append(sid)
+            return {'surveyls_title': f'Sondage {sid}', 'active': 'Y', 'response_count': 0}
+
+        self._sync(['730001'], fetch_properties)
+        template = self.env['admission.form.template'].search([('sid', '=', '730001')])
+        self.assertTrue(template.is_active)
+        self.assertTrue(template.structure_indicator)
+        self.assertEqual(calls, ['730001'])
+
+        result = self._sync(['730001'], fetch_properties)
+
+        self.assertEqual(calls, ['730001'])
+        self.assertIn('Formulaires inchangés : 1', result['params']['message'])
+
+    def test_sync_form_creates_mapping_for_synced_template(self):
+        """Un formulaire créé par la synchronisation du serveur reçoit son mapping à la première synchronisation."""
+        def fetch_properties(server, sid, surveys=None):
+            return {'surveyls_title': f'Sondage {sid}', 'active': 'Y', 'response_count': 0}
+
+        self._sync(['740001'], fetch_properties)
+        template = self.env['admission.form.template'].search([('sid', '=', '740001')])
+        self.assertTrue(template.structure_hash)
+        self.assertFalse(template.field_mapping)
+
+        sync_data = {
+            'title': 'Sondage 740001',
+            'description': '',
+            'is_active': True,
+            'owner': '1',
+            'metadata': {'surveyls_title': 'Sondage 740001', 'active': 'Y'},
+            'questions': [
+                {'qid': 1, 'title': 'G01Q01', 'question': 'Nom', 'type': 'S'},
+                {'qid': 2, 'title': 'G01Q02', 'question': 'Email', 'type': 'S'},
+            ],
+        }
+        Template = type(template)
+        with patch.object(self.ServerConfig, 'sync_specific_form', return_value=sync_data), \
+                patch.object(Template, '_structure_unchanged', return_value=True):
+            template.action_sync_form()
+
+        self.assertTrue(template.field_mapping)
+        mapping = self.env['admission.form.mapping'].search([('form_template_id', '=', template.id)])
+        self.assertEqual(len(mapping.mapping_line_ids), 2)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.exceptions import ValidationError
+from odoo.sql_db import db_connect
+from odoo.tests.common import TransactionCase, tagged
+
+from ..models.limesurvey_server_config import SYNC_SERVER_LOCK_CLASS
+
+
+@tagged('post_install', '-at_install')
+class TestSyncScheduler(TransactionCase):
+    """Vérifie la synchronisation planifiée des serveurs LimeSurvey."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        ServerConfig = cls.env['limesurvey.server.config']
+        # Les serveurs existants ne participent pas aux tests
+        ServerConfig.search([]).write({'sync_attempt_date': fields.Datetime.now()})
+        cls.servers = ServerConfig.create([{
+            'name': f'Serveur planifié {n}',
+            'base_url': f'http://limesurvey{n}.test',
+            'api_username': 'admin',
+            'api_password': 'admin',
+        } for n in range(3)])
+        cls.ServerConfig = type(ServerConfig)
+
+    def _run(self, sync, budget=90):
+        with patch.object(self.ServerConfig, 'action_sync_forms', autospec=True, side_effect=sync), \
+                patch.object(self.ServerConfig, '_get_sync_time_budget', return_value=budget):
+            return self.env['admission.form.template'].sync_all_forms()
+
+    def test_outcome_recorded_per_server(self):
+        """Chaque serveur enregistre son résultat, un échec n'arrête pas les suivants."""
+        def sync(server):
+            if server == self.servers[1]:
+                raise ValidationError("serveur indisponible")
+            kind = 'success' if server == self.servers[0] else 'warning'
+            return {'params': {'type': kind, 'message': f'Synchronisation {server.name}'}}
+
+        stats = self._run(sync)
+
+        self.assertEqual(stats['synced'], 3)
+        self.assertEqual(self.servers.mapped('sync_outcome'), ['success', 'failed', 'partial'])
+        self.assertIn('indisponible', self.servers[1].sync_outcome_message)
+        self.assertTrue(all(self.servers.mapped('sync_attempt_date')))
+
+    def test_budget_defers_remaining_servers(self):
+        """Le budget épuisé, les serveurs restants passent à l'exécution suivante."""
+        calls = []
+
+        def sync(server):
+            calls.append(server.id)
+            return {'params': {'type': 'success', 'message': ''}}
+
+        stats = self._run(sync, budget=0)
+        self.assertEqual(calls, [self.servers[0].id])
+        self.assertEqual(stats['remaining'], 2)
+
+        # Le serveur déjà synchronisé n'est pas repris avant le délai minimal
+        self._run(sync, budget=0)
+        self.assertEqual(calls, self.servers[:2].ids)
+
+        # Le serveur le plus anciennement tenté passe en premier
+        self.servers.write({'sync_attempt_date': fields.Datetime.now() - timedelta(days=1)})
+        self.servers[2].sync_attempt_date = fields.Datetime.now() - timedelta(days=2)
+        self._run(sync, budget=0)
+        self.assertEqual(calls[-1], self.servers[2].id)
+
+    def test_locked_server_is_skipped(self):
+        """Un serveur en cours de synchronisation par un autre worker est ignoré."""
+        other = db_connect(self.env.cr.dbname).cursor()
+        self.addCleanup(other.close)
+        other.execute("SELECT pg_advisory_lock(%s, %s)", (SYNC_SERVER_LOCK_CLASS, self.servers[0].id))
+        calls = []
+
+        def sync(server):
+            calls.append(server.id)
+            return {'params': {'type': 'success', 'message': ''}}
+
+        stats = self._run(sync)
+
+        self.assertEqual(stats['locked'], 1)
+        self.assertNotIn(self.servers[0].id, calls)
+        self.assertFalse(self.servers[0].sync_outcome)
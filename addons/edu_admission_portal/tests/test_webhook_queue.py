@@ -0,0 +1,155 @@
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.exceptions import UserError, ValidationError
+from odoo.tests.common import HttpCase, tagged
+
+from .common import AdmissionCase
+
+
+class WebhookQueueCase(AdmissionCase):
+    """Serveur et formulaire communs aux tests de la file webhook."""
+
+    server_vals = {
+        'webhook_token': 'jeton-webhook-test',
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.form = cls._create_form_template('960001')
+        cls.Queue = cls.env['admission.webhook.queue']
+
+    def _enqueue(self, response_id):
+        return self.Queue.enqueue_submission(self.server.id, {
+            'form_id': self.form.sid,
+            'response_id': response_id,
+            'submitdate': '2024-06-01 10:00:00',
+        }, {'G01Q02': f'Nom{response_id}'})
+
+    def _fail_with(self, error):
+        return patch.object(type(self.Queue), '_create_candidate', side_effect=error)
+
+
+@tagged('post_install', '-at_install')
+class TestWebhookQueue(WebhookQueueCase):
+    """Vérifie les nouveaux essais, la lettre morte et l'ordre par formulaire."""
+
+    def test_enqueue_is_idempotent(self):
+        item = self._enqueue('1')
+        self.assertEqual(self._enqueue('1'), item)
+        self.assertEqual(self.Queue.search_count([('form_sid', '=', self.form.sid)]), 1)
+
+    def test_concurrent_delivery_returns_existing_item(self):
+        """Une livraison concurrente déjà insérée ne viole pas la contrainte d'unicité."""
+        item = self._enqueue('1')
+        self.assertEqual(item.state, 'pending')
+        self.assertEqual(item.payload, {'G01Q02': 'Nom1'})
+
+        # La recherche initiale ne voit pas encore l'entrée de l'autre livraison
+        with patch.object(type(self.Queue), '_find_submission', side_effect=[self.Queue.browse(), item]):
+            self.assertEqual(self._enqueue('1'), item)
+        self.assertEqual(self.Queue.search_count([('form_sid', '=', self.form.sid)]), 1)
+
+    def test_transient_error_backs_off_exponentially(self):
+        item = self._enqueue('1')
+        with self._fail_with(RuntimeError("LimeSurvey indisponible")):
+            before = fields.Datetime.now()
+            self.assertFalse(item._process_item())
+            self.assertEqual(item.state, 'error')
+            self.assertEqual(item.attempt_count, 1)
+            self.assertGreaterEqual(item.next_attempt_date, before + timedelta(minutes=1))
+            self.assertLess(item.next_attempt_date, before + timedelta(minutes=2))
+
+            before = fields.Datetime.now()
+            item._process_item()
+            self.assertEqual(item.attempt_count, 2)
+            self.assertGreaterEqual(item.next_attempt_date, before + timedelta(minutes=2))
+            self.assertLess(item.next_attempt_date, before + timedelta(minutes=3))
+
+    def test_exhausted_retries_go_dead(self):
+        self.env['ir.config_parameter'].sudo().set_param(
+            'edu_admission_portal.webhook_queue_max_attempts', 2
+        )
+        item = self._enqueue('1')
+        with self._fail_with(RuntimeError("LimeSurvey indisponible")):
+            item._process_item()
+            self.assertTrue(item._process_item())
+        self.assertEqual(item.state, 'dead')
+        self.assertEqual(item.attempt_count, 2)
+
+    def test_data_errors_are_dead_lettered(self):
+        for n, error in enumerate((UserError("Donnée refusée"), ValidationError("Donnée invalide"))):
+            item = self._enqueue(str(n))
+            with self._fail_with(error):
+                self.assertTrue(item._process_item())
+            self.assertEqual(item.state, 'dead')
+            self.assertEqual(item.attempt_count, 1)
+            self.assertIn(str(error), item.last_error)
+
+    def test_retry_blocks_later_items_of_the_form(self):
+        first, second = self._enqueue('1'), self._enqueue('2')
+        with self._fail_with(RuntimeError("LimeSurvey indisponible")) as create:
+            self.assertEqual(self.Queue._cron_process_queue(), 1)
+            self.assertEqual(create.call_count, 1)
+            self.assertEqual(first.state, 'error')
+            self.assertEqual(second.state, 'pending')
+
+            # Tant que le premier élément attend, le second n'est pas traité
+            self.assertEqual(self.Queue._cron_process_queue(), 0)
+            self.assertEqual(create.call_count, 1)
+            self.assertEqual(second.state, 'pending')
+
+        # Une fois le délai écoulé, l'ordre d'arrivée est respecté
+        first.next_attempt_date = fields.Datetime.now() - timedelta(seconds=1)
+        processed = []
+        with patch.object(type(self.Queue), '_create_candidate', autospec=True,
+                          side_effect=lambda item: processed.append(item.response_id)
+                          or self.env['admission.candidate']):
+            self.assertEqual(self.Queue._cron_process_queue(), 2)
+        self.assertEqual(processed, ['1', '2'])
+        self.assertEqual((first | second).mapped('state'), ['done', 'done'])
+
+
+@tagged('post_install', '-at_install')
+class TestWebhookEndpoint(HttpCase, WebhookQueueCase):
+    """Vérifie que le webhook met la soumission en file et répond 202."""
+
+    URL = '/admission/webhook/submit'
+
+    def _post(self, payload, token='jeton-webhook-test'):
+        return self.url_open(self.URL, data=json.dumps(payload), headers={
+            'Content-Type': 'application/json',
+            'X-Webhook-Token': token,
+        })
+
+    def _payload(self, response_id):
+        return {
+            'form_id': self.form.sid,
+            'response_id': response_id,
+            'submitdate': '2024-06-01 10:00:00',
+            'response_data': {'G01Q02': 'Nom', 'G01Q03': 'Prénom'},
+        }
+
+    def test_submission_is_queued(self):
+        response = self._post(self._payload('42'))
+        self.assertEqual(response.status_code, 202)
+        body = response.json()
+        self.assertTrue(body['queued'])
+
+        item = self.Queue.browse(body['queue_id'])
+        self.assertEqual(item.state, 'pending')
+        self.assertEqual(item.payload, {'G01Q02': 'Nom', 'G01Q03': 'Prénom'})
+        self.assertFalse(item.candidate_id)
+
+        # Un rejeu de LimeSurvey renvoie la même entrée
+        again = self._post(self._payload('42'))
+        self.assertEqual(again.status_code, 202)
+        self.assertEqual(again.json()['queue_id'], item.id)
+
+    def test_invalid_token_is_refused(self):
+        response = self._post(self._payload('43'), token='mauvais-jeton')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(self.Queue.search([('response_id', '=', '43')]))
@@ -0,0 +1,58 @@
+import hashlib
+from unittest.mock import patch
+
+from odoo.tests.common import tagged
+
+from .common import AdmissionCase
+
+
+@tagged('post_install', '-at_install')
+class TestWebhookTokenIndex(AdmissionCase):
+    """Vérifie l'index des tokens webhook et son invalidation."""
+
+    server_vals = {
+        'webhook_token': 'jeton-index-test',
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.form = cls._create_form_template('970001')
+
+    def _entry(self, token):
+        digest = hashlib.sha256(token.encode('utf-8')).digest()
+        return self.env['limesurvey.server.config']._get_webhook_token_index().get(digest)
+
+    def test_index_maps_token_to_server_and_sids(self):
+        self.assertEqual(self._entry('jeton-index-test'), (self.server.id, frozenset({'970001'})))
+        self.assertIsNone(self._entry('jeton-inconnu'))
+
+    def test_index_is_cached_per_version(self):
+        # Simule une transaction sans modification en attente de validation
+        self.env.cr.postcommit.clear()
+        with patch.object(self.ServerConfig, '_build_webhook_token_index', autospec=True,
+                          side_effect=self.ServerConfig._build_webhook_token_index) as build:
+            self._entry('jeton-index-test')
+            with self.assertQueryCount(1):
+                self._entry('jeton-index-test')
+            self.assertEqual(build.call_count, 1)
+
+            # Une modification change la version : l'index est reconstruit
+            self.form.sid = '970002'
+            self.assertEqual(self._entry('jeton-index-test'), (self.server.id, frozenset({'970002'})))
+            self.assertEqual(build.call_count, 2)
+
+    def test_token_regeneration_invalidates_index(self):
+        self.server.generate_webhook_token()
+        self.assertIsNone(self._entry('jeton-index-test'))
+        self.assertEqual(self._entry(self.server.webhook_token)[0], self.server.id)
+
+    def test_form_changes_invalidate_index(self):
+        other = self._create_form_template('970003')
+        self.assertEqual(self._entry('jeton-index-test')[1], frozenset({'970001', '970003'}))
+
+        other.unlink()
+        self.assertEqual(self._entry('jeton-index-test')[1], frozenset({'970001'}))
+
+        self.server.active = False
+        self.assertIsNone(self._entry('jeton-index-test'))
@@ -0,0 +1,5 @@
+from . import snippet_sandbox
+from . import mapping_plan
+from . import limesurvey_client
+from . import export_stream
+from . import rpc_telemetry
@@ -0,0 +1,197 @@
+"""
+Décodage au fil de l'eau des exports de réponses LimeSurvey.
+
+``export_responses`` renvoie un document JSON encodé en base64, de la
+forme ``{"responses": [{...}, {...}]}``. Plutôt que de décoder tout le
+document puis d'appeler ``json.loads`` dessus (ce qui garde en mémoire
+la chaîne base64, les octets décodés et l'arbre JSON complet), le
+document est traité morceau par morceau :
+
+- le base64 est décodé par blocs de 4 caractères ;
+- le texte UTF-8 est reconstitué avec un décodeur incrémental ;
+- chaque élément du tableau ``responses`` est extrait avec
+  ``JSONDecoder.raw_decode`` dès qu'il est complet, puis rendu.
+
+La mémoire utilisée est bornée par la taille d'un morceau et celle de
+la plus grande réponse, et non par la taille du sondage.
+"""
+import base64
+import codecs
+import json
+
+# Taille des morceaux de texte lus à la fois
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_text_chunks(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Découpe une chaîne déjà en mémoire en morceaux successifs."""
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+
+def _iter_base64_decoded(chunks):
+    """Décode un flux base64 en texte UTF-8, morceau par morceau."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    remainder = ''
+    for chunk in chunks:
+        data = remainder + ''.join(chunk.split())
+        cut = len(data) - len(data) % 4
+        remainder = data[cut:]
+        if cut:
+            text = decoder.decode(base64.b64decode(data[:cut], validate=True))
+            if text:
+                yield text
+    if remainder:
+        raise ValueError("Document base64 tronqué")
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_document_text(chunks):
+    """
+    Produit le texte JSON d'un export, qu'il soit encodé en base64 ou non.
+
+    Les anciennes versions de LimeSurvey renvoient parfois le JSON en clair :
+    le format est déterminé d'après le premier caractère significatif.
+    """
+    chunks = iter(chunks)
+    head = ''
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode('utf-8')
+        head += chunk
+        if head.strip(_WHITESPACE):
+            break
+    stripped = head.lstrip(_WHITESPACE)
+    if not stripped:
+        return
+
+    def replay():
+        yield head
+        for chunk in chunks:
+            yield chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk
+
+    if stripped[0] in '{[':
+        yield from replay()
+    else:
+        yield from _iter_base64_decoded(replay())
+
+
+class _JsonStream:
+    """Tampon de lecture JSON alimenté par un itérateur de morceaux de texte."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=1):
+        """
+        Ajoute au tampon au moins ``size`` caractères lus dans le flux.
+
+        Les morceaux sont concaténés en une seule fois : le coût reste
+        linéaire même si les morceaux sont petits devant une réponse.
+
+        :return: False si le flux était déjà terminé
+        """
+        if self.eof:
+            return False
+        pieces = [self.buffer[self.pos:]]
+        added = 0
+        for chunk in self._chunks:
+            pieces.append(chunk)
+            added += len(chunk)
+            if added >= size:
+                break
+        else:
+            self.eof = True
+        self.buffer = ''.join(pieces)
+        self.pos = 0
+        return bool(added) or not self.eof
+
+    def peek(self):
+        """Premier caractère significatif, sans le consommer ('' en fin de flux)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars):
+        """Consomme un caractère parmi ``chars`` et le retourne."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError("JSON invalide : %r attendu, %r trouvé" % (chars, char or 'fin du document'))
+        self.pos += 1
+        return char
+
+    def value(self):
+        """
+        Décode la valeur suivante, en lisant la suite du flux si elle est incomplète.
+
+        Après un échec, le décodage n'est retenté qu'une fois le texte
+        disponible doublé : une réponse volumineuse n'est pas analysée à
+        chaque morceau reçu.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # Un nombre en fin de tampon peut être tronqué
+                if end < len(self.buffer) or self.eof or isinstance(value, (dict, list, str)):
+                    self.pos = end
+                    return value
+            self.fill(max(len(self.buffer) - self.pos, 1))
+
+
+def iter_json_items(chunks, key='responses'):
+    """
+    Produit un à un les éléments du tableau d'un document JSON.
+
+    Le document peut être le tableau lui-même, ou un objet dont la clé
+    ``key`` contient le tableau ; les autres clés sont ignorées.
+    """
+    stream = _JsonStream(chunks)
+    first = stream.peek()
+    if not first:
+        return
+    if first == '{':
+        stream.expect('{')
+        while True:
+            if stream.peek() == '}':
+                return
+            name = stream.value()
+            stream.expect(':')
+            if name == key:
+                break
+            stream.value()
+            if stream.expect(',}') == '}':
+                return
+    stream.expect('[')
+
+    while True:
+        char = stream.peek()
+        if char == ']':
+            return
+        if char == ',':
+            stream.pos += 1
+            continue
+        if not char:
+            raise ValueError("JSON invalide : tableau non terminé")
+        yield stream.value()
+
+
+def iter_export_rows(chunks):
+    """Produit les lignes d'un export export_responses (base64 ou JSON) une à une."""
+    return iter_json_items(iter_document_text(chunks))
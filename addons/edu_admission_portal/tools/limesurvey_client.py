@@ -0,0 +1,730 @@
+"""
+Client RemoteControl LimeSurvey partagé.
+
+Un client est conservé par serveur et par processus :
+
+- l'URL de l'API, découverte une fois, est réutilisée ;
+- la clé de session est réutilisée jusqu'à expiration de sa durée de vie
+  ou jusqu'à un refus d'authentification, puis libérée avec
+  ``release_session_key`` ;
+- tous les appels passent par une même session HTTP ``requests`` dont les
+  connexions restent ouvertes (keep-alive) ;
+- les appels indépendants sont regroupés en un seul aller-retour avec
+  ``system.multicall`` lorsque le serveur le permet, ou envoyés en
+  parallèle sur les connexions ouvertes sinon.
+
+Le client reste compatible avec l'usage historique de ``ServerProxy`` :
+``server.list_surveys(server.session_key)`` fonctionne toujours.
+"""
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
+from xml.parsers import expat
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_logger = logging.getLogger(__name__)
+
+# Statuts renvoyés par LimeSurvey lorsque la clé de session n'est plus valide
+AUTH_FAILURE_STATUSES = ('Invalid session key', 'No permission')
+
+INVALID_CREDENTIALS = 'Invalid user name or password'
+
+# Nombre maximal d'appels regroupés dans un même system.multicall
+MULTICALL_CHUNK_SIZE = 50
+
+# Taille des morceaux HTTP lus lors d'un appel en flux
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Échecs de transport consécutifs au-delà desquels le client n'appelle plus le serveur
+FAILURE_THRESHOLD = 3
+
+
+class LimeSurveyError(Exception):
+    """Erreur de communication avec LimeSurvey."""
+
+
+class LimeSurveyAuthError(LimeSurveyError):
+    """Identifiants refusés par LimeSurvey."""
+
+
+class LimeSurveyTransportError(LimeSurveyError):
+    """Serveur injoignable : connexion refusée, délai dépassé, erreur HTTP 5xx."""
+
+
+class LimeSurveyUnavailable(LimeSurveyError):
+    """Appel non tenté : le serveur a échoué trop de fois de suite."""
+
+
+class RequestsTransport(xmlrpc.client.Transport):
+    """Transport XML-RPC s'appuyant sur une session ``requests`` keep-alive."""
+
+    def __init__(self, http, url, timeout):
+        super().__init__(use_datetime=True)
+        self._http = http
+        self._url = url
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        # Volume échangé depuis la création du client (octets)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        # Volume échangé par le thread courant, pour la mesure appel par appel
+        self._local = threading.local()
+
+    def request(self, host, handler, request_body, verbose=False):
+        try:
+            response = self._http.post(
+                self._url,
+                data=request_body,
+                headers={'Content-Type': 'text/xml'},
+                timeout=self._timeout,
+            )
+        except requests.RequestException as e:
+            raise LimeSurveyTransportError(str(e)) from e
+
+        self._count(sent=len(request_body), received=len(response.content))
+
+        if response.status_code != 200:
+            raise xmlrpc.client.ProtocolError(
+                self._url, response.status_code, response.reason, dict(response.headers)
+            )
+
+        parser, unmarshaller = self.getparser()
+        parser.feed(response.content)
+        parser.close()
+        return unmarshaller.close()
+
+    def _count(self, sent=0, received=0):
+        with self._lock:
+            self.bytes_sent += sent
+            self.bytes_received += received
+        self._local.sent = getattr(self._local, 'sent', 0) + sent
+        self._local.received = getattr(self._local, 'received', 0) + received
+
+    def thread_traffic(self):
+        """Octets (envoyés, reçus) par le thread courant depuis la création du client."""
+        return getattr(self._local, 'sent', 0), getattr(self._local, 'received', 0)
+
+    def stream_request(self, request_body, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Envoie une requête XML-RPC et lit la réponse au fil de l'eau.
+
+        Returns:
+            tuple: (None, générateur de morceaux de texte) si le résultat est
+            une chaîne, sinon (valeur décodée, None)
+
+        Raises:
+            xmlrpc.client.Fault: si le serveur renvoie une erreur XML-RPC
+        """
+        try:
+            response = self._http.post(
+                self._url,
+                data=request_body,
+                headers={'Content-Type': 'text/xml'},
+                timeout=self._timeout,
+                stream=True,
+            )
+        except requests.RequestException as e:
+            raise LimeSurveyTransportError(str(e)) from e
+        self._count(sent=len(request_body))
+
+        if response.status_code != 200:
+            response.close()
+            raise xmlrpc.client.ProtocolError(
+                self._url, response.status_code, response.reason, dict(response.headers)
+            )
+
+        parser = StreamingResponseParser()
+        content = response.iter_content(chunk_size)
+        raw = []
+        try:
+            for data in content:
+                self._count(received=len(data))
+                parser.feed(data)
+                if parser.mode == 'string':
+                    return None, self._iter_string(response, content, parser)
+                # Tant que le type est inconnu, la réponse brute est conservée
+                raw.append(data)
+            parser.close()
+        except requests.RequestException as e:
+            response.close()
+            raise LimeSurveyTransportError(str(e)) from e
+        except BaseException:
+            response.close()
+            raise
+
+        response.close()
+        if parser.mode == 'string':
+            return None, iter([parser.take()])
+        return xmlrpc.client.loads(b''.join(raw), use_datetime=True)[0][0], None
+
+    def _iter_string(self, response, content, parser):
+        """Produit la suite du texte d'une chaîne en cours de réception."""
+        try:
+            text = parser.take()
+            if text:
+                yield text
+            for data in content:
+                self._count(received=len(data))
+                parser.feed(data)
+                text = parser.take()
+                if text:
+                    yield text
+            parser.close()
+            text = parser.take()
+            if text:
+                yield text
+        except requests.RequestException as e:
+            raise LimeSurveyTransportError(str(e)) from e
+        finally:
+            response.close()
+
+
+class StreamingResponseParser:
+    """
+    Analyse incrémentale d'une réponse XML-RPC dont la valeur est une chaîne.
+
+    Tant que le type de la valeur n'est pas connu, ``mode`` vaut None. Il
+    passe à ``'string'`` pour une chaîne (texte rendu par ``take`` au fur
+    et à mesure) ou à ``'buffered'`` pour tout autre résultat (structure,
+    erreur), qui doit alors être décodé par ``xmlrpc.client.loads``.
+    """
+
+    _VALUE_PATH = ['methodResponse', 'params', 'param', 'value']
+
+    def __init__(self):
+        self._parser = expat.ParserCreate()
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._chardata
+        self._parser.buffer_text = True
+        self._path = []
+        self._capture = False
+        self._pending = []
+        self._pieces = []
+        self.mode = None
+
+    def feed(self, data):
+        self._parser.Parse(data, False)
+
+    def close(self):
+        self._parser.Parse(b'', True)
+
+    def take(self):
+        """Retourne le texte de la chaîne reçu depuis le dernier appel."""
+        text = ''.join(self._pieces)
+        self._pieces = []
+        return text
+
+    def _in_value(self):
+        return self._path == self._VALUE_PATH
+
+    def _start(self, name, attrs):
+        if self.mode is None:
+            if name == 'fault':
+                self.mode = 'buffered'
+            elif self._in_value():
+                if name in ('string', 'base64'):
+                    self.mode = 'string'
+                    self._capture = True
+                else:
+                    self.mode = 'buffered'
+        self._path.append(name)
+
+    def _end(self, name):
+        self._path.pop()
+        if self._capture and (self._in_value() or self._path == self._VALUE_PATH[:3]):
+            # Fin de <string>/<base64>, ou de <value> pour une chaîne sans type
+            self._capture = False
+        elif self.mode is None and name == 'value' and self._path == self._VALUE_PATH[:3]:
+            # <value> ne contenant que des blancs : chaîne sans type
+            self.mode = 'string'
+            self._pieces, self._pending = self._pending, []
+
+    def _chardata(self, data):
+        if self._capture:
+            self._pieces.append(data)
+        elif self.mode is None and self._in_value():
+            self._pending.append(data)
+            if data.strip():
+                # Texte directement dans <value> : chaîne sans type
+                self.mode = 'string'
+                self._capture = True
+                self._pieces, self._pending = self._pending, []
+
+
+class LimeSurveyClient:
+    """Client RemoteControl avec session réutilisable."""
+
+    def __init__(self, api_url, username, password, session_ttl=1800, timeout=30, pool_size=4,
+                 failure_threshold=FAILURE_THRESHOLD, verify=True):
+        self.api_url = api_url
+        self.username = username
+        self.password = password
+        self.session_ttl = session_ttl
+        self.pool_size = max(1, pool_size)
+
+        self.http = requests.Session()
+        self.http.verify = verify
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.http.mount('http://', adapter)
+        self.http.mount('https://', adapter)
+
+        self.transport = RequestsTransport(self.http, api_url, timeout)
+        self.proxy = xmlrpc.client.ServerProxy(
+            api_url,
+            transport=self.transport,
+            allow_none=True,
+            use_datetime=True,
+        )
+
+        self._session_key = None
+        self._key_expiry = 0.0
+        self._lock = threading.RLock()
+
+        # Instant de la dernière découverte de l'URL d'API
+        self.discovered_at = time.monotonic()
+
+        # None : support de system.multicall pas encore déterminé
+        self.multicall_supported = None
+
+        # Fonctions appelées après chaque appel RPC :
+        # hook(méthode, sondage, durée, erreur, octets envoyés, octets reçus)
+        self.hooks = []
+
+        # Échecs de transport consécutifs : au-delà du seuil, les appels
+        # échouent sans requête jusqu'à ce que le client soit recréé
+        self.failure_threshold = max(1, failure_threshold)
+        self.consecutive_failures = 0
+        self.last_error = None
+
+    # ------------------------------------------------------------------
+    # Session
+    # ------------------------------------------------------------------
+
+    @property
+    def session_key(self):
+        """Clé de session courante, ouverte ou renouvelée au besoin."""
+        with self._lock:
+            if self._session_key and time.monotonic() < self._key_expiry:
+                return self._session_key
+            if self._session_key:
+                self._release_key(self._session_key)
+            self._session_key = self._open_session()
+            self._key_expiry = time.monotonic() + self.session_ttl
+            return self._session_key
+
+    def claim_discovery(self, ttl):
+        """
+        Indique si l'URL d'API doit être redécouverte.
+
+        Un seul appelant obtient True par période : les autres continuent
+        avec l'URL courante pendant la découverte.
+        """
+        with self._lock:
+            if time.monotonic() - self.discovered_at < ttl:
+                return False
+            self.discovered_at = time.monotonic()
+            return True
+
+    def set_api_url(self, api_url):
+        """
+        Remplace l'URL d'API sans recréer le client.
+
+        La clé de session et les connexions ouvertes sont conservées : les
+        appels en cours se terminent sur l'ancienne URL, les suivants
+        utilisent la nouvelle.
+        """
+        with self._lock:
+            if api_url == self.api_url:
+                return
+            _logger.info("URL de l'API LimeSurvey modifiée: %s -> %s", self.api_url, api_url)
+            self.api_url = api_url
+            self.transport._url = api_url
+
+    def _open_session(self):
+        """Ouvre une session RemoteControl."""
+        try:
+            session_key = self._call('get_session_key', self.username, self.password)
+        except xmlrpc.client.Fault as e:
+            if "Calling parameters do not match signature" not in str(e):
+                raise
+            # Anciennes versions de LimeSurvey
+            session_key = self._call('get_session_key', self.username, self.password, 'Odoo')
+
+        if not session_key or isinstance(session_key, dict) or session_key == INVALID_CREDENTIALS:
+            raise LimeSurveyAuthError(
+                session_key.get('status') if isinstance(session_key, dict) else INVALID_CREDENTIALS
+            )
+        _logger.debug("Session LimeSurvey ouverte sur %s", self.api_url)
+        return session_key
+
+    def _release_key(self, session_key):
+        """Libère une clé de session côté LimeSurvey (sans lever d'erreur)."""
+        try:
+            self._call('release_session_key', session_key)
+        except Exception as e:
+            _logger.debug("Libération de la session LimeSurvey impossible: %s", str(e))
+
+    def invalidate(self, session_key=None):
+        """Oublie la clé de session (si c'est toujours la clé courante)."""
+        with self._lock:
+            if session_key is None or session_key == self._session_key:
+                self._session_key = None
+                self._key_expiry = 0.0
+
+    def release(self):
+        """Libère la session courante."""
+        with self._lock:
+            if self._session_key:
+                self._release_key(self._session_key)
+            self._session_key = None
+            self._key_expiry = 0.0
+
+    def close(self):
+        """Libère la session et ferme les connexions HTTP."""
+        self.release()
+        self.http.close()
+
+    def traffic(self):
+        """Octets (envoyés, reçus) depuis la création du client, tous appels confondus."""
+        return self.transport.bytes_sent, self.transport.bytes_received
+
+    # ------------------------------------------------------------------
+    # Appels
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def is_transport_error(error):
+        """Indique si une erreur signale un serveur injoignable plutôt qu'un refus."""
+        if isinstance(error, xmlrpc.client.ProtocolError):
+            return error.errcode >= 500
+        return isinstance(error, (LimeSurveyTransportError, OSError))
+
+    @property
+    def unavailable(self):
+        """Vrai si le seuil d'échecs de transport consécutifs est atteint."""
+        return self.consecutive_failures >= self.failure_threshold
+
+    def _check_available(self):
+        if self.unavailable:
+            raise LimeSurveyUnavailable(
+                "Serveur LimeSurvey injoignable après %d échecs : %s"
+                % (self.consecutive_failures, self.last_error)
+            )
+
+    @staticmethod
+    def _survey_id(method, params):
+        """Sondage visé par un appel (second paramètre après la clé de session), ou None."""
+        if method == 'system.multicall':
+            sids = {
+                call['params'][1] for call in (params[0] if params else [])
+                if isinstance(call, dict) and len(call.get('params') or ()) > 1
+            }
+            return sids.pop() if len(sids) == 1 else None
+        if method == 'get_session_key' or len(params) < 2:
+            return None
+        survey_id = params[1]
+        if isinstance(survey_id, int) and not isinstance(survey_id, bool):
+            return survey_id
+        if isinstance(survey_id, str) and survey_id.isdigit():
+            return survey_id
+        return None
+
+    def _notify(self, method, params, start, traffic, error):
+        """
+        Comptabilise l'issue d'un appel et la transmet aux hooks.
+
+        Les hooks reçoivent la méthode, le sondage visé, la durée, l'erreur
+        éventuelle et le volume échangé ; jamais les paramètres ni la réponse.
+        """
+        duration = time.monotonic() - start
+        sent, received = self.transport.thread_traffic()
+        sent -= traffic[0]
+        received -= traffic[1]
+        if error is None:
+            self.consecutive_failures = 0
+        elif self.is_transport_error(error):
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+        if not self.hooks:
+            return
+        survey_id = self._survey_id(method, params)
+        operation = _current_operation.get()
+        for hook, scope in tuple(self.hooks):
+            if scope is not None and scope is not operation:
+                # Hook d'une autre opération sur le même serveur
+                continue
+            try:
+                hook(method, survey_id, duration, error, sent, received)
+            except Exception:
+                _logger.debug("Hook RPC en erreur", exc_info=True)
+
+    def _call(self, method, *params):
+        """Exécute un appel RPC brut et notifie les hooks."""
+        self._check_available()
+        start = time.monotonic()
+        traffic = self.transport.thread_traffic()
+        error = None
+        try:
+            return getattr(self.proxy, method)(*params)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._notify(method, params, start, traffic, error)
+
+    def _stream(self, method, *params):
+        """Appel RPC brut dont une chaîne résultat est lue au fil de l'eau."""
+        self._check_available()
+        start = time.monotonic()
+        traffic = self.transport.thread_traffic()
+        body = xmlrpc.client.dumps(params, method, allow_none=True).encode('utf-8')
+        try:
+            value, chunks = self.transport.stream_request(body)
+        except Exception as e:
+            self._notify(method, params, start, traffic, e)
+            raise
+        if chunks is None:
+            self._notify(method, params, start, traffic, None)
+            return value, None
+
+        def notified():
+            error = None
+            try:
+                yield from chunks
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self._notify(method, params, start, traffic, error)
+
+        return None, notified()
+
+    def call_stream(self, method, *params):
+        """
+        Appelle une méthode dont le résultat est une chaîne volumineuse.
+
+        Le texte n'est pas chargé en mémoire d'un seul bloc : il est rendu
+        morceau par morceau à mesure de sa réception. La clé de session est
+        renouvelée une fois si LimeSurvey la refuse.
+
+        Returns:
+            tuple: (None, générateur de morceaux de texte) pour une chaîne,
+            sinon (valeur, None) (dictionnaire de statut, par exemple)
+        """
+        session_key = self.session_key
+        value, chunks = self._stream(method, session_key, *params)
+        if chunks is None and self._is_auth_failure(value):
+            _logger.info("Clé de session LimeSurvey refusée, renouvellement")
+            self.invalidate(session_key)
+            value, chunks = self._stream(method, self.session_key, *params)
+        return value, chunks
+
+    @staticmethod
+    def _is_auth_failure(result):
+        return isinstance(result, dict) and result.get('status') in AUTH_FAILURE_STATUSES
+
+    def call(self, method, *params):
+        """
+        Appelle une méthode RemoteControl avec la clé de session courante.
+
+        La clé est renouvelée une fois si LimeSurvey la refuse.
+        """
+        session_key = self.session_key
+        result = self._call(method, session_key, *params)
+        if self._is_auth_failure(result):
+            _logger.info("Clé de session LimeSurvey refusée, renouvellement")
+            self.invalidate(session_key)
+            result = self._call(method, self.session_key, *params)
+        return result
+
+    def multicall(self, calls):
+        """
+        Exécute plusieurs appels RemoteControl en le moins d'allers-retours possible.
+
+        La clé de session est ajoutée en tête des paramètres de chaque appel.
+        ``system.multicall`` est utilisé si le serveur le permet ; sinon les
+        appels sont envoyés en parallèle sur les connexions keep-alive.
+
+        Args:
+            calls (list): Couples (méthode, paramètres sans clé de session)
+
+        Returns:
+            list: Résultat de chaque appel, dans l'ordre ; un appel en échec
+            est représenté par l'exception correspondante
+        """
+        calls = [(method, list(params)) for method, params in calls]
+        if not calls:
+            return []
+
+        if self.multicall_supported is not False:
+            try:
+                results = []
+                for start in range(0, len(calls), MULTICALL_CHUNK_SIZE):
+                    results.extend(self._multicall(calls[start:start + MULTICALL_CHUNK_SIZE]))
+                self.multicall_supported = True
+                return results
+            except (xmlrpc.client.Fault, xmlrpc.client.ProtocolError) as e:
+                if self.multicall_supported:
+                    raise
+                _logger.info(
+                    "system.multicall indisponible sur %s, appels parallèles: %s",
+                    self.api_url, str(e)
+                )
+                self.multicall_supported = False
+
+        return self._pipelined(calls)
+
+    def _multicall(self, calls):
+        """Regroupe des appels en une requête system.multicall."""
+        for attempt in range(2):
+            session_key = self.session_key
+            raw = self._call('system.multicall', [
+                {'methodName': method, 'params': [session_key] + params}
+                for method, params in calls
+            ])
+            if not isinstance(raw, list) or len(raw) != len(calls):
+                raise xmlrpc.client.Fault(-32600, "Réponse system.multicall invalide")
+
+            results = []
+            for item in raw:
+                if isinstance(item, dict) and 'faultCode' in item:
+                    results.append(xmlrpc.client.Fault(item['faultCode'], item.get('faultString', '')))
+                elif isinstance(item, list) and len(item) == 1:
+                    results.append(item[0])
+                else:
+                    results.append(item)
+
+            if attempt == 0 and any(self._is_auth_failure(result) for result in results):
+                _logger.info("Clé de session LimeSurvey refusée, renouvellement")
+                self.invalidate(session_key)
+                continue
+            return results
+        return results
+
+    def _pipelined(self, calls):
+        """Envoie des appels en parallèle sur les connexions keep-alive du client."""
+        def run(call):
+            method, params = call
+            try:
+                return self.call(method, *params)
+            except Exception as e:
+                return e
+
+        if len(calls) == 1 or self.pool_size == 1:
+            return [run(call) for call in calls]
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(calls))) as executor:
+            futures = [submit_in_context(executor, run, call) for call in calls]
+            return [future.result() for future in futures]
+
+    def __getattr__(self, name):
+        """Compatibilité ServerProxy : ``server.methode(server.session_key, ...)``."""
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def method(*params):
+            if params and params[0] is not None and params[0] == self._session_key:
+                return self.call(name, *params[1:])
+            return self._call(name, *params)
+
+        method.__name__ = name
+        return method
+
+
+# ----------------------------------------------------------------------
+# Registre des clients par processus
+# ----------------------------------------------------------------------
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+# Hooks par serveur, partagés par ses clients successifs : paires (hook, opération)
+_hooks = {}
+
+# Opération en cours dans le contexte d'exécution ; un hook abonné pour une
+# opération ne reçoit que les appels faits dans celle-ci
+_current_operation = contextvars.ContextVar('limesurvey_operation', default=None)
+
+
+def get_client(key, signature, factory):
+    """
+    Retourne le client d'un serveur, en le créant au besoin.
+
+    Args:
+        key: Identifiant du serveur (base de données, ID)
+        signature: Paramètres de connexion ; un changement recrée le client
+        factory: Fonction sans argument créant le client
+
+    Returns:
+        LimeSurveyClient
+    """
+    with _clients_lock:
+        entry = _clients.get(key)
+        if entry and entry[0] == signature:
+            return entry[1]
+
+    client = factory()
+
+    with _clients_lock:
+        client.hooks = _hooks.setdefault(key, [])
+        previous = _clients.get(key)
+        _clients[key] = (signature, client)
+
+    if previous:
+        previous[1].close()
+    return client
+
+
+def drop_client(key):
+    """Libère la session d'un serveur et oublie son client."""
+    with _clients_lock:
+        entry = _clients.pop(key, None)
+    if entry:
+        entry[1].close()
+
+
+def subscribe(key, hook, operation=None):
+    """
+    Abonne un hook aux appels RPC d'un serveur.
+
+    L'abonnement vaut pour le client courant comme pour ceux créés ensuite,
+    sans ouvrir de connexion. Avec ``operation``, le hook ne reçoit que les
+    appels faits dans ``operation_scope(operation)`` : deux opérations
+    simultanées sur le même serveur ne voient pas les appels l'une de l'autre.
+    """
+    with _clients_lock:
+        _hooks.setdefault(key, []).append((hook, operation))
+
+
+def unsubscribe(key, hook):
+    """Désabonne un hook enregistré avec ``subscribe``."""
+    with _clients_lock:
+        hooks = _hooks.get(key)
+        if hooks:
+            hooks[:] = [entry for entry in hooks if entry[0] is not hook]
+
+
+@contextlib.contextmanager
+def operation_scope(operation):
+    """Rattache les appels RPC du contexte courant à ``operation``."""
+    token = _current_operation.set(operation)
+    try:
+        yield operation
+    finally:
+        _current_operation.reset(token)
+
+
+def submit_in_context(executor, fn, *args):
+    """
+    Soumet une tâche à un pool de threads dans une copie du contexte courant.
+
+    Les threads du pool ne héritent pas du contexte : sans cette copie, leurs
+    appels ne seraient rattachés à aucune opération.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args)
@@ -0,0 +1,434 @@
+"""
+Plans de mapping compilés.
+
+Un plan est une représentation figée (sans enregistrement ORM) d'un
+mapping validé : la liste ordonnée de ses lignes validées, avec le code
+de transformation et de validation déjà compilé. Il est mis en cache
+dans le registre par ``admission.form.mapping._get_mapping_plan`` et
+partagé par le webhook, l'import et la synchronisation.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .snippet_sandbox import MODE_BATCH, MODE_TRANSFORM, MODE_VALIDATE
+
+_logger = logging.getLogger(__name__)
+
+# Nombre maximal d'extraits compilés conservés par processus
+SNIPPET_CACHE_SIZE = 1024
+
+
+class SnippetCache:
+    """
+    Cache LRU des extraits de code compilés.
+
+    La clé contient l'empreinte du code source : une modification du code
+    d'une ligne produit une nouvelle entrée, l'ancienne finit par être
+    évincée sans invalidation explicite.
+    """
+
+    def __init__(self, maxsize=SNIPPET_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(line_id, field_name, source):
+        """Construit la clé (ligne, champ, empreinte du source)."""
+        digest = hashlib.sha1(source.encode('utf-8')).hexdigest()
+        return (line_id, field_name, digest)
+
+    def get(self, line_id, field_name, source):
+        """
+        Retourne le code compilé d'un extrait, en le compilant au besoin.
+
+        Raises:
+            SyntaxError: Si le code est invalide (les erreurs ne sont pas mises en cache)
+        """
+        key = self.make_key(line_id, field_name, source)
+        with self._lock:
+            code = self._data.get(key)
+            if code is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return code
+
+        code = compile_snippet(source, line_id, field_name)
+
+        with self._lock:
+            self.misses += 1
+            self._data[key] = code
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return code
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+snippet_cache = SnippetCache()
+
+
+def compile_snippet(source, line_id, field_name):
+    """
+    Compile un extrait de code Python d'une ligne de mapping.
+
+    Args:
+        source (str): Code source de l'extrait
+        line_id (int): ID de la ligne de mapping (pour les messages d'erreur)
+        field_name (str): Nom du champ contenant le code
+
+    Returns:
+        code: L'objet code compilé
+
+    Raises:
+        SyntaxError: Si le code est invalide
+    """
+    return compile(source, f'<admission.mapping.line({line_id}).{field_name}>', 'exec')
+
+
+class MappingLineSpec:
+    """Description compilée d'une ligne de mapping validée."""
+
+    __slots__ = (
+        'line_id', 'question_code', 'odoo_field', 'is_attachment',
+        'is_required', 'transform', 'validator', 'error',
+        'batch', 'numeric', 'transform_source', 'validator_source',
+    )
+
+    def __init__(self, line_id, question_code, odoo_field, is_attachment,
+                 is_required, transform=None, validator=None, error=None,
+                 batch=False, numeric=False, transform_source=None,
+                 validator_source=None):
+        self.line_id = line_id
+        self.question_code = question_code
+        self.odoo_field = odoo_field
+        self.is_attachment = is_attachment
+        self.is_required = is_required
+        self.transform = transform
+        self.validator = validator
+        self.error = error
+        self.batch = batch
+        self.numeric = numeric
+        self.transform_source = transform_source
+        self.validator_source = validator_source
+
+    @classmethod
+    def from_line(cls, line):
+        """Construit la description à partir d'un enregistrement admission.mapping.line."""
+        transform = validator = error = None
+        try:
+            if line.mapping_type == 'transform' and line.transform_python:
+                transform = snippet_cache.get(line.id, 'transform_python', line.transform_python)
+            if line.validation_python:
+                validator = snippet_cache.get(line.id, 'validation_python', line.validation_python)
+        except SyntaxError as e:
+            error = str(e)
+
+        return cls(
+            line.id,
+            line.question_code,
+            line.odoo_field or False,
+            line.is_attachment,
+            line.is_required,
+            transform=transform,
+            validator=validator,
+            error=error,
+            batch=bool(transform and line.batch_transform),
+            numeric=line.question_type == 'numeric',
+            transform_source=line.transform_python if transform else None,
+            validator_source=line.validation_python if validator else None,
+        )
+
+
+class MappingPlan:
+    """Plan d'exécution d'un mapping validé."""
+
+    __slots__ = ('mapping_id', 'write_date', 'lines', 'required_codes')
+
+    def __init__(self, mapping_id, write_date, lines):
+        self.mapping_id = mapping_id
+        self.write_date = write_date
+        self.lines = tuple(lines)
+        self.required_codes = tuple(
+            spec.question_code for spec in self.lines if spec.is_required
+        )
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Compile un enregistrement admission.form.mapping validé."""
+        lines = mapping.mapping_line_ids.filtered(lambda l: l.status == 'validated')
+        return cls(
+            mapping.id,
+            mapping.write_date,
+            [MappingLineSpec.from_line(line) for line in lines],
+        )
+
+    def iter_values(self, env, response_data, logger=_logger):
+        """
+        Applique le plan à une réponse.
+
+        Les pièces jointes sont renvoyées telles quelles ; les autres valeurs
+        sont transformées puis validées. Les lignes en erreur sont journalisées
+        et ignorées.
+
+        Args:
+            env: Environnement Odoo utilisé pour exécuter les extraits
+            response_data (dict): Réponse brute indexée par code de question
+
+        Yields:
+            tuple: (MappingLineSpec, valeur)
+        """
+        MappingLine = env['admission.mapping.line']
+        if MappingLine._get_snippet_sandbox() is not None:
+            # En isolation, une réponse est traitée comme un lot d'une ligne
+            yield from self.iter_batch(env, [response_data], logger)[0]
+            return
+
+        for spec in self.lines:
+            try:
+                value = response_data.get(spec.question_code)
+                if value is None:
+                    continue
+
+                if spec.is_attachment and isinstance(value, dict):
+                    yield spec, value
+                    continue
+
+                if spec.error:
+                    logger.error(
+                        "Code de mapping invalide pour %s: %s",
+                        spec.question_code, spec.error
+                    )
+                    continue
+
+                line = MappingLine.browse(spec.line_id)
+
+                if spec.batch:
+                    # Extrait « par lot » appliqué à une colonne d'une seule valeur
+                    try:
+                        value = line._run_batch_transform(
+                            spec.transform, self._column_values(spec, [(0, value)])
+                        )[0]
+                    except Exception as e:
+                        logger.error(
+                            "Erreur lors de la transformation pour %s: %s",
+                            spec.question_code, str(e)
+                        )
+                        continue
+                elif spec.transform:
+                    try:
+                        value = line._run_transform(spec.transform, value)
+                    except Exception as e:
+                        logger.error(
+                            "Erreur lors de la transformation pour %s: %s",
+                            spec.question_code, str(e)
+                        )
+                        continue
+
+                if spec.validator:
+                    try:
+                        if not line._run_validation(spec.validator, value):
+                            logger.warning(
+                                "Validation échouée pour %s: %s",
+                                spec.question_code, value
+                            )
+                            continue
+                    except Exception as e:
+                        logger.error(
+                            "Erreur lors de la validation pour %s: %s",
+                            spec.question_code, str(e)
+                        )
+                        continue
+
+                yield spec, value
+
+            except Exception as e:
+                logger.error(
+                    "Erreur lors du traitement de la ligne %s: %s",
+                    spec.question_code, str(e)
+                )
+                continue
+
+    def iter_batch(self, env, responses, logger=_logger):
+        """
+        Applique le plan à un lot de réponses, colonne par colonne.
+
+        Les lignes déclarées « par lot » exécutent leur transformation une
+        seule fois pour toute la colonne ; les autres lignes suivent le
+        chemin valeur par valeur de ``iter_values``. La validation reste
+        appliquée valeur par valeur.
+
+        Args:
+            env: Environnement Odoo utilisé pour exécuter les extraits
+            responses (list): Réponses brutes indexées par code de question
+
+        Returns:
+            list: Pour chaque réponse, la liste des couples (MappingLineSpec, valeur)
+        """
+        MappingLine = env['admission.mapping.line']
+        sandbox = MappingLine._get_snippet_sandbox()
+        pairs = [[] for _ in responses]
+
+        for spec in self.lines:
+            # Colonne : (index de la réponse, valeur) pour les valeurs présentes
+            column = [
+                (index, response.get(spec.question_code))
+                for index, response in enumerate(responses)
+                if response.get(spec.question_code) is not None
+            ]
+            if not column:
+                continue
+
+            if spec.is_attachment:
+                attachments = [(i, v) for i, v in column if isinstance(v, dict)]
+                for index, value in attachments:
+                    pairs[index].append((spec, value))
+                if len(attachments) == len(column):
+                    continue
+                column = [(i, v) for i, v in column if not isinstance(v, dict)]
+
+            if spec.error:
+                logger.error(
+                    "Code de mapping invalide pour %s: %s",
+                    spec.question_code, spec.error
+                )
+                continue
+
+            if sandbox is not None:
+                column = self._run_column_sandboxed(sandbox, spec, column, logger)
+            else:
+                column = self._run_column(MappingLine.browse(spec.line_id), spec, column, logger)
+
+            for index, value in column:
+                pairs[index].append((spec, value))
+
+        return pairs
+
+    def _run_column(self, line, spec, column, logger):
+        """Transforme puis valide une colonne dans le processus Odoo."""
+        if spec.batch:
+            try:
+                results = line._run_batch_transform(
+                    spec.transform, self._column_values(spec, column)
+                )
+                column = [(index, result) for (index, _v), result in zip(column, results)]
+            except Exception as e:
+                logger.error(
+                    "Erreur lors de la transformation par lot pour %s: %s",
+                    spec.question_code, str(e)
+                )
+                return []
+        elif spec.transform:
+            transformed = []
+            for index, value in column:
+                try:
+                    transformed.append((index, line._run_transform(spec.transform, value)))
+                except Exception as e:
+                    logger.error(
+                        "Erreur lors de la transformation pour %s: %s",
+                        spec.question_code, str(e)
+                    )
+            column = transformed
+
+        if not spec.validator:
+            return column
+
+        valid = []
+        for index, value in column:
+            try:
+                if not line._run_validation(spec.validator, value):
+                    logger.warning(
+                        "Validation échouée pour %s: %s",
+                        spec.question_code, value
+                    )
+                    continue
+            except Exception as e:
+                logger.error(
+                    "Erreur lors de la validation pour %s: %s",
+                    spec.question_code, str(e)
+                )
+                continue
+            valid.append((index, value))
+        return valid
+
+    def _run_column_sandboxed(self, sandbox, spec, column, logger):
+        """Transforme puis valide une colonne dans le pool d'exécution isolé."""
+        if spec.transform:
+            mode = MODE_BATCH if spec.batch else MODE_TRANSFORM
+            outcomes = sandbox.run(
+                spec.transform_source, mode, self._column_values(spec, column)
+            )
+            transformed = []
+            for (index, _value), (ok, result) in zip(column, outcomes):
+                if ok:
+                    transformed.append((index, result))
+                else:
+                    logger.error(
+                        "Erreur lors de la transformation pour %s: %s",
+                        spec.question_code, result
+                    )
+            column = transformed
+
+        if not spec.validator or not column:
+            return column
+
+        outcomes = sandbox.run(
+            spec.validator_source, MODE_VALIDATE, [value for _index, value in column]
+        )
+        valid = []
+        for (index, value), (ok, result) in zip(column, outcomes):
+            if not ok:
+                logger.error(
+                    "Erreur lors de la validation pour %s: %s",
+                    spec.question_code, result
+                )
+            elif not result:
+                logger.warning(
+                    "Validation échouée pour %s: %s",
+                    spec.question_code, value
+                )
+            else:
+                valid.append((index, value))
+        return valid
+
+    @staticmethod
+    def _column_values(spec, column):
+        """
+        Prépare les valeurs d'une colonne pour une transformation par lot.
+
+        Les questions numériques sont passées sous forme de tableau NumPy
+        lorsque la bibliothèque est disponible et que toutes les valeurs
+        sont convertibles ; sinon une liste est passée.
+        """
+        values = [value for _index, value in column]
+        if spec.numeric and numpy is not None:
+            try:
+                return numpy.asarray(values, dtype=float)
+            except (TypeError, ValueError):
+                pass
+        return values
+
+    def missing_required(self, response_data):
+        """Retourne les codes des questions requises sans réponse."""
+        response_data = response_data or {}
+        return [
+            code for code in self.required_codes
+            if response_data.get(code) is None or response_data.get(code) == ''
+        ]
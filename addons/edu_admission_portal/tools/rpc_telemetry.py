@@ -0,0 +1,91 @@
+"""
+Télémétrie des appels RemoteControl LimeSurvey.
+
+``RpcTelemetry`` s'abonne aux hooks d'un ``LimeSurveyClient`` et agrège,
+pour chaque méthode et chaque sondage : nombre d'appels, erreurs, durée
+totale et maximale, octets envoyés et reçus.
+
+Le coût par appel est borné : une mise à jour de compteurs sous verrou,
+sans conservation des paramètres ni des réponses. La mémoire ne dépend que
+du nombre de méthodes et de sondages distincts, jamais du volume échangé.
+"""
+import threading
+
+# Clé d'agrégation des appels qui ne portent pas sur un sondage
+NO_SURVEY = ''
+
+
+def payload_summary(value):
+    """Décrit une charge utile pour les journaux, sans en reproduire le contenu."""
+    if isinstance(value, dict):
+        return "dictionnaire de %d clés" % len(value)
+    if isinstance(value, (list, tuple)):
+        return "liste de %d éléments" % len(value)
+    if isinstance(value, (str, bytes)):
+        return "texte de %d caractères" % len(value)
+    return type(value).__name__
+
+
+class CallStats:
+    """Compteurs cumulés d'un ensemble d'appels."""
+
+    __slots__ = ('calls', 'errors', 'duration', 'max_duration', 'sent', 'received')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.max_duration = 0.0
+        self.sent = 0
+        self.received = 0
+
+    def add(self, duration, error, sent, received):
+        self.calls += 1
+        if error is not None:
+            self.errors += 1
+        self.duration += duration
+        self.max_duration = max(self.max_duration, duration)
+        self.sent += sent
+        self.received += received
+
+
+class RpcTelemetry:
+    """Agrégateur de télémétrie RPC, utilisable comme hook d'un client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = CallStats()
+        self.by_method = {}
+        self.by_survey = {}
+        # Résultat de l'opération mesurée, renseigné par l'appelant
+        self.outcome = None
+
+    def __call__(self, method, survey_id, duration, error, sent=0, received=0):
+        """Enregistre un appel (signature des hooks de ``LimeSurveyClient``)."""
+        survey_key = str(survey_id) if survey_id is not None else NO_SURVEY
+        with self._lock:
+            self.total.add(duration, error, sent, received)
+            stats = self.by_method.get(method)
+            if stats is None:
+                stats = self.by_method[method] = CallStats()
+            stats.add(duration, error, sent, received)
+            stats = self.by_survey.get(survey_key)
+            if stats is None:
+                stats = self.by_survey[survey_key] = CallStats()
+            stats.add(duration, error, sent, received)
+
+    def slowest(self, dimension='method', limit=None):
+        """
+        Retourne les agrégats d'une dimension, par durée totale décroissante.
+
+        Args:
+            dimension (str): 'method' ou 'survey'
+            limit (int): Nombre maximal d'entrées
+
+        Returns:
+            list: Couples (clé, CallStats)
+        """
+        source = self.by_method if dimension == 'method' else self.by_survey
+        with self._lock:
+            items = sorted(source.items(), key=lambda item: item[1].duration, reverse=True)
+        return items[:limit] if limit else items
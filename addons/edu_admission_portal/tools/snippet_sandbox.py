@@ -0,0 +1,383 @@
+"""
+Exécution isolée des extraits de mapping.
+
+Les extraits de transformation et de validation saisis par les
+utilisateurs sont exécutés dans un pool de processus dédiés, créé une
+fois par processus Odoo et réutilisé. Une boucle infinie ou une
+expression régulière pathologique ne bloque ainsi plus le worker Odoo :
+
+- chaque appel est limité en temps CPU (``ITIMER_PROF`` dans le
+  processus fils) ;
+- chaque lot est limité en temps CPU cumulé dans le fils, et en temps
+  réel côté parent : au-delà, le pool est détruit puis recréé ;
+- les extraits ne voient qu'un ensemble restreint de fonctions natives,
+  sans ``import``, ``open`` ni accès à ``env`` ; ``re``, ``math``,
+  ``json`` et ``datetime`` sont des espaces de noms en lecture seule
+  limités à des fonctions et classes choisies, et non les modules, qui
+  mènent à d'autres modules (``json.codecs``, ``re.enum.sys``...) ;
+- les attributs privés ou d'introspection (``__class__``, ``gi_frame``,
+  ``f_globals``...) sont refusés avant la compilation, comme le fait
+  ``safe_eval`` ;
+- une colonne entière de valeurs est envoyée en un seul message, et
+  les colonnes volumineuses sont réparties sur plusieurs processus.
+
+Ces restrictions protègent le worker Odoo d'un extrait défaillant ou
+maladroit ; les extraits restent du code écrit par les responsables des
+admissions, et le pool ne remplace pas un cloisonnement du système.
+"""
+import ast
+import builtins
+import datetime
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import re
+import signal
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Modules importés par les fonctions natives elles-mêmes (``datetime.strptime``)
+INTERNAL_IMPORTS = frozenset({'_strptime'})
+
+
+def _internal_import(name, *args, **kwargs):
+    """``__import__`` limité aux modules chargés par le code natif exposé."""
+    if name not in INTERNAL_IMPORTS:
+        raise ImportError("Import de '%s' interdit" % name)
+    return builtins.__import__(name, *args, **kwargs)
+
+
+# Fonctions natives disponibles dans les extraits exécutés en isolation
+SAFE_BUILTINS = {
+    name: getattr(builtins, name)
+    for name in (
+        'abs', 'all', 'any', 'bool', 'dict', 'divmod', 'enumerate', 'filter',
+        'float', 'format', 'frozenset', 'int', 'isinstance', 'len', 'list',
+        'map', 'max', 'min', 'ord', 'chr', 'range', 'repr', 'reversed',
+        'round', 'set', 'sorted', 'str', 'sum', 'tuple', 'zip',
+        'True', 'False', 'None',
+        'Exception', 'ValueError', 'TypeError', 'KeyError', 'IndexError',
+    )
+}
+SAFE_BUILTINS['__import__'] = _internal_import
+
+
+
+class SafeNamespace:
+    """
+    Espace de noms en lecture seule exposé aux extraits à la place d'un module.
+
+    Seuls les membres listés sont accessibles : aucun attribut ne mène aux
+    modules importés par le module d'origine.
+    """
+    __slots__ = ('_name', '_members')
+
+    def __init__(self, name, members):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_members', dict(members))
+
+    def __getattr__(self, attr):
+        try:
+            return self._members[attr]
+        except KeyError:
+            raise AttributeError("'%s' n'expose pas '%s'" % (self._name, attr)) from None
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("'%s' est en lecture seule" % self._name)
+
+    def __reduce__(self):
+        raise TypeError("L'espace de noms '%s' ne peut pas être renvoyé" % self._name)
+
+    def __repr__(self):
+        return '<%s>' % self._name
+
+
+def _namespace(module, names):
+    return SafeNamespace(module.__name__, {name: getattr(module, name) for name in names})
+
+
+# Fonctions et classes exposées aux extraits, par module
+SAFE_MODULES = {
+    're': _namespace(re, (
+        'compile', 'escape', 'findall', 'finditer', 'fullmatch', 'match', 'search',
+        'split', 'sub', 'subn', 'error',
+        'A', 'ASCII', 'I', 'IGNORECASE', 'M', 'MULTILINE', 'S', 'DOTALL', 'X', 'VERBOSE',
+    )),
+    # Uniquement des fonctions natives et des constantes numériques
+    'math': _namespace(math, [name for name in dir(math) if not name.startswith('_')]),
+    'json': _namespace(json, ('dumps', 'loads', 'JSONDecodeError')),
+    'datetime': _namespace(datetime, (
+        'date', 'datetime', 'time', 'timedelta', 'timezone', 'MINYEAR', 'MAXYEAR',
+    )),
+}
+
+# Attributs d'introspection qui permettraient de remonter aux globales du
+# processus fils (en plus de tous les attributs commençant par « _ »)
+UNSAFE_ATTRIBUTES = frozenset({
+    'f_back', 'f_builtins', 'f_code', 'f_globals', 'f_locals', 'f_trace',
+    'gi_code', 'gi_frame', 'gi_yieldfrom',
+    'cr_await', 'cr_code', 'cr_frame',
+    'ag_await', 'ag_code', 'ag_frame',
+    'tb_frame', 'tb_next', 'co_code', 'mro',
+})
+
+# Taille minimale d'une colonne avant répartition sur plusieurs processus
+MIN_SPLIT_SIZE = 64
+
+MODE_TRANSFORM = 'transform'
+MODE_BATCH = 'batch'
+MODE_VALIDATE = 'validate'
+
+
+class SnippetTimeout(BaseException):
+    """
+    Dépassement du temps CPU alloué à un extrait.
+
+    Hérite de BaseException pour ne pas être intercepté par un
+    ``except Exception`` écrit dans l'extrait lui-même.
+    """
+
+
+# --------------------------------------------------------------------------
+# Côté processus fils
+# --------------------------------------------------------------------------
+
+_worker_codes = {}
+
+
+def _on_cpu_timeout(signum, frame):
+    raise SnippetTimeout()
+
+
+def _init_worker():
+    """Initialise un processus du pool."""
+    # Le fils ne doit pas hériter des gestionnaires de signaux du serveur Odoo
+    for sig in (signal.SIGTERM, signal.SIGHUP, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGPROF, _on_cpu_timeout)
+    _worker_codes.clear()
+
+
+def check_snippet(source):
+    """
+    Refuse les extraits qui importent un module ou accèdent à des attributs
+    privés ou d'introspection.
+
+    Raises:
+        SyntaxError: Si le code est invalide
+        ValueError: Si le code utilise un nom ou un attribut interdit
+    """
+    for node in ast.walk(ast.parse(source, '<mapping snippet>', 'exec')):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            raise ValueError("Import interdit dans un extrait")
+        if isinstance(node, ast.Attribute) and (
+                node.attr.startswith('_') or node.attr in UNSAFE_ATTRIBUTES):
+            raise ValueError("Accès à l'attribut '%s' interdit" % node.attr)
+        if isinstance(node, ast.Name) and node.id.startswith('__'):
+            raise ValueError("Accès au nom '%s' interdit" % node.id)
+
+
+def _get_worker_code(digest, source):
+    """Vérifie et compile un extrait une seule fois par processus fils."""
+    code = _worker_codes.get(digest)
+    if code is None:
+        check_snippet(source)
+        code = compile(source, '<mapping snippet>', 'exec')
+        _worker_codes[digest] = code
+    return code
+
+
+def _exec_snippet(code, name, value, output):
+    """Exécute un extrait avec des fonctions natives restreintes."""
+    scope = dict(SAFE_MODULES)
+    scope['__builtins__'] = SAFE_BUILTINS
+    scope[name] = value
+    exec(code, scope)
+    if output not in scope:
+        raise ValueError("L'extrait doit définir une variable '%s'" % output)
+    return scope[output]
+
+
+def _run_task(task):
+    """
+    Exécute un extrait sur une colonne de valeurs dans le processus fils.
+
+    Args:
+        task (tuple): (empreinte, source, mode, valeurs, délai par appel, délai par lot)
+
+    Returns:
+        list: Pour chaque valeur, (True, résultat) ou (False, message d'erreur)
+    """
+    digest, source, mode, values, call_timeout, batch_timeout = task
+    try:
+        code = _get_worker_code(digest, source)
+    except SyntaxError as e:
+        return [(False, "Erreur de syntaxe: %s" % e)] * len(values)
+    except ValueError as e:
+        return [(False, str(e))] * len(values)
+
+    if mode == MODE_BATCH:
+        try:
+            signal.setitimer(signal.ITIMER_PROF, batch_timeout)
+            try:
+                results = _exec_snippet(code, 'values', values, 'results')
+            finally:
+                signal.setitimer(signal.ITIMER_PROF, 0)
+            if hasattr(results, 'tolist'):
+                results = results.tolist()
+            results = list(results)
+            if len(results) != len(values):
+                raise ValueError(
+                    "Le code de transformation par lot doit renvoyer autant de résultats que de valeurs "
+                    "(%d attendus, %d reçus)" % (len(values), len(results))
+                )
+            return [(True, result) for result in results]
+        except SnippetTimeout:
+            return [(False, "Délai CPU dépassé (%.2fs)" % batch_timeout)] * len(values)
+        except Exception as e:
+            return [(False, str(e))] * len(values)
+
+    outcomes = []
+    deadline = time.process_time() + batch_timeout
+    for value in values:
+        if time.process_time() >= deadline:
+            outcomes.append((False, "Délai CPU du lot dépassé (%.2fs)" % batch_timeout))
+            continue
+        try:
+            signal.setitimer(signal.ITIMER_PROF, call_timeout)
+            try:
+                result = _exec_snippet(code, 'value', value, 'result')
+            finally:
+                signal.setitimer(signal.ITIMER_PROF, 0)
+            if mode == MODE_VALIDATE:
+                result = bool(result)
+            outcomes.append((True, result))
+        except SnippetTimeout:
+            outcomes.append((False, "Délai CPU dépassé (%.2fs)" % call_timeout))
+        except Exception as e:
+            outcomes.append((False, str(e)))
+    return outcomes
+
+
+# --------------------------------------------------------------------------
+# Côté processus Odoo
+# --------------------------------------------------------------------------
+
+class SnippetSandbox:
+    """Pool de processus chauds exécutant les extraits de mapping."""
+
+    def __init__(self, processes=2, call_timeout=1.0, batch_timeout=30.0):
+        self.processes = max(1, processes)
+        self.call_timeout = call_timeout
+        self.batch_timeout = batch_timeout
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self):
+        return (self.processes, self.call_timeout, self.batch_timeout)
+
+    def _get_pool(self):
+        """Retourne le pool, en le (re)créant après un fork du serveur."""
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+                self._pool = context.Pool(self.processes, initializer=_init_worker)
+                self._pid = os.getpid()
+            return self._pool
+
+    def _reset_pool(self):
+        """Détruit le pool après un dépassement de délai."""
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.terminate()
+                self._pool.join()
+            self._pool = None
+
+    def close(self):
+        """Arrête les processus du pool."""
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.close()
+                self._pool.join()
+            self._pool = None
+
+    def run(self, source, mode, values):
+        """
+        Exécute un extrait sur une colonne de valeurs.
+
+        Args:
+            source (str): Code source de l'extrait
+            mode (str): MODE_TRANSFORM, MODE_BATCH ou MODE_VALIDATE
+            values (list): Valeurs de la colonne
+
+        Returns:
+            list: Pour chaque valeur, (True, résultat) ou (False, message d'erreur)
+        """
+        values = list(values)
+        if not values:
+            return []
+
+        digest = hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+        # Les extraits par lot voient toute la colonne ; les autres sont répartis
+        if mode == MODE_BATCH or len(values) < MIN_SPLIT_SIZE or self.processes == 1:
+            slices = [values]
+        else:
+            size = math.ceil(len(values) / self.processes)
+            slices = [values[i:i + size] for i in range(0, len(values), size)]
+
+        pool = self._get_pool()
+        pending = [
+            pool.apply_async(_run_task, ((
+                digest, source, mode, chunk, self.call_timeout, self.batch_timeout,
+            ),))
+            for chunk in slices
+        ]
+
+        # Filet de sécurité en temps réel : code natif non interruptible, etc.
+        deadline = time.monotonic() + self.batch_timeout * 2 + 1
+        outcomes = []
+        for chunk, result in zip(slices, pending):
+            try:
+                outcomes.extend(result.get(timeout=max(0.0, deadline - time.monotonic())))
+            except multiprocessing.TimeoutError:
+                _logger.error(
+                    "Extrait de mapping interrompu après %.1fs, redémarrage du pool d'exécution",
+                    self.batch_timeout * 2 + 1
+                )
+                self._reset_pool()
+                message = "Délai du lot dépassé (%.2fs)" % self.batch_timeout
+                return [(False, message)] * len(values)
+            except Exception as e:
+                # Résultat non transférable (générateur...) ou fils interrompu :
+                # seules les valeurs de cette tranche sont en erreur
+                message = "Résultat inexploitable: %s" % getattr(e, 'exc', e)
+                outcomes.extend([(False, message)] * len(chunk))
+        return outcomes
+
+
+_sandbox = None
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox(processes, call_timeout, batch_timeout):
+    """
+    Retourne le pool partagé du processus, recréé si la configuration change.
+    """
+    global _sandbox
+    config = (max(1, processes), call_timeout, batch_timeout)
+    with _sandbox_lock:
+        if _sandbox is None or _sandbox.config != config:
+            if _sandbox is not None:
+                _sandbox.close()
+            _sandbox = SnippetSandbox(*config)
+        return _sandbox